@@ -0,0 +1,225 @@
+"""
+Multi-channel load generator for the message pipeline.
+
+Simulates N channels x M messages through MessageHandler with a
+FakeDiscordClient and a RealClaudeClient pointed at the fake Claude CLI,
+then reports throughput, queueing delay, peak RSS and subprocess counts.
+
+    uv run python benchmarks/load.py --channels 20 --messages 5 --scenario tools
+    uv run python benchmarks/load.py --latency uniform:0.05:0.5 --arrival-interval 0.2
+    uv run python benchmarks/load.py --scenario tools --tools 30 --tool-output status
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import resource
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from uuid import uuid4
+
+import structlog
+
+from discord_ai.claude.client import RealClaudeClient
+from discord_ai.discord_client import FakeDiscordClient
+from discord_ai.handlers.messages import MessageHandler
+from discord_ai.metrics import LatencyWindow
+from discord_ai.settings import Settings
+
+FAKE_CLI = Path(__file__).parent.parent / "tests" / "helpers" / "fake_claude_cli.py"
+
+
+@dataclass
+class LoadConfig:
+    channels: int = 10
+    messages: int = 3
+    scenario: str = "text"
+    latency: str = "fixed:0.01"
+    tools: int = 5
+    arrival_interval: float = 0.0
+    timeout_seconds: int = 60
+    tool_output_mode: str = "messages"
+    cli_path: Path = FAKE_CLI
+
+
+@dataclass
+class LoadReport:
+    turns: int = 0
+    failed: int = 0
+    messages_sent: int = 0
+    elapsed_seconds: float = 0.0
+    queue_delay: LatencyWindow = field(default_factory=LatencyWindow)
+    first_message: LatencyWindow = field(default_factory=LatencyWindow)
+    turn_latency: LatencyWindow = field(default_factory=LatencyWindow)
+    subprocesses_started: int = 0
+    peak_subprocesses: int = 0
+    peak_rss_kib: int = 0
+    peak_child_rss_kib: int = 0
+
+    def as_dict(self) -> dict:
+        def ms(window: LatencyWindow, pct: float) -> float:
+            value = window.percentile(pct)
+            return value * 1000 if value is not None else float("nan")
+
+        return {
+            "turns": self.turns,
+            "failed": self.failed,
+            "messages_sent": self.messages_sent,
+            "elapsed_seconds": self.elapsed_seconds,
+            "turns_per_second": self.turns / self.elapsed_seconds if self.elapsed_seconds else 0.0,
+            "queue_delay_p50_ms": ms(self.queue_delay, 50),
+            "queue_delay_p99_ms": ms(self.queue_delay, 99),
+            "first_message_p50_ms": ms(self.first_message, 50),
+            "first_message_p99_ms": ms(self.first_message, 99),
+            "turn_p50_ms": ms(self.turn_latency, 50),
+            "turn_p99_ms": ms(self.turn_latency, 99),
+            "subprocesses_started": self.subprocesses_started,
+            "peak_subprocesses": self.peak_subprocesses,
+            "peak_rss_kib": self.peak_rss_kib,
+            "peak_child_rss_kib": self.peak_child_rss_kib,
+        }
+
+
+class TimedClaudeClient:
+    """Records when each prompt actually reaches the Claude client"""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.started: dict[str, float] = {}
+
+    async def run_session(self, session_id: str, message: str, model=None, extra_args=()):
+        self.started[message] = time.perf_counter()
+        async for line in self.inner.run_session(
+            session_id, message, model=model, extra_args=extra_args
+        ):
+            yield line
+
+
+class TimedDiscordClient(FakeDiscordClient):
+    """FakeDiscordClient remembering when the first message hit each channel"""
+
+    def __init__(self):
+        super().__init__()
+        self.first_sent: dict[str, float] = {}
+
+    async def send_message(self, channel_id: str, content: str):
+        self.first_sent.setdefault(channel_id, time.perf_counter())
+        return await super().send_message(channel_id, content)
+
+
+def configure_fake_cli(config: LoadConfig):
+    os.environ["FAKE_CLAUDE_SCENARIO"] = config.scenario
+    os.environ["FAKE_CLAUDE_LATENCY"] = config.latency
+    os.environ["FAKE_CLAUDE_TOOLS"] = str(config.tools)
+
+
+async def run_load(config: LoadConfig) -> LoadReport:
+    configure_fake_cli(config)
+    settings = Settings(
+        _env_file=None,
+        claude_cli_path=str(config.cli_path),
+        claude_timeout_seconds=config.timeout_seconds,
+        typing_interval_seconds=5,
+        tool_output_mode=config.tool_output_mode,
+    )
+    real_client = RealClaudeClient(settings)
+    claude = TimedClaudeClient(real_client)
+    discord = TimedDiscordClient()
+    handler = MessageHandler(claude, discord, settings)
+    report = LoadReport()
+
+    async def sample_processes():
+        while True:
+            report.peak_subprocesses = max(report.peak_subprocesses, len(real_client.processes))
+            await asyncio.sleep(0.005)
+
+    async def one_turn(channel: int, index: int, session_id: str):
+        await asyncio.sleep(index * config.arrival_interval)
+        # Each turn gets its own reply channel so first-message latency is per turn
+        prompt = f"load c{channel} m{index}"
+        reply_channel = f"channel-{channel}-{index}"
+        arrived = time.perf_counter()
+        try:
+            await handler.handle_message(reply_channel, session_id, prompt)
+        except Exception:
+            report.failed += 1
+        finished = time.perf_counter()
+
+        report.turns += 1
+        report.turn_latency.observe(finished - arrived)
+        if prompt in claude.started:
+            report.queue_delay.observe(claude.started[prompt] - arrived)
+        if reply_channel in discord.first_sent:
+            report.first_message.observe(discord.first_sent[reply_channel] - arrived)
+            report.messages_sent += len(discord.get_messages(reply_channel))
+
+    sessions = [str(uuid4()) for _ in range(config.channels)]
+    sampler = asyncio.create_task(sample_processes())
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(
+            *(
+                one_turn(channel, index, sessions[channel])
+                for channel in range(config.channels)
+                for index in range(config.messages)
+            )
+        )
+    finally:
+        sampler.cancel()
+    report.elapsed_seconds = time.perf_counter() - started
+
+    report.subprocesses_started = len(claude.started)
+    report.peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    report.peak_child_rss_kib = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--channels", type=int, default=10)
+    parser.add_argument("--messages", type=int, default=3)
+    parser.add_argument(
+        "--scenario", default="text", choices=["text", "tools", "huge", "hang", "crash"]
+    )
+    parser.add_argument("--latency", default="fixed:0.01", help="fake CLI per-event latency")
+    parser.add_argument("--tools", type=int, default=5, help="tool calls per turn for 'tools'")
+    parser.add_argument(
+        "--arrival-interval", type=float, default=0.0, help="seconds between messages per channel"
+    )
+    parser.add_argument("--timeout", type=int, default=60, help="per-turn Claude timeout")
+    parser.add_argument(
+        "--tool-output", default="messages", choices=["messages", "status"], help="TOOL_OUTPUT_MODE"
+    )
+    parser.add_argument("--cli", type=Path, default=FAKE_CLI, help="Claude CLI stand-in")
+    parser.add_argument("--verbose", action="store_true", help="keep per-message info logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    config = LoadConfig(
+        channels=args.channels,
+        messages=args.messages,
+        scenario=args.scenario,
+        latency=args.latency,
+        tools=args.tools,
+        arrival_interval=args.arrival_interval,
+        timeout_seconds=args.timeout,
+        tool_output_mode=args.tool_output,
+        cli_path=args.cli,
+    )
+    report = asyncio.run(run_load(config)).as_dict()
+
+    width = max(len(key) for key in report)
+    for key, value in report.items():
+        formatted = f"{value:,.2f}" if isinstance(value, float) else f"{value:,}"
+        print(f"{key:<{width}}  {formatted}")
+
+    sys.exit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
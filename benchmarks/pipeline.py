@@ -0,0 +1,100 @@
+"""
+Throughput benchmark for the Claude output pipeline.
+
+Replays recorded transcripts through StreamParser -> EventFormatter ->
+FakeDiscordClient and reports events/sec, allocations and per-turn latency.
+
+    uv run python benchmarks/pipeline.py --turns 500
+    uv run python benchmarks/pipeline.py --speed 1 --turns 10   # real-time pacing
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from pathlib import Path
+
+from discord_ai.claude.client import ReplayClaudeClient
+from discord_ai.claude.formatter import EventFormatter
+from discord_ai.claude.parser import StreamParser
+from discord_ai.discord_client import FakeDiscordClient
+from discord_ai.metrics import LatencyWindow
+
+DEFAULT_CORPUS = Path(__file__).parent.parent / "tests" / "helpers" / "data" / "transcripts"
+
+
+async def run_turn(parser, formatter, discord, channel_id: str) -> int:
+    events = 0
+    async for event in parser.parse_stream("bench-session", "benchmark"):
+        events += 1
+        for msg in formatter.format_event(event):
+            await discord.send_message(channel_id, msg)
+    return events
+
+
+async def run_turns(
+    corpus_files: list[Path], turns: int, speed: float
+) -> tuple[int, LatencyWindow]:
+    client = ReplayClaudeClient(corpus_files, speed=speed)
+    parser = StreamParser(client)
+    formatter = EventFormatter()
+    discord = FakeDiscordClient()
+    latencies = LatencyWindow(maxlen=turns)
+    events = 0
+
+    for turn in range(turns):
+        turn_started = time.perf_counter()
+        events += await run_turn(parser, formatter, discord, f"channel-{turn % 8}")
+        latencies.observe(time.perf_counter() - turn_started)
+
+    return events, latencies
+
+
+async def run_benchmark(corpus: Path, turns: int, speed: float) -> dict:
+    transcripts = sorted(corpus.glob("*.jsonl"))
+    if not transcripts:
+        raise SystemExit(f"No transcripts found in {corpus}")
+
+    # Timing and allocation tracking run separately: tracemalloc slows every
+    # allocation down and would skew the latency numbers.
+    started = time.perf_counter()
+    events, latencies = await run_turns(transcripts, turns, speed)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    await run_turns(transcripts, turns, speed=0)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "transcripts": len(transcripts),
+        "turns": turns,
+        "events": events,
+        "elapsed_seconds": elapsed,
+        "events_per_second": events / elapsed if elapsed else float("inf"),
+        "turn_p50_ms": latencies.percentile(50) * 1000,
+        "turn_p99_ms": latencies.percentile(99) * 1000,
+        "allocated_peak_kib": peak / 1024,
+        "allocated_retained_kib": retained / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument(
+        "--speed", type=float, default=0.0, help="replay speed multiplier, 0 = no delays"
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.corpus, args.turns, args.speed))
+
+    width = max(len(key) for key in report)
+    for key, value in report.items():
+        formatted = f"{value:,.2f}" if isinstance(value, float) else f"{value:,}"
+        print(f"{key:<{width}}  {formatted}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+import time
+
+# Taken before any dependency is imported so startup timing includes imports
+IMPORT_STARTED = time.perf_counter()
@@ -0,0 +1,262 @@
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import structlog
+
+from discord_ai.metrics import metrics
+
+logger = structlog.get_logger()
+
+PRESSURE_POLL_SECONDS = 1.0
+MAX_IDLE_BUCKETS = 10000
+
+
+@dataclass
+class AdmissionDecision:
+    allowed: bool
+    reason: str = ""
+    message: str = ""
+    retry_after: float = 0.0
+
+
+ADMITTED = AdmissionDecision(allowed=True)
+DRAINING = AdmissionDecision(
+    allowed=False,
+    reason="draining",
+    message="I'm restarting right now, please send that again in a minute.",
+)
+
+
+class TokenBucket:
+    """Classic token bucket; capacity and rate are passed per call so they can change live"""
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, capacity: float, per_second: float, now: float):
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * per_second)
+        self.updated = now
+
+    def try_take(self, capacity: float, per_second: float, now: float) -> float:
+        """Take one token; returns 0 on success, otherwise seconds until one is available"""
+
+        self._refill(capacity, per_second, now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / per_second
+
+    def refund(self, capacity: float):
+        self.tokens = min(capacity, self.tokens + 1)
+
+    def is_full(self, capacity: float, per_second: float, now: float) -> bool:
+        self._refill(capacity, per_second, now)
+        return self.tokens >= capacity
+
+
+class HostPressure:
+    """Reads host load signals; each reading is a cheap syscall or /proc read"""
+
+    def __init__(self, process_count: Callable[[], int] = lambda: 0):
+        self.process_count = process_count
+
+    def load_average(self) -> float:
+        try:
+            return os.getloadavg()[0]
+        except OSError:
+            return 0.0
+
+    def free_memory_mb(self) -> float | None:
+        try:
+            for line in Path("/proc/meminfo").read_text().splitlines():
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+        except OSError:
+            pass
+        return None
+
+
+class AdmissionController:
+    """Per-user/per-channel quotas plus host-pressure checks in front of each turn
+
+    Quota violations are rejected immediately. Host pressure defers the turn
+    for up to ``admission_defer_seconds`` waiting for capacity, then rejects.
+    Limits are read from ``self.settings`` on every check so they can be
+    changed at runtime.
+    """
+
+    def __init__(self, settings, pressure: HostPressure | None = None, clock=time.monotonic):
+        self.settings = settings
+        self.pressure = pressure or HostPressure()
+        self.clock = clock
+        self.active_turns = 0
+        self.closed = False
+        self._user_buckets: dict[str, TokenBucket] = {}
+        self._channel_buckets: dict[str, TokenBucket] = {}
+
+    async def admit(
+        self,
+        user_id: str,
+        channel_id: str,
+        on_defer: Callable[[AdmissionDecision], Awaitable[None]] | None = None,
+    ) -> AdmissionDecision:
+        """Decide whether a turn may start; call ``release`` after an admitted turn"""
+
+        if self.closed:
+            return DRAINING
+
+        quota = self.check_quota(user_id, channel_id)
+        if not quota.allowed:
+            metrics.increment(f"admission.rejected.{quota.reason}")
+            logger.warning(
+                "discord_ai.admission.rejected",
+                reason=quota.reason,
+                user_id=user_id,
+                channel_id=channel_id,
+                retry_after=round(quota.retry_after, 1),
+            )
+            return quota
+
+        deadline = self.clock() + self.settings.admission_defer_seconds
+        deferred = False
+
+        while True:
+            if self.closed:
+                # Deferred turns are dropped rather than started during a shutdown drain
+                self._refund(user_id, channel_id)
+                metrics.increment("admission.rejected.draining")
+                return DRAINING
+
+            pressure = self.check_pressure()
+            if pressure.allowed:
+                break
+
+            if self.clock() >= deadline:
+                self._refund(user_id, channel_id)
+                metrics.increment(f"admission.rejected.{pressure.reason}")
+                logger.warning(
+                    "discord_ai.admission.rejected",
+                    reason=pressure.reason,
+                    user_id=user_id,
+                    channel_id=channel_id,
+                )
+                return pressure
+
+            if not deferred:
+                deferred = True
+                metrics.increment("admission.deferred")
+                logger.info(
+                    "discord_ai.admission.deferred", reason=pressure.reason, channel_id=channel_id
+                )
+                if on_defer:
+                    await on_defer(pressure)
+
+            await asyncio.sleep(PRESSURE_POLL_SECONDS)
+
+        self.active_turns += 1
+        metrics.increment("admission.admitted")
+        metrics.set_gauge("admission.active_turns", self.active_turns)
+        return ADMITTED
+
+    def close(self):
+        """Refuse every turn from now on, including ones currently deferred"""
+
+        self.closed = True
+
+    def release(self):
+        self.active_turns = max(0, self.active_turns - 1)
+        metrics.set_gauge("admission.active_turns", self.active_turns)
+
+    def check_quota(self, user_id: str, channel_id: str) -> AdmissionDecision:
+        now = self.clock()
+        s = self.settings
+
+        wait = self._take(self._user_buckets, user_id, s.user_quota_burst, s.user_quota_per_minute)
+        if wait:
+            return AdmissionDecision(
+                allowed=False,
+                reason="user_quota",
+                message=(
+                    f"You're sending messages faster than I can keep up. Try again in {wait:.0f}s."
+                ),
+                retry_after=wait,
+            )
+
+        wait = self._take(
+            self._channel_buckets, channel_id, s.channel_quota_burst, s.channel_quota_per_minute
+        )
+        if wait:
+            self._refund_bucket(
+                self._user_buckets, user_id, s.user_quota_burst, s.user_quota_per_minute
+            )
+            return AdmissionDecision(
+                allowed=False,
+                reason="channel_quota",
+                message=f"This channel has too many requests queued. Try again in {wait:.0f}s.",
+                retry_after=wait,
+            )
+
+        self._prune(now)
+        return ADMITTED
+
+    def check_pressure(self) -> AdmissionDecision:
+        s = self.settings
+        busy = "I'm under heavy load right now, please try again in a minute."
+
+        if s.max_claude_processes:
+            running = max(self.active_turns, self.pressure.process_count())
+            if running >= s.max_claude_processes:
+                return AdmissionDecision(allowed=False, reason="max_processes", message=busy)
+
+        if s.max_load_average and self.pressure.load_average() >= s.max_load_average:
+            return AdmissionDecision(allowed=False, reason="load_average", message=busy)
+
+        if s.min_free_memory_mb:
+            free = self.pressure.free_memory_mb()
+            if free is not None and free < s.min_free_memory_mb:
+                return AdmissionDecision(allowed=False, reason="free_memory", message=busy)
+
+        return ADMITTED
+
+    def _take(self, buckets, key: str, burst: int, per_minute: float) -> float:
+        if per_minute <= 0:
+            return 0.0
+
+        capacity = max(1, burst)
+        now = self.clock()
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = TokenBucket(capacity, now)
+        return bucket.try_take(capacity, per_minute / 60, now)
+
+    def _refund_bucket(self, buckets, key: str, burst: int, per_minute: float):
+        if per_minute > 0 and key in buckets:
+            buckets[key].refund(max(1, burst))
+
+    def _refund(self, user_id: str, channel_id: str):
+        s = self.settings
+        self._refund_bucket(
+            self._user_buckets, user_id, s.user_quota_burst, s.user_quota_per_minute
+        )
+        self._refund_bucket(
+            self._channel_buckets, channel_id, s.channel_quota_burst, s.channel_quota_per_minute
+        )
+
+    def _prune(self, now: float):
+        """Drop full buckets once the maps grow large; a full bucket carries no state"""
+
+        s = self.settings
+        for buckets, burst, per_minute in (
+            (self._user_buckets, s.user_quota_burst, s.user_quota_per_minute),
+            (self._channel_buckets, s.channel_quota_burst, s.channel_quota_per_minute),
+        ):
+            if len(buckets) <= MAX_IDLE_BUCKETS:
+                continue
+            capacity = max(1, burst)
+            for key in [k for k, b in buckets.items() if b.is_full(capacity, per_minute / 60, now)]:
+                del buckets[key]
@@ -0,0 +1,350 @@
+import asyncio
+import errno
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import uuid4
+
+import structlog
+
+from discord_ai.metrics import metrics
+from discord_ai.utils.http import get_session
+
+logger = structlog.get_logger()
+
+CHUNK_BYTES = 64 * 1024
+GC_INTERVAL_SECONDS = 600.0
+ETAGS_SUBDIR = ".etags"
+
+
+class AttachmentTooLarge(Exception):
+    pass
+
+
+@dataclass
+class StoredAttachment:
+    filename: str
+    path: Path
+    size: int
+    sha256: str
+
+
+@dataclass
+class SkippedAttachment:
+    filename: str
+    reason: str
+
+
+@dataclass
+class Download:
+    """An open response: headers are in, the body is read only if ``chunks`` is consumed"""
+
+    etag: str | None
+    chunks: AsyncIterator[bytes]
+
+
+class HttpFetcher:
+    """Streams attachment bodies over the shared HTTP session"""
+
+    @asynccontextmanager
+    async def open(self, url: str):
+        async with get_session().get(url) as response:
+            response.raise_for_status()
+            yield Download(response.headers.get("ETag"), response.content.iter_chunked(CHUNK_BYTES))
+
+
+def safe_filename(filename: str) -> str:
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", Path(filename).name).lstrip(".")
+    return name or "attachment"
+
+
+class AttachmentStore:
+    """Downloads message attachments into per-session scratch directories
+
+    Bodies are streamed to disk chunk by chunk while being hashed, so no
+    attachment is ever held in memory whole. Blobs are stored once under
+    their SHA-256 in a shared cache and hard-linked into session directories.
+    The CDN ETag (a content hash) is read from the response headers. An ETag
+    seen before, even by an earlier process, resolves straight to the cached
+    blob, and the body is never read.
+
+    A background task removes session files, blobs and ETag entries unused
+    for ``retention_seconds``. It then evicts the oldest blobs until the
+    cache fits in ``cache_max_bytes``. Reusing a blob refreshes its mtime.
+    """
+
+    def __init__(
+        self,
+        base_dir: str | Path | None = None,
+        max_bytes: int = 25 * 1024 * 1024,
+        max_count: int = 10,
+        fetcher=None,
+        retention_seconds: float = 24 * 3600,
+        cache_max_bytes: int = 1024 * 1024 * 1024,
+        clock=time.time,
+    ):
+        self.base_dir = (
+            Path(base_dir) if base_dir else Path(tempfile.gettempdir()) / "discord-ai-attachments"
+        )
+        self.cache_dir = self.base_dir / ".blobs"
+        self.max_bytes = max_bytes
+        self.max_count = max_count
+        self.fetcher = fetcher or HttpFetcher()
+        self.retention_seconds = retention_seconds
+        self.cache_max_bytes = cache_max_bytes
+        self.clock = clock
+        self._task: asyncio.Task | None = None
+
+    def session_dir(self, session_id: str) -> Path:
+        return self.base_dir / session_id
+
+    async def fetch_all(
+        self, session_id: str, attachments, dest_dir: Path | None = None
+    ) -> tuple[list[StoredAttachment], list[SkippedAttachment]]:
+        """Download attachments concurrently; returns (stored, skipped)"""
+
+        dest_dir = dest_dir or self.session_dir(session_id)
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        skipped = [
+            SkippedAttachment(a.filename, f"more than {self.max_count} attachments")
+            for a in attachments[self.max_count :]
+        ]
+        wanted = []
+        for attachment in attachments[: self.max_count]:
+            if attachment.size > self.max_bytes:
+                skipped.append(
+                    SkippedAttachment(attachment.filename, f"larger than {self.max_bytes} bytes")
+                )
+            else:
+                wanted.append(attachment)
+
+        taken: set[Path] = set()
+        dests = [
+            self._unique_path(dest_dir, safe_filename(attachment.filename), taken)
+            for attachment in wanted
+        ]
+        results = await asyncio.gather(
+            *(
+                self._fetch_one(dest, attachment)
+                for dest, attachment in zip(dests, wanted, strict=True)
+            ),
+            return_exceptions=True,
+        )
+
+        stored = []
+        for attachment, result in zip(wanted, results, strict=True):
+            if isinstance(result, StoredAttachment):
+                stored.append(result)
+                continue
+            reason = (
+                f"larger than {self.max_bytes} bytes"
+                if isinstance(result, AttachmentTooLarge)
+                else "download failed"
+            )
+            logger.warning(
+                "discord_ai.attachment.failed",
+                filename=attachment.filename,
+                session_id=session_id,
+                error=str(result),
+            )
+            skipped.append(SkippedAttachment(attachment.filename, reason))
+
+        return stored, skipped
+
+    async def _fetch_one(self, dest: Path, attachment) -> StoredAttachment:
+        async with self.fetcher.open(attachment.url) as download:
+            digest = await asyncio.to_thread(self._cached_digest, download.etag)
+            if digest:
+                metrics.increment("attachments.cache_hits")
+            else:
+                digest = await self._download(download.chunks)
+                if download.etag:
+                    await asyncio.to_thread(self._remember_etag, download.etag, digest)
+
+        dest, size = await asyncio.to_thread(self._link, self.cache_dir / digest, dest)
+
+        logger.info(
+            "discord_ai.attachment.stored",
+            filename=attachment.filename,
+            path=str(dest),
+            size=size,
+        )
+        return StoredAttachment(attachment.filename, dest, size, digest)
+
+    def _etag_path(self, etag: str) -> Path:
+        return self.cache_dir / ETAGS_SUBDIR / hashlib.sha256(etag.encode()).hexdigest()
+
+    def _cached_digest(self, etag: str | None) -> str | None:
+        if not etag:
+            return None
+        try:
+            digest = self._etag_path(etag).read_text().strip()
+        except OSError:
+            return None
+        return digest if (self.cache_dir / digest).exists() else None
+
+    def _remember_etag(self, etag: str, digest: str):
+        path = self._etag_path(etag)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(digest)
+
+    async def _download(self, chunks: AsyncIterator[bytes]) -> str:
+        part = self.cache_dir / f".{uuid4().hex}.part"
+        hasher = hashlib.sha256()
+        size = 0
+
+        try:
+            f = await asyncio.to_thread(part.open, "wb")
+            try:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise AttachmentTooLarge(part.name)
+                    hasher.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+
+            digest = hasher.hexdigest()
+            if await asyncio.to_thread(self._commit_blob, part, digest):
+                metrics.increment("attachments.duplicate_content")
+        except BaseException:
+            part.unlink(missing_ok=True)
+            raise
+
+        metrics.increment("attachments.downloaded")
+        metrics.increment("attachments.bytes_downloaded", size)
+        return digest
+
+    def _commit_blob(self, part: Path, digest: str) -> bool:
+        """Move a finished download into the cache; True if the blob already existed"""
+
+        blob = self.cache_dir / digest
+        if blob.exists():
+            part.unlink()
+            return True
+        part.replace(blob)
+        return False
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(GC_INTERVAL_SECONDS)
+            try:
+                await self.collect()
+            except Exception as e:
+                logger.error("discord_ai.attachment.gc_failed", error=str(e))
+
+    async def collect(self) -> int:
+        """Remove expired files and trim the blob cache; returns the number removed"""
+
+        removed = await asyncio.to_thread(self._collect, self.clock())
+        if removed:
+            metrics.increment("attachments.collected", removed)
+            logger.info("discord_ai.attachment.collected", files=removed)
+        return removed
+
+    def _collect(self, now: float) -> int:
+        cutoff = now - self.retention_seconds
+        removed = 0
+
+        if not self.base_dir.exists():
+            return 0
+
+        for session_dir in self.base_dir.iterdir():
+            if session_dir == self.cache_dir or not session_dir.is_dir():
+                continue
+            for path in session_dir.iterdir():
+                if path.is_file() and path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+            if not any(session_dir.iterdir()):
+                session_dir.rmdir()
+
+        etags_dir = self.cache_dir / ETAGS_SUBDIR
+        if etags_dir.exists():
+            for path in etags_dir.iterdir():
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+
+        if not self.cache_dir.exists():
+            return removed
+        blobs = sorted(
+            (path.stat().st_mtime, path.stat().st_size, path)
+            for path in self.cache_dir.iterdir()
+            if path.is_file()
+        )
+        total = sum(size for _, size, _ in blobs)
+        for mtime, size, path in blobs:
+            if mtime >= cutoff and total <= self.cache_max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    @staticmethod
+    def _unique_path(dest_dir: Path, name: str, taken: set[Path]) -> Path:
+        path = dest_dir / name
+        stem, suffix = path.stem, path.suffix
+        counter = 1
+        while path in taken or path.exists():
+            path = dest_dir / f"{stem}-{counter}{suffix}"
+            counter += 1
+        taken.add(path)
+        return path
+
+    @staticmethod
+    def _link(blob: Path, dest: Path) -> tuple[Path, int]:
+        """Link (or copy) a blob into place; marks it used for the cache GC
+
+        Never overwrites: when another message in the session took the name
+        first, the next free ``name-N`` is used. Returns the path and size.
+        """
+
+        os.utime(blob)
+        stem, suffix = dest.stem, dest.suffix
+        counter = 1
+        while True:
+            try:
+                try:
+                    os.link(blob, dest)
+                except OSError as e:
+                    # Hard links need the same filesystem and may be forbidden
+                    if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                        raise
+                    with blob.open("rb") as src, dest.open("xb") as out:
+                        shutil.copyfileobj(src, out)
+                return dest, blob.stat().st_size
+            except FileExistsError:
+                dest = dest.with_name(f"{stem}-{counter}{suffix}")
+                counter += 1
+
+
+def describe_attachments(content: str, stored: list[StoredAttachment]) -> str:
+    """Append the local paths of stored attachments to the user's message"""
+
+    if not stored:
+        return content
+
+    listing = "\n".join(f"- {a.path} ({a.size} bytes)" for a in stored)
+    return f"{content}\n\nAttached files (saved locally, read them as needed):\n{listing}".lstrip()
@@ -1,8 +1,10 @@
 import discord
 from discord.ext import commands
 
+from discord_ai.handlers.admin import register_admin_commands
 
-def create_bot(settings):
+
+def create_bot(settings, model_router=None, reloader=None, stats=None, memory=None):
     """Create and configure Discord bot"""
 
     intents = discord.Intents.default()
@@ -11,4 +13,8 @@ def create_bot(settings):
 
     bot = commands.Bot(command_prefix="!", intents=intents)
 
+    register_admin_commands(
+        bot, settings, model_router=model_router, reloader=reloader, stats=stats, memory=memory
+    )
+
     return bot
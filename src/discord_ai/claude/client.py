@@ -1,13 +1,38 @@
 import asyncio
-from collections.abc import AsyncIterator
+import time
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import suppress
+from pathlib import Path
 from typing import Protocol
 
+import structlog
+
+from discord_ai.claude.transcripts import (
+    TranscriptLine,
+    TranscriptRecorder,
+    load_transcript,
+    transcript_path,
+)
+from discord_ai.metrics import metrics
+
+logger = structlog.get_logger()
+
+# stream-json puts a whole tool result on one line, which easily exceeds
+# asyncio's 64 KiB default line limit
+STREAM_LIMIT_BYTES = 16 * 1024 * 1024
+
 
 class ClaudeClient(Protocol):
     """Protocol for Claude CLI interaction"""
 
-    async def run_session(self, session_id: str, message: str) -> AsyncIterator[str]:
-        """Yields JSON lines from Claude CLI"""
+    async def run_session(
+        self,
+        session_id: str,
+        message: str,
+        model: str | None = None,
+        extra_args: Sequence[str] = (),
+    ) -> AsyncIterator[str]:
+        """Yields JSON lines from Claude CLI; ``model`` of None uses the CLI default"""
         ...
 
 
@@ -17,18 +42,98 @@ class FakeClaudeClient:
     def __init__(self, responses: list[str]):
         self.responses = responses
 
-    async def run_session(self, session_id: str, message: str) -> AsyncIterator[str]:
+    async def run_session(
+        self,
+        session_id: str,
+        message: str,
+        model: str | None = None,
+        extra_args: Sequence[str] = (),
+    ) -> AsyncIterator[str]:
         for line in self.responses:
             yield line
 
 
+class ReplayClaudeClient:
+    """Test implementation replaying recorded transcripts with their original timing
+
+    Each call plays the next transcript in round-robin order. ``speed`` scales
+    the recorded inter-line delays; 0 replays without any delay.
+    """
+
+    def __init__(self, transcripts: list[str | Path | list[TranscriptLine]], speed: float = 1.0):
+        if not transcripts:
+            raise ValueError("ReplayClaudeClient needs at least one transcript")
+
+        self.transcripts = [t if isinstance(t, list) else load_transcript(t) for t in transcripts]
+        self.speed = speed
+        self._next = 0
+
+    async def run_session(
+        self,
+        session_id: str,
+        message: str,
+        model: str | None = None,
+        extra_args: Sequence[str] = (),
+    ) -> AsyncIterator[str]:
+        transcript = self.transcripts[self._next % len(self.transcripts)]
+        self._next += 1
+
+        for entry in transcript:
+            if self.speed > 0 and entry.delay > 0:
+                await asyncio.sleep(entry.delay / self.speed)
+            yield entry.line
+
+
 class RealClaudeClient:
-    """Real implementation spawning Claude CLI subprocess"""
+    """Real implementation spawning Claude CLI subprocess
+
+    With a ``WorkspaceManager`` each session's CLI runs inside its own
+    workspace directory; otherwise it inherits the bot's working directory.
+    A CLI whose workspace grows past the hard limit is killed mid-turn.
+    """
 
-    def __init__(self, settings):
+    def __init__(
+        self, settings, on_spawn: Callable[[str, int], None] | None = None, workspaces=None
+    ):
         self.settings = settings
+        self.on_spawn = on_spawn
+        self.workspaces = workspaces
+        self.processes: dict[int, float] = {}
 
-    async def run_session(self, session_id: str, message: str) -> AsyncIterator[str]:
+    async def run_session(
+        self,
+        session_id: str,
+        message: str,
+        model: str | None = None,
+        extra_args: Sequence[str] = (),
+    ) -> AsyncIterator[str]:
+        if self.workspaces is None:
+            async for line in self._run(session_id, message, model, extra_args, cwd=None):
+                yield line
+            return
+
+        spawned: list[asyncio.subprocess.Process] = []
+
+        def stop():
+            for process in spawned:
+                if process.returncode is None:
+                    process.kill()
+
+        async with self.workspaces.use(session_id, on_exceeded=stop) as cwd:
+            async for line in self._run(
+                session_id, message, model, extra_args, cwd=cwd, spawned=spawned
+            ):
+                yield line
+
+    async def _run(
+        self,
+        session_id: str,
+        message: str,
+        model: str | None,
+        extra_args: Sequence[str],
+        cwd: Path | None,
+        spawned: list[asyncio.subprocess.Process] | None = None,
+    ) -> AsyncIterator[str]:
         cmd = [
             self.settings.claude_cli_path,
             "--print",
@@ -37,27 +142,85 @@ class RealClaudeClient:
             "--verbose",
             "--session-id",
             session_id,
-            message,
         ]
+        if model:
+            cmd += ["--model", model]
+        cmd += [*extra_args, message]
 
         process = await asyncio.create_subprocess_exec(
             *cmd,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
+            limit=STREAM_LIMIT_BYTES,
+            cwd=cwd,
         )
-
+        if spawned is not None:
+            spawned.append(process)
+        recorder = None
         try:
+            self.processes[process.pid] = time.monotonic()
+            if self.on_spawn:
+                try:
+                    self.on_spawn(session_id, process.pid)
+                except Exception as e:
+                    # Bookkeeping (e.g. the in-flight store) must not abort the turn
+                    metrics.increment("claude.on_spawn_failures")
+                    logger.warning(
+                        "discord_ai.claude.on_spawn_failed", session_id=session_id, error=str(e)
+                    )
+            metrics.increment("claude.processes_started")
+            metrics.set_gauge("claude.processes", len(self.processes))
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.settings.claude_timeout_seconds
+
+            if self.settings.claude_record_dir:
+                recorder = self._open_recorder(session_id)
+
             if process.stdout:
-                async for line in process.stdout:
+                while True:
+                    line = await asyncio.wait_for(
+                        process.stdout.readline(), timeout=deadline - loop.time()
+                    )
+                    if not line:
+                        break
                     decoded = line.decode().strip()
                     if decoded:
+                        if recorder:
+                            try:
+                                recorder.record(decoded)
+                            except OSError as e:
+                                self._record_failed(session_id, e)
+                                with suppress(OSError):
+                                    recorder.close()
+                                recorder = None
                         yield decoded
 
-            await asyncio.wait_for(process.wait(), timeout=self.settings.claude_timeout_seconds)
+            await asyncio.wait_for(process.wait(), timeout=deadline - loop.time())
         except TimeoutError:
-            process.kill()
-            await process.wait()
+            metrics.increment("claude.timeouts")
             raise
         finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            self.processes.pop(process.pid, None)
+            metrics.set_gauge("claude.processes", len(self.processes))
+            if recorder:
+                with suppress(OSError):
+                    recorder.close()
             if process.stderr:
                 await process.stderr.read()
+
+    def _open_recorder(self, session_id: str) -> TranscriptRecorder | None:
+        """Recording is best effort; a bad record dir must not take the turn down with it"""
+
+        try:
+            return TranscriptRecorder(transcript_path(self.settings.claude_record_dir, session_id))
+        except OSError as e:
+            self._record_failed(session_id, e)
+            return None
+
+    def _record_failed(self, session_id: str, error: OSError):
+        metrics.increment("claude.record_failures")
+        logger.warning("discord_ai.claude.record_failed", session_id=session_id, error=str(error))
@@ -1,5 +1,5 @@
 import json
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Sequence
 
 from discord_ai.claude.client import ClaudeClient
 from discord_ai.models import AssistantMessage, StreamEvent, UserMessage
@@ -9,8 +9,16 @@ class StreamParser:
     def __init__(self, client: ClaudeClient):
         self.client = client
 
-    async def parse_stream(self, session_id: str, message: str) -> AsyncIterator[StreamEvent]:
-        async for line in self.client.run_session(session_id, message):
+    async def parse_stream(
+        self,
+        session_id: str,
+        message: str,
+        model: str | None = None,
+        extra_args: Sequence[str] = (),
+    ) -> AsyncIterator[StreamEvent]:
+        async for line in self.client.run_session(
+            session_id, message, model=model, extra_args=extra_args
+        ):
             if not line.strip():
                 continue
 
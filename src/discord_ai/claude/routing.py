@@ -0,0 +1,120 @@
+import json
+import os
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import structlog
+
+from discord_ai.metrics import metrics
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class RouteDecision:
+    model: str | None
+    rule: str
+    content: str
+    extra_args: list[str] = field(default_factory=list)
+
+
+Rule = Callable[["ModelRouter", str, str], RouteDecision | None]
+
+
+def prefix_rule(router: "ModelRouter", channel_id: str, content: str) -> RouteDecision | None:
+    """``!fast do X`` style prefixes pick a model for a single message"""
+
+    head, _, rest = content.strip().partition(" ")
+    model = router.settings.claude_model_prefixes.get(head.lower())
+    if model is None:
+        return None
+    return RouteDecision(model=model, rule=f"prefix:{head.lower()}", content=rest.strip())
+
+
+def channel_pin_rule(router: "ModelRouter", channel_id: str, content: str) -> RouteDecision | None:
+    """Models pinned with ``!model``, falling back to configured channel overrides"""
+
+    model = router.pins.get(channel_id) or router.settings.claude_channel_models.get(channel_id)
+    if model is None:
+        return None
+    return RouteDecision(model=model, rule="channel_pin", content=content)
+
+
+def short_message_rule(
+    router: "ModelRouter", channel_id: str, content: str
+) -> RouteDecision | None:
+    """Short messages ("thanks", "yes do it") go to the fast model"""
+
+    settings = router.settings
+    if not settings.claude_short_message_model or not content.strip():
+        return None
+    if len(content) > settings.claude_short_message_max_chars:
+        return None
+    return RouteDecision(
+        model=settings.claude_short_message_model, rule="short_message", content=content
+    )
+
+
+DEFAULT_RULES: list[Rule] = [prefix_rule, channel_pin_rule, short_message_rule]
+
+
+class ModelRouter:
+    """Chooses the Claude model and CLI flags for each turn
+
+    Rules are tried in order and the first decision wins; with no match the
+    turn uses ``claude_model_default`` (or the CLI's own default when empty). Extra
+    CLI flags per model come from ``claude_model_args``.
+    """
+
+    def __init__(
+        self, settings, rules: list[Rule] | None = None, pins_path: str | Path | None = None
+    ):
+        self.settings = settings
+        self.rules = list(rules) if rules is not None else list(DEFAULT_RULES)
+        self.pins_path = Path(pins_path) if pins_path else None
+        self.pins: dict[str, str] = {}
+
+        if self.pins_path and self.pins_path.exists():
+            self.pins = json.loads(self.pins_path.read_text())
+
+    def route(self, channel_id: str, content: str) -> RouteDecision:
+        decision = None
+        for rule in self.rules:
+            decision = rule(self, channel_id, content)
+            if decision is not None:
+                break
+
+        if decision is None:
+            decision = RouteDecision(
+                model=self.settings.claude_model_default or None, rule="default", content=content
+            )
+
+        if decision.model:
+            decision.extra_args = list(self.settings.claude_model_args.get(decision.model, []))
+
+        metrics.increment(f"claude.route.{decision.rule}")
+        metrics.increment(f"claude.model.{decision.model or 'cli_default'}")
+        logger.info(
+            "discord_ai.route.selected",
+            channel_id=channel_id,
+            model=decision.model,
+            rule=decision.rule,
+        )
+        return decision
+
+    def pin(self, channel_id: str, model: str | None):
+        """Pin a model for a channel; None removes the pin"""
+
+        if model:
+            self.pins[channel_id] = model
+        else:
+            self.pins.pop(channel_id, None)
+
+        if self.pins_path:
+            self.pins_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.pins_path.with_suffix(self.pins_path.suffix + ".tmp")
+            tmp.write_text(json.dumps(self.pins, indent=2))
+            os.replace(tmp, self.pins_path)
+
+        logger.info("discord_ai.route.pinned", channel_id=channel_id, model=model)
@@ -0,0 +1,165 @@
+import asyncio
+from dataclasses import dataclass
+
+import structlog
+
+from discord_ai.models import AssistantMessage, TextContent, ToolUseContent, UserMessage
+
+logger = structlog.get_logger()
+
+DISCORD_MESSAGE_LIMIT = 2000
+ARG_VALUE_CHARS = 40
+ARGS_CHARS = 80
+NOTE_CHARS = 200
+
+MARKERS = {"running": "…", "finished": "✓", "failed": "✗"}
+
+
+@dataclass
+class ToolStatus:
+    tool_id: str
+    name: str
+    args: str
+    state: str = "running"
+
+
+def truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def format_args(tool_input: dict) -> str:
+    args = ", ".join(
+        f"{k}={truncate(str(v).replace(chr(10), ' '), ARG_VALUE_CHARS)}"
+        for k, v in tool_input.items()
+    )
+    return truncate(args, ARGS_CHARS)
+
+
+class ToolStatusMessage:
+    """Renders a turn's tool activity into one Discord message edited in place
+
+    The first tool call posts the status message; later changes are folded
+    into at most one edit per ``debounce_seconds``. Assistant text is held
+    back: text followed by more tool calls becomes the status note, and only
+    the text left at the end of the turn is returned for posting.
+
+    Writes are serialized, so an edit still in flight when the turn finishes
+    lands before the final one. If the status message cannot be posted, the
+    turn carries on without it.
+    """
+
+    def __init__(self, discord_client, channel_id: str, debounce_seconds: float = 1.5):
+        self.discord_client = discord_client
+        self.channel_id = channel_id
+        self.debounce_seconds = debounce_seconds
+        self.tools: dict[str, ToolStatus] = {}
+        self.note = ""
+        self.pending_text: list[str] = []
+        self.edits = 0
+        self._message = None
+        self._send_failed = False
+        self._update_task: asyncio.Task | None = None
+        self._write_lock = asyncio.Lock()
+
+    async def feed(self, event):
+        if isinstance(event, AssistantMessage):
+            for block in event.content_blocks:
+                if isinstance(block, TextContent):
+                    self.pending_text.append(block.text)
+                elif isinstance(block, ToolUseContent):
+                    if self.pending_text:
+                        self.note = truncate(" ".join(self.pending_text), NOTE_CHARS)
+                        self.pending_text = []
+                    self.tools[block.id] = ToolStatus(
+                        tool_id=block.id, name=block.name, args=format_args(block.input)
+                    )
+            await self._changed()
+
+        elif isinstance(event, UserMessage):
+            for item in event.message.get("content", []):
+                if not isinstance(item, dict) or item.get("type") != "tool_result":
+                    continue
+                tool = self.tools.get(item.get("tool_use_id", ""))
+                if tool:
+                    tool.state = "failed" if item.get("is_error") else "finished"
+            await self._changed()
+
+    async def finish(self, failed: bool = False) -> list[str]:
+        """Write the final status and return the assistant text still to be posted"""
+
+        if self._update_task:
+            self._update_task.cancel()
+            self._update_task = None
+
+        if failed:
+            for tool in self.tools.values():
+                if tool.state == "running":
+                    tool.state = "failed"
+
+        if self.tools:
+            await self._write()
+
+        text, self.pending_text = self.pending_text, []
+        return text
+
+    def render(self) -> str:
+        counts = dict.fromkeys(MARKERS, 0)
+        for tool in self.tools.values():
+            counts[tool.state] += 1
+        header = f"**Tools** ({counts['finished']} done"
+        if counts["failed"]:
+            header += f", {counts['failed']} failed"
+        if counts["running"]:
+            header += f", {counts['running']} running"
+        header += ")"
+
+        head = [header]
+        if self.note:
+            head.append(f"> {self.note}")
+        lines = [f"{MARKERS[t.state]} {t.name} ({t.args})" for t in self.tools.values()]
+
+        # Keep the newest lines when everything will not fit in one message
+        budget = DISCORD_MESSAGE_LIMIT - sum(len(line) + 1 for line in head) - 40
+        kept: list[str] = []
+        for line in reversed(lines):
+            if budget - len(line) - 1 < 0:
+                break
+            budget -= len(line) + 1
+            kept.append(line)
+        kept.reverse()
+
+        if len(kept) < len(lines):
+            head.append(f"… {len(lines) - len(kept)} earlier")
+        return "\n".join(head + kept)
+
+    async def _changed(self):
+        if not self.tools or self._send_failed:
+            return
+        if self._message is None:
+            await self._write()
+        elif self._update_task is None:
+            self._update_task = asyncio.create_task(self._debounced_write())
+
+    async def _debounced_write(self):
+        await asyncio.sleep(self.debounce_seconds)
+        self._update_task = None
+        try:
+            await self._write()
+        except Exception as e:
+            logger.warning(
+                "discord_ai.status.edit_failed", channel_id=self.channel_id, error=str(e)
+            )
+
+    async def _write(self):
+        async with self._write_lock:
+            if self._send_failed:
+                return
+            content = self.render()
+            if self._message is None:
+                self._message = await self.discord_client.send_message(self.channel_id, content)
+                if self._message is None:
+                    self._send_failed = True
+                    logger.warning("discord_ai.status.send_failed", channel_id=self.channel_id)
+            else:
+                await self.discord_client.edit_message(self.channel_id, self._message, content)
+                self.edits += 1
@@ -0,0 +1,84 @@
+import json
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+
+@dataclass
+class TranscriptLine:
+    delay: float
+    line: str
+
+
+class TranscriptRecorder:
+    """Writes raw stream-json lines with the delay since the previous line"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w", encoding="utf-8")
+        self._last = time.monotonic()
+
+    def record(self, line: str):
+        now = time.monotonic()
+        entry = {"delay": round(now - self._last, 6), "line": line}
+        self._last = now
+        self._file.write(json.dumps(entry) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+def transcript_path(record_dir: str | Path, session_id: str) -> Path:
+    stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%f")
+    return Path(record_dir) / f"{session_id}-{stamp}.jsonl"
+
+
+def load_transcript(path: str | Path) -> list[TranscriptLine]:
+    lines = []
+    with Path(path).open(encoding="utf-8") as f:
+        for raw in f:
+            if raw.strip():
+                entry = json.loads(raw)
+                lines.append(TranscriptLine(delay=entry["delay"], line=entry["line"]))
+    return lines
+
+
+def find_session_transcript(projects_dir: str | Path, session_id: str) -> Path | None:
+    """The Claude CLI's own log of a session (``<projects>/<project>/<session_id>.jsonl``)"""
+
+    matches = sorted(
+        Path(projects_dir).expanduser().glob(f"*/{session_id}.jsonl"),
+        key=lambda p: p.stat().st_mtime,
+    )
+    return matches[-1] if matches else None
+
+
+def load_session_entries(path: str | Path) -> list[dict]:
+    """User and assistant entries from a CLI session log, as stream-json shaped dicts
+
+    The session log uses camelCase keys (``sessionId``, ``toolUseResult``);
+    they are mapped onto the stream-json names the parser models expect.
+    """
+
+    entries = []
+    with Path(path).open(encoding="utf-8") as f:
+        for raw in f:
+            try:
+                entry = json.loads(raw)
+            except json.JSONDecodeError:
+                # The CLI may have died halfway through a line
+                continue
+            if entry.get("type") not in ("user", "assistant") or "uuid" not in entry:
+                continue
+            event = {
+                "type": entry["type"],
+                "message": entry.get("message", {}),
+                "session_id": entry.get("sessionId", entry.get("session_id")),
+                "uuid": entry["uuid"],
+            }
+            if entry["type"] == "user":
+                event["tool_use_result"] = entry.get("toolUseResult")
+            entries.append(event)
+    return entries
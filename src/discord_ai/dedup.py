@@ -0,0 +1,208 @@
+import asyncio
+import fcntl
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+import structlog
+
+from discord_ai.metrics import metrics
+
+logger = structlog.get_logger()
+
+
+class MessageDeduplicator:
+    """Bounded TTL cache of processed Discord message IDs
+
+    Gateway resumes can replay MESSAGE_CREATE for messages that were already
+    handled. Message IDs are recorded before any work starts, so a replay is
+    dropped even while the original turn is still running. With a persist
+    path the IDs are appended to a file and reloaded on startup.
+
+    The check is in memory; persisted IDs are queued and written in batches
+    by a background task (``start``), in a worker thread, so the event loop
+    never waits on the file or its lock. ``close`` writes what is left.
+
+    The file can be shared with a second instance during a rolling restart.
+    Every write holds an ``flock`` on a sibling ``.lock`` file. A writer
+    reopens the file if another process has swapped in a compacted copy.
+    Compaction rewrites the file from what is on disk, so it includes every
+    instance's IDs, and runs at startup and whenever the file reaches twice
+    ``max_entries`` lines.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600,
+        max_entries: int = 10000,
+        persist_path: str | Path | None = None,
+        clock=time.time,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.clock = clock
+        self._seen: OrderedDict[str, float] = OrderedDict()
+        self._file = None
+        self._lock_file = None
+        self._lines = 0
+        self._pending: list[tuple[str, float]] = []
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+        if self.persist_path:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def check_and_mark(self, message_id: str) -> bool:
+        """Return True if the message was already processed, otherwise record it"""
+
+        now = self.clock()
+        self._expire(now)
+
+        if message_id in self._seen:
+            metrics.increment("messages.duplicates_dropped")
+            return True
+
+        self._seen[message_id] = now
+        while len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+
+        if self._file:
+            self._pending.append((message_id, now))
+            self._wake.set()
+
+        return False
+
+    def start(self):
+        if self._file and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def refresh(self):
+        """Pick up IDs other instances recorded since we loaded, e.g. on taking over routing"""
+
+        if self._lock_file is None:
+            return
+        on_disk = await asyncio.to_thread(self._read_locked)
+        for message_id, seen_at in on_disk.items():
+            self._seen.setdefault(message_id, seen_at)
+        self._seen = OrderedDict(sorted(self._seen.items(), key=lambda item: item[1]))
+        self._expire(self.clock())
+        while len(self._seen) > self.max_entries:
+            self._seen.popitem(last=False)
+
+    async def close(self):
+        """Stop the writer, write any queued IDs and close the file"""
+
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending:
+            await self._flush()
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self._lock_file:
+            self._lock_file.close()
+            self._lock_file = None
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            await self._flush()
+
+    async def _flush(self):
+        self._wake.clear()
+        batch, self._pending = self._pending, []
+        try:
+            await asyncio.to_thread(self._append, batch)
+        except OSError as e:
+            metrics.increment("dedup.write_errors")
+            logger.error("discord_ai.dedup.write_failed", error=str(e), entries=len(batch))
+
+    def _expire(self, now: float):
+        cutoff = now - self.ttl_seconds
+        while self._seen:
+            oldest_id, seen_at = next(iter(self._seen.items()))
+            if seen_at > cutoff:
+                break
+            del self._seen[oldest_id]
+
+    def _load(self):
+        """Reload unexpired IDs and compact the file down to them"""
+
+        self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self.persist_path.with_name(self.persist_path.name + ".lock")
+        self._lock_file = lock_path.open("a")
+
+        with self._locked():
+            self._seen = self._read()
+            self._rewrite(self._seen)
+        logger.info("discord_ai.dedup.loaded", path=str(self.persist_path), entries=len(self._seen))
+
+    @contextmanager
+    def _locked(self):
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _append(self, batch: list[tuple[str, float]]):
+        """Runs in a worker thread; only the writer touches the file handle"""
+
+        with self._locked():
+            self._reopen_if_replaced()
+            self._file.write("".join(f"{mid} {ts}\n" for mid, ts in batch))
+            self._file.flush()
+            self._lines += len(batch)
+            if self._lines > 2 * self.max_entries:
+                self._rewrite(self._read())
+
+    def _reopen_if_replaced(self):
+        try:
+            on_disk = os.stat(self.persist_path).st_ino
+        except FileNotFoundError:
+            on_disk = None
+        if on_disk != os.fstat(self._file.fileno()).st_ino:
+            self._file.close()
+            self._file = self.persist_path.open("a", encoding="utf-8")
+
+    def _read_locked(self) -> OrderedDict[str, float]:
+        with self._locked():
+            return self._read()
+
+    def _read(self) -> OrderedDict[str, float]:
+        """Unexpired IDs written by any process, oldest first; the caller holds the lock"""
+
+        entries: dict[str, float] = {}
+        if self.persist_path.exists():
+            for line in self.persist_path.read_text().splitlines():
+                message_id, _, seen_at = line.partition(" ")
+                try:
+                    entries.setdefault(message_id, float(seen_at))
+                except ValueError:
+                    continue
+        cutoff = self.clock() - self.ttl_seconds
+        live = sorted((item for item in entries.items() if item[1] > cutoff), key=lambda i: i[1])
+        return OrderedDict(live[-self.max_entries :])
+
+    def _rewrite(self, entries: OrderedDict[str, float]):
+        """Replace the file with ``entries``; the caller holds the lock"""
+
+        tmp_path = self.persist_path.with_suffix(".tmp")
+        tmp_path.write_text("".join(f"{mid} {ts}\n" for mid, ts in entries.items()))
+        tmp_path.replace(self.persist_path)
+
+        if self._file:
+            self._file.close()
+        self._file = self.persist_path.open("a", encoding="utf-8")
+        self._lines = len(entries)
@@ -1,3 +1,5 @@
+from collections import Counter
+from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import Protocol
 
@@ -6,6 +8,7 @@ from typing import Protocol
 class FakeMessage:
     content: str
     channel_id: str
+    edits: int = 0
 
 
 @dataclass
@@ -24,6 +27,10 @@ class DiscordClient(Protocol):
     """Protocol for Discord API interaction"""
 
     async def send_message(self, channel_id: str, content: str):
+        """Send a message; returns a handle usable with ``edit_message``"""
+        ...
+
+    async def edit_message(self, channel_id: str, message, content: str):
         ...
 
     def get_channel(self, channel_id: str):
@@ -43,6 +50,11 @@ class FakeDiscordClient:
 
         msg = FakeMessage(content=content, channel_id=channel_id)
         self._messages[channel_id].append(msg)
+        return msg
+
+    async def edit_message(self, channel_id: str, message: FakeMessage, content: str):
+        message.content = content
+        message.edits += 1
 
     def get_messages(self, channel_id: str) -> list[FakeMessage]:
         return self._messages.get(channel_id, [])
@@ -56,13 +68,38 @@ class FakeDiscordClient:
 class RealDiscordClient:
     """Real implementation using discord.py"""
 
-    def __init__(self, bot):
+    def __init__(self, bot, webhooks=None):
         self.bot = bot
+        self.webhooks = webhooks
+        self.pending: Counter[str] = Counter()
 
     async def send_message(self, channel_id: str, content: str):
         channel = self.bot.get_channel(int(channel_id))
-        if channel:
-            await channel.send(content)
+        if not channel:
+            return None
+        with self._tracked(channel_id):
+            if self.webhooks is not None:
+                message = await self.webhooks.send(channel, content)
+                if message is not None:
+                    return message
+            return await channel.send(content)
+
+    async def edit_message(self, channel_id: str, message, content: str):
+        if message is not None:
+            with self._tracked(channel_id):
+                await message.edit(content=content)
+
+    @contextmanager
+    def _tracked(self, channel_id: str):
+        """Count requests waiting on Discord, including time spent rate limited"""
+
+        self.pending[channel_id] += 1
+        try:
+            yield
+        finally:
+            self.pending[channel_id] -= 1
+            if not self.pending[channel_id]:
+                del self.pending[channel_id]
 
     def get_channel(self, channel_id: str):
         return self.bot.get_channel(int(channel_id))
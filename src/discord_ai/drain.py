@@ -0,0 +1,91 @@
+import asyncio
+import time
+from collections.abc import Callable
+
+import structlog
+
+from discord_ai.metrics import metrics
+
+logger = structlog.get_logger()
+
+DRAIN_POLL_SECONDS = 0.5
+RESUME_NOTICE = "||Restarting mid-turn; this turn will be picked up again after the restart||"
+CUT_OFF_NOTICE = "||Restarting mid-turn; this turn was cut off, reply to continue||"
+
+
+class GracefulDrain:
+    """Winds down routing before the process exits
+
+    New turns are refused and turns waiting in admission are told to resend.
+    In-flight turns get up to ``drain_timeout_seconds`` to finish; that
+    includes turns the router admitted that are still fetching attachments.
+    Whatever is still running after that is announced in its channel and
+    cancelled. With the in-flight store enabled, cancelled turns that
+    reached Claude keep their record, so the next instance resumes them. Finally, outbound sends get up to
+    ``drain_flush_seconds`` to reach Discord.
+    """
+
+    def __init__(
+        self, settings, router, message_handler, discord_client, inflight=None, clock=time.monotonic
+    ):
+        self.settings = settings
+        self.router = router
+        self.message_handler = message_handler
+        self.discord_client = discord_client
+        self.inflight = inflight
+        self.clock = clock
+
+    async def run(self) -> bool:
+        """Drain; returns True if every in-flight turn finished in time"""
+
+        started = self.clock()
+        self.router.begin_drain()
+        logger.info(
+            "discord_ai.drain.started",
+            routing=sum(self.router.in_progress.values()),
+            turns=sum(self.message_handler.active_turns.values()),
+        )
+
+        # Resumed turns go straight to the handler, so the router does not count them
+        finished = await self._wait_until(
+            lambda: not self.router.in_progress and not self.message_handler.active_turns,
+            self.settings.drain_timeout_seconds,
+        )
+        running = set(self.message_handler.active_turns)
+        cut_off = sorted(running | set(self.router.in_progress))
+        if cut_off:
+            for channel_id in cut_off:
+                # Only turns that reached the handler have an in-flight record to resume
+                resumable = self.inflight is not None and channel_id in running
+                notice = RESUME_NOTICE if resumable else CUT_OFF_NOTICE
+                try:
+                    await self.discord_client.send_message(channel_id, notice)
+                except Exception as e:
+                    logger.warning(
+                        "discord_ai.drain.notice_failed", channel_id=channel_id, error=str(e)
+                    )
+            await self.router.cancel_turns()
+            await self.message_handler.cancel_turns()
+            metrics.increment("drain.turns_cut_off", len(cut_off))
+
+        flushed = await self._wait_until(
+            lambda: not getattr(self.discord_client, "pending", None),
+            self.settings.drain_flush_seconds,
+        )
+
+        metrics.set_gauge("drain.seconds", self.clock() - started)
+        logger.info(
+            "discord_ai.drain.finished",
+            seconds=round(self.clock() - started, 2),
+            cut_off=len(cut_off),
+            flushed=flushed,
+        )
+        return finished
+
+    async def _wait_until(self, done: Callable[[], bool], timeout: float) -> bool:
+        deadline = self.clock() + timeout
+        while not done():
+            if self.clock() >= deadline:
+                return False
+            await asyncio.sleep(DRAIN_POLL_SECONDS)
+        return True
@@ -0,0 +1,144 @@
+import asyncio
+import math
+import tempfile
+import threading
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+
+import discord
+import structlog
+from discord.ext import commands
+
+from discord_ai.claude.status import DISCORD_MESSAGE_LIMIT
+
+logger = structlog.get_logger()
+
+TOP_FUNCTIONS = 25
+
+
+def admin_only():
+    """Command check allowing the bot owner and guild administrators"""
+
+    return commands.check_any(commands.is_owner(), commands.has_permissions(administrator=True))
+
+
+def profile_output_dir(settings) -> Path:
+    if settings.profile_output_dir:
+        return Path(settings.profile_output_dir)
+    return Path(tempfile.gettempdir()) / "discord-ai-profiles"
+
+
+async def profile_command(ctx, seconds: float, settings):
+    """Sample the event loop for ``seconds`` and post the hottest functions"""
+
+    from discord_ai.utils.profiler import SamplingProfiler
+
+    if not math.isfinite(seconds) or seconds <= 0:
+        await ctx.send("||Error: profile duration must be a positive number||")
+        return
+    seconds = min(seconds, settings.profile_max_seconds)
+
+    logger.info("discord_ai.admin.profile_started", seconds=seconds, user=str(ctx.author))
+    await ctx.send(f"Profiling for {seconds:g}s...")
+
+    profiler = SamplingProfiler(thread_id=threading.get_ident())
+    profiler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        await asyncio.to_thread(profiler.stop)
+
+    output_dir = profile_output_dir(settings)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # The suffix keeps two profiles finished in the same second from overwriting each other
+    stamp = f"{datetime.now(UTC).strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    collapsed_path = output_dir / f"profile-{stamp}.collapsed"
+    top_path = output_dir / f"profile-{stamp}-top.txt"
+    collapsed_path.write_text(profiler.collapsed())
+    top_path.write_text(profiler.format_top(TOP_FUNCTIONS))
+
+    logger.info(
+        "discord_ai.admin.profile_finished",
+        samples=profiler.sample_count,
+        collapsed_path=str(collapsed_path),
+    )
+
+    await ctx.send(
+        f"Profile finished: {profiler.sample_count} samples over {seconds:g}s",
+        files=[discord.File(top_path), discord.File(collapsed_path)],
+    )
+
+
+async def model_command(ctx, name: str | None, model_router):
+    """Show, pin or reset (``reset``) the Claude model for the current channel"""
+
+    channel_id = str(ctx.channel.id)
+
+    if name is None:
+        pinned = model_router.pins.get(channel_id)
+        await ctx.send(f"Pinned model: {pinned}" if pinned else "No model pinned for this channel")
+        return
+
+    if name.lower() == "reset":
+        model_router.pin(channel_id, None)
+        await ctx.send("Model pin removed for this channel")
+        return
+
+    model_router.pin(channel_id, name)
+    await ctx.send(f"Pinned model {name} for this channel")
+
+
+def register_admin_commands(
+    bot, settings, model_router=None, reloader=None, stats=None, memory=None
+):
+    """Register admin-only diagnostic commands on the bot"""
+
+    @bot.command(name="profile")
+    @admin_only()
+    async def profile(ctx, seconds: float = 10.0):
+        await profile_command(ctx, seconds, settings)
+
+    if stats is not None:
+
+        @bot.command(name="stats")
+        @admin_only()
+        async def stats_(ctx):
+            await ctx.send(stats.format(gateway_latency=ctx.bot.latency))
+
+    if memory is not None:
+
+        @bot.command(name="memory")
+        @admin_only()
+        async def memory_(ctx):
+            await memory.sample()
+            await ctx.send(memory.format(limit=DISCORD_MESSAGE_LIMIT))
+
+    if reloader is not None:
+
+        @bot.command(name="reload")
+        @admin_only()
+        async def reload(ctx):
+            logger.info("discord_ai.admin.reload", user=str(ctx.author))
+            await ctx.send(reloader.reload().summary())
+
+    if model_router is not None:
+
+        @bot.command(name="model")
+        @commands.check_any(commands.is_owner(), commands.has_permissions(manage_channels=True))
+        async def model(ctx, name: str | None = None):
+            await model_command(ctx, name, model_router)
+
+    @bot.event
+    async def on_command_error(ctx, error):
+        if isinstance(error, commands.CommandNotFound):
+            return
+        if isinstance(error, commands.CheckFailure):
+            await ctx.send("||Error: this command is restricted to administrators||")
+            return
+        if isinstance(error, commands.UserInputError):
+            await ctx.send(f"||Error: {error}||")
+            return
+
+        logger.error("discord_ai.admin.command_error", command=str(ctx.command), error=str(error))
+        await ctx.send(f"||Error: {error}||")
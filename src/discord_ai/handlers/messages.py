@@ -1,9 +1,14 @@
 import asyncio
+import time
+from collections import Counter
+from collections.abc import Sequence
 
 import structlog
 
 from discord_ai.claude.formatter import EventFormatter
 from discord_ai.claude.parser import StreamParser
+from discord_ai.claude.status import ToolStatusMessage
+from discord_ai.metrics import TURN_LATENCY_METRIC, metrics
 from discord_ai.utils.typing import typing_loop
 
 logger = structlog.get_logger()
@@ -12,14 +17,72 @@ logger = structlog.get_logger()
 class MessageHandler:
     """Handles incoming Discord messages"""
 
-    def __init__(self, claude_client, discord_client, settings):
+    def __init__(self, claude_client, discord_client, settings, inflight=None, memory=None):
         self.claude_client = claude_client
+        self.inflight = inflight
+        self.memory = memory
         self.discord_client = discord_client
         self.settings = settings
         self.parser = StreamParser(claude_client)
         self.formatter = EventFormatter()
+        self.active_turns: Counter[str] = Counter()
+        self._turn_tasks: set[asyncio.Task] = set()
 
-    async def handle_message(self, channel_id: str, session_id: str, content: str):
+    async def handle_message(
+        self,
+        channel_id: str,
+        session_id: str,
+        content: str,
+        model: str | None = None,
+        extra_args: Sequence[str] = (),
+        message_id: str | None = None,
+    ):
+        tracked = self.inflight is not None and message_id is not None
+        if tracked:
+            self.inflight.begin(message_id, channel_id, session_id, content, model)
+
+        self.active_turns[channel_id] += 1
+        task = asyncio.current_task()
+        self._turn_tasks.add(task)
+        memory_before = self.memory.turn_started() if self.memory else 0
+        started = time.perf_counter()
+        try:
+            await self._run_turn(
+                channel_id, session_id, content, model, extra_args, message_id if tracked else None
+            )
+            if tracked:
+                self.inflight.finish(message_id)
+        except Exception:
+            # A cancelled turn (shutdown) keeps its record so it can be resumed
+            if tracked:
+                self.inflight.finish(message_id)
+            raise
+        finally:
+            metrics.observe(TURN_LATENCY_METRIC, time.perf_counter() - started)
+            self._turn_tasks.discard(task)
+            if self.memory:
+                self.memory.turn_finished(channel_id, session_id, memory_before)
+            self.active_turns[channel_id] -= 1
+            if not self.active_turns[channel_id]:
+                del self.active_turns[channel_id]
+
+    async def cancel_turns(self):
+        """Cancel every running turn (used when a shutdown drain runs out of time)"""
+
+        tasks = [task for task in self._turn_tasks if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_turn(
+        self,
+        channel_id: str,
+        session_id: str,
+        content: str,
+        model: str | None,
+        extra_args: Sequence[str],
+        message_id: str | None,
+    ):
         channel = self.discord_client.get_channel(channel_id)
 
         await channel.typing()
@@ -27,17 +90,41 @@ class MessageHandler:
         interval = getattr(self.settings, "typing_interval_seconds", 5) if self.settings else 5
         typing_task = asyncio.create_task(typing_loop(channel, interval=interval))
 
+        status = None
+        if self.settings and self.settings.tool_output_mode == "status":
+            status = ToolStatusMessage(
+                self.discord_client, channel_id, self.settings.tool_status_debounce_seconds
+            )
+
         try:
-            async for event in self.parser.parse_stream(session_id, content):
-                messages = self.formatter.format_event(event)
-                for msg in messages:
-                    logger.info(
-                        "discord_ai.message.sending", channel_id=channel_id, content_length=len(msg)
-                    )
-                    await self.discord_client.send_message(channel_id, msg)
+            async for event in self.parser.parse_stream(
+                session_id, content, model=model, extra_args=extra_args
+            ):
+                if status:
+                    await status.feed(event)
+                else:
+                    for msg in self.formatter.format_event(event):
+                        await self._send(channel_id, msg)
+                # Text held back by the status message has not reached Discord yet
+                if message_id and not (status and status.pending_text):
+                    self.inflight.progress(message_id, str(event.uuid))
+
+            if status:
+                for msg in await status.finish():
+                    await self._send(channel_id, msg)
+        except Exception:
+            # Still post whatever Claude said before the failure
+            if status:
+                for msg in await status.finish(failed=True):
+                    await self._send(channel_id, msg)
+            raise
         finally:
             typing_task.cancel()
             try:
                 await typing_task
             except asyncio.CancelledError:
                 pass
+
+    async def _send(self, channel_id: str, msg: str):
+        logger.info("discord_ai.message.sending", channel_id=channel_id, content_length=len(msg))
+        await self.discord_client.send_message(channel_id, msg)
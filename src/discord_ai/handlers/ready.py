@@ -1,3 +1,4 @@
+import asyncio
 import sys
 
 import structlog
@@ -48,7 +49,6 @@ Available categories in server:
         "discord_ai.category.found", category=category.name, channels=len(category.channels)
     )
 
-    for channel in category.channels:
-        await initialize_channel(channel)
+    await asyncio.gather(*(initialize_channel(channel) for channel in category.channels))
 
     logger.info("discord_ai.bot.ready_complete")
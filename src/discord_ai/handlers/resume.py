@@ -0,0 +1,135 @@
+import asyncio
+from pathlib import Path
+
+import structlog
+
+from discord_ai.claude.transcripts import find_session_transcript, load_session_entries
+from discord_ai.inflight import InflightStore, InflightTurn
+from discord_ai.metrics import metrics
+from discord_ai.models import AssistantMessage, UserMessage
+
+logger = structlog.get_logger()
+
+PID_POLL_SECONDS = 1.0
+
+
+def cli_still_running(pid: int | None, session_id: str) -> bool:
+    """True if ``pid`` is still the Claude CLI for this session (guards against PID reuse)"""
+
+    if not pid:
+        return False
+    try:
+        cmdline = Path(f"/proc/{pid}/cmdline").read_bytes()
+    except OSError:
+        return False
+    return session_id.encode() in cmdline
+
+
+def prompt_text(message: dict) -> str:
+    content = message.get("content", "")
+    if isinstance(content, str):
+        return content
+    return "".join(b.get("text", "") for b in content if isinstance(b, dict))
+
+
+def unsent_entries(entries: list[dict], turn: InflightTurn) -> list[dict] | None:
+    """Session-log entries of this turn that never reached Discord
+
+    None means the log holds nothing usable for the turn, so it has to run
+    again. When part of the turn was already forwarded, the log is trusted
+    only after the last forwarded event. An unknown UUID gives an empty
+    list, because re-running would repeat work the user has already seen.
+    """
+
+    if turn.last_uuid:
+        for index, entry in enumerate(entries):
+            if entry["uuid"] == turn.last_uuid:
+                return entries[index + 1 :]
+        return []
+
+    for index in range(len(entries) - 1, -1, -1):
+        entry = entries[index]
+        if entry["type"] == "user" and prompt_text(entry["message"]) == turn.content:
+            rest = entries[index + 1 :]
+            if any(e["type"] == "assistant" for e in rest):
+                return rest
+            return None
+    return None
+
+
+def turn_completed(entries: list[dict]) -> bool:
+    """The turn ended on a text-only assistant message rather than mid tool loop"""
+
+    if not entries or entries[-1]["type"] != "assistant":
+        return False
+    blocks = entries[-1]["message"].get("content", [])
+    return bool(blocks) and all(b.get("type") == "text" for b in blocks)
+
+
+async def resume_turn(turn: InflightTurn, store: InflightStore, message_handler, settings):
+    discord = message_handler.discord_client
+
+    deadline = asyncio.get_running_loop().time() + settings.resume_wait_seconds
+    while cli_still_running(turn.pid, turn.session_id):
+        if asyncio.get_running_loop().time() >= deadline:
+            break
+        await asyncio.sleep(PID_POLL_SECONDS)
+
+    path = find_session_transcript(settings.claude_projects_dir, turn.session_id)
+    entries = await asyncio.to_thread(load_session_entries, path) if path else []
+    rest = unsent_entries(entries, turn)
+
+    if rest is None:
+        metrics.increment("inflight.rerun")
+        logger.info(
+            "discord_ai.inflight.rerun", channel_id=turn.channel_id, session_id=turn.session_id
+        )
+        await discord.send_message(
+            turn.channel_id, "||Restarted mid-turn; running your message again||"
+        )
+        await message_handler.handle_message(
+            channel_id=turn.channel_id,
+            session_id=turn.session_id,
+            content=turn.content,
+            model=turn.model,
+            message_id=turn.message_id,
+        )
+        return
+
+    metrics.increment("inflight.resumed")
+    logger.info(
+        "discord_ai.inflight.resumed",
+        channel_id=turn.channel_id,
+        session_id=turn.session_id,
+        entries=len(rest),
+    )
+    if rest:
+        await discord.send_message(turn.channel_id, "||Resumed after a restart||")
+    for entry in rest:
+        event_class = AssistantMessage if entry["type"] == "assistant" else UserMessage
+        for msg in message_handler.formatter.format_event(event_class(**entry)):
+            await discord.send_message(turn.channel_id, msg)
+    if not turn_completed(entries):
+        await discord.send_message(
+            turn.channel_id, "||This turn was interrupted by a restart; reply to continue||"
+        )
+    store.finish(turn.message_id)
+
+
+async def resume_inflight(store: InflightStore, message_handler, settings):
+    """Deal with every turn a previous process left unfinished"""
+
+    turns = store.pending()
+    if turns:
+        logger.info("discord_ai.inflight.found", turns=len(turns))
+
+    async def resume_one(turn: InflightTurn):
+        try:
+            await resume_turn(turn, store, message_handler, settings)
+        except Exception as e:
+            logger.error(
+                "discord_ai.inflight.resume_failed", message_id=turn.message_id, error=str(e)
+            )
+            store.finish(turn.message_id)
+
+    await asyncio.gather(*(resume_one(turn) for turn in turns))
@@ -0,0 +1,260 @@
+import asyncio
+import time
+from collections import Counter, deque
+from collections.abc import Collection
+from contextlib import nullcontext
+
+import structlog
+
+from discord_ai.admission import DRAINING
+from discord_ai.attachments import describe_attachments
+from discord_ai.handlers.threads import is_session_thread, resume_thread_session
+from discord_ai.metrics import metrics
+
+logger = structlog.get_logger()
+
+MAX_HELD_MESSAGES = 1000
+
+
+class MessageRouter:
+    """Routes incoming Discord messages to bot commands or the MessageHandler
+
+    A router started in ``standby`` holds messages (up to
+    ``MAX_HELD_MESSAGES``, oldest dropped first) until ``take_over`` (the
+    routing lease is ours), then replays the ones the previous instance left
+    alone. Once ``begin_drain`` is called it stops starting turns. When a
+    lease is configured, messages are ignored from then on and the
+    successor picks them up. Otherwise the author is asked to resend.
+    ``in_progress`` counts admitted turns per channel from admission until
+    the reply is done, including while attachments download.
+    """
+
+    def __init__(
+        self,
+        bot,
+        message_handler,
+        settings,
+        deduplicator=None,
+        admission=None,
+        attachments=None,
+        sessions=None,
+        model_router=None,
+        webhooks=None,
+        workspaces=None,
+        standby: bool = False,
+        clock=time.time,
+    ):
+        self.bot = bot
+        self.message_handler = message_handler
+        self.settings = settings
+        self.deduplicator = deduplicator
+        self.admission = admission
+        self.attachments = attachments
+        self.sessions = sessions
+        self.model_router = model_router
+        self.webhooks = webhooks
+        self.workspaces = workspaces
+        self.standby = standby
+        self.clock = clock
+        self.draining = False
+        self.in_progress: Counter[str] = Counter()
+        self._turn_tasks: set[asyncio.Task] = set()
+        # (arrival time, message) pairs
+        self.held: deque = deque(maxlen=MAX_HELD_MESSAGES)
+
+    async def on_message(self, message):
+        if message.author == self.bot.user:
+            return
+        if self.webhooks is not None and self.webhooks.owns(message):
+            return
+
+        if self.standby:
+            if len(self.held) == self.held.maxlen:
+                metrics.increment("router.held_dropped")
+                logger.warning(
+                    "discord_ai.router.held_dropped",
+                    message_id=self.held[0][1].id,
+                    channel=self.held[0][1].channel.name,
+                )
+            self.held.append((self.clock(), message))
+            return
+        if self.draining and self.settings.routing_lease_path:
+            return
+
+        ctx = await self.bot.get_context(message)
+        if ctx.valid:
+            if not self._is_duplicate(message):
+                await self.bot.invoke(ctx)
+            return
+
+        session_id = await self._resolve_session(message)
+        if session_id is None or self._is_duplicate(message):
+            return
+
+        logger.info(
+            "discord_ai.message.received",
+            channel=message.channel.name,
+            session_id=session_id,
+            user=str(message.author),
+        )
+
+        if self.draining:
+            await message.channel.send(DRAINING.message)
+            return
+
+        if self.admission is not None:
+            decision = await self.admission.admit(
+                user_id=str(message.author.id),
+                channel_id=str(message.channel.id),
+                on_defer=lambda _: message.channel.send(
+                    "Busy right now, your message is queued..."
+                ),
+            )
+            if not decision.allowed:
+                await message.channel.send(decision.message)
+                return
+
+        channel_id = str(message.channel.id)
+        self.in_progress[channel_id] += 1
+        task = asyncio.current_task()
+        self._turn_tasks.add(task)
+        try:
+            # Held before attachments land in the workspace, so GC cannot remove them
+            async with self._hold_workspace(session_id):
+                content = message.content
+                route = None
+                if self.model_router is not None:
+                    route = self.model_router.route(str(message.channel.id), content)
+                    content = route.content
+                    if route.rule.startswith("prefix:") and not content and not message.attachments:
+                        prefix = route.rule.partition(":")[2]
+                        await message.channel.send(f"||Usage: {prefix} <message>||")
+                        return
+
+                extra_args = tuple(route.extra_args) if route else ()
+                dest_dir = None
+                if self.workspaces is not None:
+                    warning = await self.workspaces.quota_warning(session_id)
+                    if warning:
+                        await message.channel.send(f"||{warning}||")
+                    dest_dir = self.workspaces.attachments_dir(session_id)
+
+                if self.attachments is not None and message.attachments:
+                    stored, skipped = await self.attachments.fetch_all(
+                        session_id, message.attachments, dest_dir=dest_dir
+                    )
+                    for item in skipped:
+                        await message.channel.send(
+                            f"||Skipped attachment {item.filename}: {item.reason}||"
+                        )
+                    content = describe_attachments(content, stored)
+                    # Outside a workspace the files are not under the CLI's cwd
+                    if stored and dest_dir is None:
+                        session_dir = self.attachments.session_dir(session_id)
+                        extra_args += ("--add-dir", str(session_dir))
+
+                await self.message_handler.handle_message(
+                    channel_id=str(message.channel.id),
+                    session_id=session_id,
+                    content=content,
+                    model=route.model if route else None,
+                    extra_args=extra_args,
+                    message_id=str(message.id),
+                )
+        except Exception as e:
+            logger.error("discord_ai.message.error", error=str(e), channel=message.channel.name)
+            await message.channel.send(f"||Error: {str(e)}||")
+        finally:
+            self._turn_tasks.discard(task)
+            self.in_progress[channel_id] -= 1
+            if not self.in_progress[channel_id]:
+                del self.in_progress[channel_id]
+            if self.admission is not None:
+                self.admission.release()
+
+    async def take_over(self, since: float | None = None, skip: Collection[str] = ()):
+        """Leave standby and route the messages that arrived while waiting
+
+        Messages that arrived before ``since`` (when the previous instance
+        stopped routing) were its to answer, and ``skip`` holds the IDs of
+        turns it left to be resumed; neither is replayed. Each channel's
+        messages are replayed in order, channels side by side.
+        """
+
+        # The previous instance kept marking messages after we loaded the file.
+        # Still in standby meanwhile, so anything arriving now is held too.
+        if self.deduplicator is not None:
+            await self.deduplicator.refresh()
+
+        self.standby = False
+        held = [
+            message
+            for arrived, message in self.held
+            if (since is None or arrived >= since) and str(message.id) not in skip
+        ]
+        skipped = len(self.held) - len(held)
+        self.held.clear()
+        logger.info("discord_ai.router.took_over", held=len(held), skipped=skipped)
+
+        by_channel: dict[int, list] = {}
+        for message in held:
+            by_channel.setdefault(message.channel.id, []).append(message)
+        await asyncio.gather(*(asyncio.create_task(self._replay(m)) for m in by_channel.values()))
+
+    async def _replay(self, messages: list):
+        for message in messages:
+            try:
+                await self.on_message(message)
+            except Exception as e:
+                logger.error("discord_ai.router.replay_failed", message_id=message.id, error=str(e))
+
+    def begin_drain(self):
+        self.draining = True
+        if self.admission is not None:
+            self.admission.close()
+
+    async def cancel_turns(self):
+        """Cancel every admitted turn, wherever it is (used when a shutdown drain runs out of time)"""
+
+        tasks = [task for task in self._turn_tasks if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _is_duplicate(self, message) -> bool:
+        """Marks the message; only messages for a session or a command are recorded"""
+
+        if self.deduplicator is None or not self.deduplicator.check_and_mark(str(message.id)):
+            return False
+        logger.warning(
+            "discord_ai.message.duplicate", message_id=message.id, channel=message.channel.name
+        )
+        return True
+
+    def _hold_workspace(self, session_id: str):
+        if self.workspaces is None:
+            return nullcontext()
+        return self.workspaces.hold(session_id)
+
+    async def _resolve_session(self, message) -> str | None:
+        """Session ID for a message, or None if the channel is not a session"""
+
+        channel = message.channel
+
+        if self.sessions is not None and is_session_thread(channel, self.settings):
+            return await resume_thread_session(channel, self.sessions)
+
+        if not getattr(channel, "category", None):
+            return None
+
+        if channel.category.name != self.settings.category_name:
+            return None
+
+        topic = getattr(channel, "topic", None) or ""
+
+        if not topic.startswith("Session: "):
+            logger.warning("discord_ai.message.no_session_id", channel=channel.name)
+            await channel.send("||Error: No session ID found in channel topic||")
+            return None
+
+        return topic.replace("Session: ", "").strip()
@@ -0,0 +1,134 @@
+import asyncio
+
+import structlog
+
+logger = structlog.get_logger()
+
+ARCHIVE_CHECK_SECONDS = 60
+
+
+def is_session_thread(channel, settings) -> bool:
+    """True for threads whose parent channel is designated for thread sessions"""
+
+    parent = getattr(channel, "parent", None)
+    return parent is not None and parent.name in settings.thread_session_channels
+
+
+async def resume_thread_session(thread, index) -> str:
+    """Session ID for a thread message, re-initialising archived sessions lazily"""
+
+    session = index.ensure(str(thread.id), str(thread.parent.id), thread.name)
+
+    if session.archived or getattr(thread, "archived", False):
+        logger.info(
+            "discord_ai.thread.reactivated", thread=thread.name, session_id=session.session_id
+        )
+        index.set_archived(session.thread_id, False)
+        if getattr(thread, "archived", False):
+            try:
+                await thread.edit(archived=False)
+            except Exception as e:
+                logger.warning(
+                    "discord_ai.thread.unarchive_failed", thread=thread.name, error=str(e)
+                )
+
+    index.touch(session.thread_id)
+    return session.session_id
+
+
+async def on_thread_create(thread, settings, index):
+    """Handle new thread creation"""
+
+    if not is_session_thread(thread, settings):
+        return
+
+    logger.info("discord_ai.thread.created", thread=thread.name, parent=thread.parent.name)
+    index.ensure(str(thread.id), str(thread.parent.id), thread.name)
+
+
+async def on_thread_update(before, after, settings, index):
+    """Keep archive state in the session index in sync with Discord"""
+
+    if not is_session_thread(after, settings):
+        return
+
+    if before.archived != after.archived:
+        logger.info("discord_ai.thread.archive_changed", thread=after.name, archived=after.archived)
+        index.set_archived(str(after.id), after.archived)
+
+
+async def on_thread_delete(thread, settings, index):
+    """Forget deleted threads"""
+
+    if is_session_thread(thread, settings):
+        index.remove(str(thread.id))
+
+
+async def sync_threads(bot, settings, index):
+    """Register active threads under designated channels that appeared while offline"""
+
+    for guild in bot.guilds:
+        for thread in guild.threads:
+            if is_session_thread(thread, settings):
+                session = index.ensure(str(thread.id), str(thread.parent.id), thread.name)
+                index.set_archived(session.thread_id, bool(thread.archived))
+
+
+class ThreadArchiver:
+    """Archives thread sessions that have been idle too long"""
+
+    def __init__(self, bot, settings, index):
+        self.bot = bot
+        self.settings = settings
+        self.index = index
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(ARCHIVE_CHECK_SECONDS)
+            try:
+                await self.archive_idle()
+            except Exception as e:
+                logger.error("discord_ai.thread.archive_loop_failed", error=str(e))
+
+    async def archive_idle(self) -> int:
+        minutes = self.settings.thread_idle_archive_minutes
+        if minutes <= 0:
+            return 0
+
+        archived = 0
+        for session in self.index.idle(minutes * 60):
+            thread = self.bot.get_channel(int(session.thread_id))
+            if thread is None:
+                self.index.set_archived(session.thread_id, True)
+                continue
+
+            try:
+                await thread.edit(archived=True)
+            except Exception as e:
+                logger.warning(
+                    "discord_ai.thread.archive_failed", thread=session.name, error=str(e)
+                )
+                continue
+
+            self.index.set_archived(session.thread_id, True)
+            archived += 1
+            logger.info(
+                "discord_ai.thread.auto_archived",
+                thread=session.name,
+                session_id=session.session_id,
+                idle_minutes=minutes,
+            )
+
+        return archived
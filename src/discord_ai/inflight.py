@@ -0,0 +1,95 @@
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import structlog
+
+logger = structlog.get_logger()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS turns (
+    message_id TEXT PRIMARY KEY,
+    channel_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    content TEXT NOT NULL,
+    model TEXT,
+    started REAL NOT NULL,
+    pid INTEGER,
+    last_uuid TEXT
+)
+"""
+
+
+@dataclass
+class InflightTurn:
+    message_id: str
+    channel_id: str
+    session_id: str
+    content: str
+    model: str | None
+    started: float
+    pid: int | None = None
+    last_uuid: str | None = None
+
+
+class InflightStore:
+    """SQLite record of turns that have started but not finished
+
+    A row is written when a turn starts and updated with the UUID of each
+    event forwarded to Discord. It is deleted when the turn ends. Rows left
+    over at startup belong to turns cut off by a crash or a kill. WAL mode
+    without fsync on every commit keeps the per-event update to a few
+    microseconds.
+    """
+
+    def __init__(self, path: str | Path, clock=time.time):
+        self.path = Path(path)
+        self.clock = clock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(SCHEMA)
+
+    def begin(
+        self,
+        message_id: str,
+        channel_id: str,
+        session_id: str,
+        content: str,
+        model: str | None = None,
+    ):
+        self._db.execute(
+            "INSERT OR REPLACE INTO turns (message_id, channel_id, session_id, content, model,"
+            " started) VALUES (?, ?, ?, ?, ?, ?)",
+            (message_id, channel_id, session_id, content, model, self.clock()),
+        )
+
+    def set_pid(self, session_id: str, pid: int):
+        """Attach a Claude subprocess to the session's turn that has none yet"""
+
+        self._db.execute(
+            "UPDATE turns SET pid = ? WHERE session_id = ? AND pid IS NULL", (pid, session_id)
+        )
+
+    def progress(self, message_id: str, last_uuid: str):
+        self._db.execute(
+            "UPDATE turns SET last_uuid = ? WHERE message_id = ?", (last_uuid, message_id)
+        )
+
+    def finish(self, message_id: str):
+        self._db.execute("DELETE FROM turns WHERE message_id = ?", (message_id,))
+
+    def pending(self) -> list[InflightTurn]:
+        rows = self._db.execute(
+            "SELECT message_id, channel_id, session_id, content, model, started, pid, last_uuid"
+            " FROM turns ORDER BY started"
+        ).fetchall()
+        return [InflightTurn(*row) for row in rows]
+
+    def message_ids(self) -> set[str]:
+        return {row[0] for row in self._db.execute("SELECT message_id FROM turns")}
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,393 @@
+"""
+Append-only journal of Claude stream-json events.
+
+Events are buffered in memory and written by a background task in batches.
+Each batch becomes one gzip member appended to the current segment
+(``segment-000001.jsonl.gz``), so a segment is a valid gzip stream at every
+batch boundary. Segments rotate by size and ``index.json`` records, per
+finished segment, the time range and the sessions it contains. Only the
+newest ``max_segments`` segments are kept.
+
+    discord-ai-journal --dir ./data/journal sessions
+    discord-ai-journal --dir ./data/journal query --session <id> --since 2025-01-01T00:00
+    discord-ai-journal --dir ./data/journal replay --session <id> --speed 0
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import sys
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from datetime import datetime
+from pathlib import Path
+
+import structlog
+
+from discord_ai.metrics import metrics
+
+logger = structlog.get_logger()
+
+INDEX_FILE = "index.json"
+SEGMENT_GLOB = "segment-*.jsonl.gz"
+
+
+def segment_name(sequence: int) -> str:
+    return f"segment-{sequence:06d}.jsonl.gz"
+
+
+def load_index(directory: Path) -> dict:
+    path = directory / INDEX_FILE
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+class EventJournal:
+    """Batched, compressed, append-only writer
+
+    ``append`` never blocks or does I/O; it drops the event (and counts
+    ``journal.dropped``) once ``max_pending`` events are waiting. Compression
+    and writes run in a worker thread. A new segment is started on every
+    startup so a batch cut short by a crash never sits in front of new data.
+
+    The index is rewritten when a segment is finished (on rotation and on
+    close), not per batch; readers scan the live segment, which has no entry
+    yet. ``max_segments`` of 0 keeps every segment.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        batch_size: int = 500,
+        flush_seconds: float = 1.0,
+        max_pending: int = 50000,
+        max_segments: int = 0,
+        clock=time.time,
+    ):
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self.max_segments = max_segments
+        self.clock = clock
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index = load_index(self.directory)
+        existing = [int(p.name[8:14]) for p in self.directory.glob(SEGMENT_GLOB)]
+        self._sequence = max(existing, default=0) + 1
+        self._segment_bytes = 0
+        self._prune()
+
+        self._buffer: list[dict] = []
+        self._pending = asyncio.Event()
+        self._full = asyncio.Event()
+        self._closing = False
+        self._task: asyncio.Task | None = None
+
+    @property
+    def segment_path(self) -> Path:
+        return self.directory / segment_name(self._sequence)
+
+    def append(self, session_id: str, line: str | None = None, prompt: str | None = None):
+        """Queue a raw stream-json ``line`` (or the user's ``prompt``) for a session"""
+
+        if len(self._buffer) >= self.max_pending:
+            metrics.increment("journal.dropped")
+            return
+
+        record = {"ts": self.clock(), "session_id": session_id}
+        if prompt is not None:
+            record["prompt"] = prompt
+        else:
+            record["line"] = line
+        self._buffer.append(record)
+
+        self._pending.set()
+        if len(self._buffer) >= self.batch_size:
+            self._full.set()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Write everything still buffered and stop the writer"""
+
+        self._closing = True
+        self._pending.set()
+        self._full.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        elif self._buffer:
+            await asyncio.to_thread(self._write_batch, self._take())
+        if self.segment_path.name in self.index:
+            await asyncio.to_thread(self._write_index)
+
+    async def _run(self):
+        while True:
+            await self._pending.wait()
+            if not self._closing:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.flush_seconds)
+                except TimeoutError:
+                    pass
+
+            batch = self._take()
+            if batch:
+                try:
+                    await asyncio.to_thread(self._write_batch, batch)
+                except Exception as e:
+                    # A bad batch is lost, but the writer has to outlive it
+                    metrics.increment("journal.write_errors")
+                    logger.error("discord_ai.journal.write_failed", error=str(e), events=len(batch))
+
+            if self._closing and not self._buffer:
+                return
+
+    def _take(self) -> list[dict]:
+        batch, self._buffer = self._buffer, []
+        self._pending.clear()
+        self._full.clear()
+        return batch
+
+    def _write_batch(self, batch: list[dict]):
+        data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in batch)
+        blob = gzip.compress(data.encode(), compresslevel=6)
+
+        if self._segment_bytes and self._segment_bytes + len(blob) > self.segment_max_bytes:
+            self._write_index()
+            self._sequence += 1
+            self._segment_bytes = 0
+            self._prune()
+
+        with self.segment_path.open("ab") as f:
+            f.write(blob)
+        self._segment_bytes += len(blob)
+
+        entry = self.index.setdefault(
+            self.segment_path.name,
+            {"first_ts": batch[0]["ts"], "last_ts": batch[0]["ts"], "events": 0, "sessions": {}},
+        )
+        entry["last_ts"] = batch[-1]["ts"]
+        entry["events"] += len(batch)
+        for record in batch:
+            span = entry["sessions"].setdefault(record["session_id"], [record["ts"], record["ts"]])
+            span[1] = record["ts"]
+
+        metrics.increment("journal.events_written", len(batch))
+        metrics.increment("journal.bytes_written", len(blob))
+
+    def _write_index(self):
+        tmp_path = self.directory / f"{INDEX_FILE}.tmp"
+        tmp_path.write_text(json.dumps(self.index))
+        tmp_path.replace(self.directory / INDEX_FILE)
+
+    def _prune(self):
+        """Delete the oldest finished segments beyond ``max_segments``"""
+
+        if not self.max_segments:
+            return
+        finished = sorted(
+            p for p in self.directory.glob(SEGMENT_GLOB) if p.name != self.segment_path.name
+        )
+        # The segment being started counts towards the limit
+        expired = finished[: max(0, len(finished) - self.max_segments + 1)]
+        if not expired:
+            return
+        for path in expired:
+            path.unlink(missing_ok=True)
+            self.index.pop(path.name, None)
+        self._write_index()
+        metrics.increment("journal.segments_pruned", len(expired))
+        logger.info("discord_ai.journal.pruned", segments=[p.name for p in expired])
+
+
+class JournalingClaudeClient:
+    """Wraps a ClaudeClient and journals each prompt and every line it yields"""
+
+    def __init__(self, inner, journal: EventJournal):
+        self.inner = inner
+        self.journal = journal
+
+    async def run_session(
+        self,
+        session_id: str,
+        message: str,
+        model: str | None = None,
+        extra_args: Sequence[str] = (),
+    ) -> AsyncIterator[str]:
+        self.journal.append(session_id, prompt=message)
+        async for line in self.inner.run_session(
+            session_id, message, model=model, extra_args=extra_args
+        ):
+            self.journal.append(session_id, line=line)
+            yield line
+
+
+class JournalReader:
+    """Index-assisted queries over a journal directory"""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.index = load_index(self.directory)
+
+    def sessions(self) -> dict[str, list[float]]:
+        """Session ID -> [first_ts, last_ts] across all segments"""
+
+        spans: dict[str, list[float]] = {}
+        for entry in self.index.values():
+            for session_id, (first, last) in entry["sessions"].items():
+                span = spans.setdefault(session_id, [first, last])
+                span[0], span[1] = min(span[0], first), max(span[1], last)
+        for path in sorted(self.directory.glob(SEGMENT_GLOB)):
+            if path.name in self.index:
+                continue
+            for record in read_segment(path):
+                span = spans.setdefault(record["session_id"], [record["ts"], record["ts"]])
+                span[0], span[1] = min(span[0], record["ts"]), max(span[1], record["ts"])
+        return spans
+
+    def segments(
+        self, session_id: str | None = None, since: float | None = None, until: float | None = None
+    ) -> list[Path]:
+        """Segments that may hold matching events; unindexed segments are always included"""
+
+        selected = []
+        for path in sorted(self.directory.glob(SEGMENT_GLOB)):
+            entry = self.index.get(path.name)
+            if entry is not None:
+                if session_id is not None:
+                    span = entry["sessions"].get(session_id)
+                    if span is None:
+                        continue
+                    first, last = span
+                else:
+                    first, last = entry["first_ts"], entry["last_ts"]
+                if since is not None and last < since:
+                    continue
+                if until is not None and first > until:
+                    continue
+            selected.append(path)
+        return selected
+
+    def query(
+        self, session_id: str | None = None, since: float | None = None, until: float | None = None
+    ) -> Iterator[dict]:
+        for path in self.segments(session_id, since, until):
+            for record in read_segment(path):
+                if session_id is not None and record["session_id"] != session_id:
+                    continue
+                if since is not None and record["ts"] < since:
+                    continue
+                if until is not None and record["ts"] > until:
+                    continue
+                yield record
+
+
+def read_segment(path: Path) -> Iterator[dict]:
+    """Records in a segment, stopping quietly at a batch truncated by a crash"""
+
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for raw in f:
+                yield json.loads(raw)
+    except (EOFError, gzip.BadGzipFile, json.JSONDecodeError) as e:
+        logger.warning("discord_ai.journal.truncated_segment", path=str(path), error=str(e))
+
+
+def parse_time(value: str) -> float:
+    """Unix seconds or an ISO 8601 timestamp"""
+
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def split_turns(records: list[dict], max_delay: float) -> list[tuple[str, list]]:
+    """Group a session's records into (prompt, transcript) turns for replay"""
+
+    from discord_ai.claude.transcripts import TranscriptLine
+
+    turns: list[tuple[str, list]] = []
+    last_ts = None
+    for record in records:
+        if "prompt" in record or not turns:
+            turns.append((record.get("prompt", ""), []))
+            last_ts = record["ts"]
+        if "line" in record:
+            delay = min(max_delay, max(0.0, record["ts"] - last_ts))
+            turns[-1][1].append(TranscriptLine(delay=round(delay, 6), line=record["line"]))
+            last_ts = record["ts"]
+    return turns
+
+
+async def replay(records: list[dict], speed: float, max_delay: float, out=sys.stdout):
+    """Feed journaled turns back through the parser and formatter, printing the messages"""
+
+    from discord_ai.claude.client import ReplayClaudeClient
+    from discord_ai.claude.formatter import EventFormatter
+    from discord_ai.claude.parser import StreamParser
+
+    formatter = EventFormatter()
+    for prompt, transcript in split_turns(records, max_delay):
+        out.write(f"> {prompt}\n")
+        if not transcript:
+            continue
+        parser = StreamParser(ReplayClaudeClient([transcript], speed=speed))
+        async for event in parser.parse_stream("replay", prompt):
+            for message in formatter.format_event(event):
+                out.write(message + "\n")
+        out.flush()
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Query or replay the Claude event journal")
+    parser.add_argument("--dir", required=True, type=Path, help="journal directory (JOURNAL_DIR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("sessions", help="list journaled sessions with their time range")
+
+    for name, help_text in (
+        ("query", "print matching records as JSON lines"),
+        ("replay", "re-render a session's turns as Discord messages"),
+    ):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument("--session", required=name == "replay")
+        sub.add_argument("--since", type=parse_time, help="unix seconds or ISO 8601")
+        sub.add_argument("--until", type=parse_time, help="unix seconds or ISO 8601")
+
+    commands.choices["replay"].add_argument(
+        "--speed", type=float, default=0.0, help="timing scale; 0 replays without delays"
+    )
+    commands.choices["replay"].add_argument(
+        "--max-delay", type=float, default=2.0, help="cap on any single recorded gap (seconds)"
+    )
+
+    args = parser.parse_args(argv)
+    reader = JournalReader(args.dir)
+
+    if args.command == "sessions":
+        for session_id, (first, last) in sorted(reader.sessions().items(), key=lambda s: s[1][0]):
+            first_at = datetime.fromtimestamp(first).isoformat(timespec="seconds")
+            last_at = datetime.fromtimestamp(last).isoformat(timespec="seconds")
+            print(f"{session_id}  {first_at}  {last_at}")
+        return
+
+    records = reader.query(args.session, args.since, args.until)
+
+    if args.command == "query":
+        for record in records:
+            print(json.dumps(record))
+        return
+
+    asyncio.run(replay(list(records), args.speed, args.max_delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import asyncio
+import fcntl
+import os
+import time
+from pathlib import Path
+
+import structlog
+
+logger = structlog.get_logger()
+
+LEASE_POLL_SECONDS = 1.0
+DRAIN_MARK = "draining_since"
+
+
+def parse_drain_mark(content: str) -> float | None:
+    """When the holder that wrote ``content`` stopped routing, if it got that far"""
+
+    for line in content.splitlines():
+        key, _, value = line.partition(" ")
+        if key == DRAIN_MARK:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+class RoutingLease:
+    """Exclusive ``flock`` on a file, held by the one instance routing messages
+
+    A new instance started next to a running one waits here, connected but
+    idle, until the old instance has drained and released the lock. The
+    kernel drops the lock when a process dies, so a crashed holder never
+    blocks its successor. The holder's PID is written into the file for
+    operators.
+
+    A holder that starts draining records the time in the file with
+    ``mark_draining``. The next holder finds it in ``predecessor_drained_at``
+    and only replays messages that arrived after it; None means the
+    predecessor never drained (it crashed, or there was none).
+    """
+
+    def __init__(self, path: str | Path, clock=time.time):
+        self.path = Path(path).expanduser()
+        self.clock = clock
+        self.predecessor_drained_at: float | None = None
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def try_acquire(self) -> bool:
+        if self._file is not None:
+            return True
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file = open(self.path, "a+")
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            file.close()
+            return False
+
+        file.seek(0)
+        self.predecessor_drained_at = parse_drain_mark(file.read())
+        self._file = file
+        self._write()
+        return True
+
+    async def acquire(self, poll_seconds: float = LEASE_POLL_SECONDS):
+        if self.try_acquire():
+            logger.info("discord_ai.lease.acquired", path=str(self.path))
+            return
+
+        logger.info("discord_ai.lease.standby", path=str(self.path))
+        while not self.try_acquire():
+            await asyncio.sleep(poll_seconds)
+        logger.info("discord_ai.lease.acquired", path=str(self.path), after_standby=True)
+
+    def mark_draining(self):
+        """Record that this holder has stopped routing new messages"""
+
+        if self._file is None:
+            return
+        drained_at = self.clock()
+        self._write(f"{DRAIN_MARK} {drained_at}\n")
+        logger.info("discord_ai.lease.draining", path=str(self.path), drained_at=drained_at)
+
+    def _write(self, extra: str = ""):
+        self._file.truncate(0)
+        self._file.write(f"{os.getpid()}\n{extra}")
+        self._file.flush()
+
+    def release(self):
+        if self._file is None:
+            return
+        fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+        logger.info("discord_ai.lease.released", path=str(self.path))
@@ -36,12 +36,19 @@ def setup_logging(settings):
     handler.setFormatter(formatter)
 
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, settings.log_level.upper()))
     root_logger.addHandler(handler)
 
     discord_logger = logging.getLogger("discord")
-    discord_logger.setLevel(getattr(logging, settings.log_level.upper()))
     discord_logger.addHandler(handler)
     discord_logger.propagate = False
 
+    apply_log_level(settings)
+
+
+def apply_log_level(settings):
+    """Set log levels from settings; safe to call again after a reload"""
+
+    level = getattr(logging, settings.log_level.upper())
+    logging.getLogger().setLevel(level)
+    logging.getLogger("discord").setLevel(level)
     logging.getLogger("discord.http").setLevel(logging.WARNING)
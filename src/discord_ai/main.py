@@ -1,15 +1,35 @@
+import asyncio
+import inspect
+import os
+import signal
 import sys
 
 import structlog
 
+from discord_ai import IMPORT_STARTED
+from discord_ai.admission import AdmissionController, HostPressure
+from discord_ai.attachments import AttachmentStore
 from discord_ai.bot import create_bot
 from discord_ai.claude.client import RealClaudeClient
+from discord_ai.claude.routing import ModelRouter
+from discord_ai.dedup import MessageDeduplicator
 from discord_ai.discord_client import RealDiscordClient
+from discord_ai.drain import GracefulDrain
 from discord_ai.handlers.channels import on_channel_create as channel_create_handler
 from discord_ai.handlers.messages import MessageHandler
 from discord_ai.handlers.ready import on_ready as ready_handler
+from discord_ai.handlers.router import MessageRouter
+from discord_ai.handlers.threads import ThreadArchiver, sync_threads
+from discord_ai.handlers.threads import on_thread_create as thread_create_handler
+from discord_ai.handlers.threads import on_thread_delete as thread_delete_handler
+from discord_ai.handlers.threads import on_thread_update as thread_update_handler
 from discord_ai.logging_config import setup_logging
+from discord_ai.reload import SettingsReloader
+from discord_ai.sessions import SessionIndex
 from discord_ai.settings import Settings
+from discord_ai.stats import StatsCollector, process_rss_bytes
+from discord_ai.utils.http import close_session
+from discord_ai.utils.startup import StartupTimer, install_event_loop_policy
 
 logger = structlog.get_logger()
 
@@ -17,6 +37,9 @@ logger = structlog.get_logger()
 def main():
     """Entry point for Discord AI bot"""
 
+    startup = StartupTimer(started=IMPORT_STARTED)
+    startup.mark("import")
+
     try:
         settings = Settings()
     except Exception as e:
@@ -26,58 +49,257 @@ def main():
 
     setup_logging(settings)
     logger.info("discord_ai.starting", version="0.1.0")
+    install_event_loop_policy(settings)
+    startup.mark("settings")
+
+    model_router = ModelRouter(settings, pins_path=settings.claude_model_pins_path or None)
+    reloader = SettingsReloader(settings)
+    stats = StatsCollector()
+
+    memory = None
+    if settings.memory_monitor_enabled:
+        from discord_ai.utils.memory import MemoryMonitor
+
+        memory = MemoryMonitor(
+            interval=settings.memory_snapshot_interval_seconds,
+            top_n=settings.memory_top_n,
+            frames=settings.memory_trace_frames,
+            rss=lambda: process_rss_bytes(os.getpid()),
+        )
+
+    bot = create_bot(
+        settings, model_router=model_router, reloader=reloader, stats=stats, memory=memory
+    )
+
+    inflight = None
+    if settings.inflight_db_path:
+        from discord_ai.inflight import InflightStore
+
+        inflight = InflightStore(settings.inflight_db_path)
+
+    workspaces = None
+    if settings.workspaces_dir:
+        from discord_ai.workspaces import WorkspaceManager
+
+        workspaces = WorkspaceManager(settings)
+
+    real_claude_client = RealClaudeClient(
+        settings, on_spawn=inflight.set_pid if inflight else None, workspaces=workspaces
+    )
+    claude_client = real_claude_client
+    webhooks = None
+    if settings.webhook_output_enabled:
+        from discord_ai.utils.http import get_session
+        from discord_ai.webhooks import WebhookSender
+
+        webhooks = WebhookSender(bot, name=settings.webhook_name, session_factory=get_session)
+    discord_client = RealDiscordClient(bot, webhooks=webhooks)
 
-    bot = create_bot(settings)
+    journal = None
+    if settings.journal_dir:
+        from discord_ai.journal import EventJournal, JournalingClaudeClient
 
-    claude_client = RealClaudeClient(settings)
-    discord_client = RealDiscordClient(bot)
+        journal = EventJournal(
+            settings.journal_dir,
+            segment_max_bytes=settings.journal_segment_max_bytes,
+            batch_size=settings.journal_batch_size,
+            flush_seconds=settings.journal_flush_seconds,
+            max_pending=settings.journal_max_pending,
+            max_segments=settings.journal_max_segments,
+        )
+        claude_client = JournalingClaudeClient(real_claude_client, journal)
+
+    message_handler = MessageHandler(
+        claude_client, discord_client, settings, inflight=inflight, memory=memory
+    )
+    stats.message_handler = message_handler
+    stats.claude_client = real_claude_client
+    stats.discord_client = discord_client
+
+    deduplicator = MessageDeduplicator(
+        ttl_seconds=settings.dedup_ttl_seconds,
+        max_entries=settings.dedup_max_entries,
+        persist_path=settings.dedup_persist_path or None,
+    )
+    admission = AdmissionController(
+        settings, HostPressure(process_count=lambda: len(real_claude_client.processes))
+    )
+    attachments = AttachmentStore(
+        base_dir=settings.attachments_dir or None,
+        max_bytes=settings.attachment_max_bytes,
+        max_count=settings.attachment_max_count,
+        retention_seconds=settings.attachment_retention_hours * 3600,
+        cache_max_bytes=settings.attachment_cache_max_mb * 1024 * 1024,
+    )
+    sessions = SessionIndex(settings.session_index_path or None)
+    thread_archiver = ThreadArchiver(bot, settings, sessions)
+
+    lease = None
+    if settings.routing_lease_path:
+        from discord_ai.lease import RoutingLease
+
+        lease = RoutingLease(settings.routing_lease_path)
+
+    router = MessageRouter(
+        bot,
+        message_handler,
+        settings,
+        deduplicator=deduplicator,
+        admission=admission,
+        attachments=attachments,
+        sessions=sessions,
+        model_router=model_router,
+        webhooks=webhooks,
+        workspaces=workspaces,
+        standby=lease is not None,
+    )
+    drain = GracefulDrain(settings, router, message_handler, discord_client, inflight=inflight)
 
-    message_handler = MessageHandler(claude_client, discord_client, settings)  # noqa: F841
+    loop_monitor = None
+    if settings.loop_monitor_enabled:
+        from discord_ai.utils.loop_monitor import LoopLagMonitor
+
+        loop_monitor = LoopLagMonitor(
+            interval=settings.loop_lag_interval_seconds,
+            slow_callback_seconds=settings.loop_slow_callback_seconds,
+            dump_threshold_seconds=settings.loop_stall_dump_seconds,
+            dump_dir=settings.loop_stall_dump_dir or None,
+        )
+
+    startup.mark("setup")
 
     @bot.event
-    async def on_ready():
+    async def setup_hook():
+        startup.mark("login")
+        if hasattr(signal, "SIGHUP"):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, reloader.reload)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, request_shutdown)
+        if loop_monitor:
+            loop_monitor.start()
+        if memory:
+            memory.start()
+        if journal:
+            journal.start()
+        if workspaces:
+            workspaces.start()
+        attachments.start()
+        deduplicator.start()
+        if settings.thread_session_channels:
+            thread_archiver.start()
+
+    resume_task = None
+    takeover_task = None
+    shutdown_task = None
+
+    async def activate():
+        nonlocal resume_task
+        if webhooks:
+            await webhooks.preload()
         await ready_handler(bot, settings)
+        if settings.thread_session_channels:
+            await sync_threads(bot, settings, sessions)
+        # on_ready fires again after reconnects; leftover turns are handled once
+        if inflight and resume_task is None:
+            from discord_ai.handlers.resume import resume_inflight
 
-    @bot.event
-    async def on_guild_channel_create(channel):
-        await channel_create_handler(channel, settings)
+            resume_task = asyncio.create_task(resume_inflight(inflight, message_handler, settings))
+
+    async def take_over():
+        """Stand by until the previous instance releases the lease, then start routing"""
+
+        await lease.acquire()
+        # Taken before resuming starts clearing them: these turns are resumed, not replayed
+        resumable = inflight.message_ids() if inflight else set()
+        await activate()
+        startup.mark("channel_init")
+        startup.report()
+        await router.take_over(since=lease.predecessor_drained_at, skip=resumable)
+
+    async def shutdown():
+        """Drain, then close everything; a step that fails does not stop the rest"""
+
+        steps = []
+        if lease:
+            # Before the drain starts, with no await in between, so the successor's
+            # cut-off matches the moment routing stops
+            steps.append(("lease_mark", lease.mark_draining))
+        steps.append(("drain", drain.run))
+        for task in (takeover_task, resume_task):
+            if task:
+                steps.append(("cancel", task.cancel))
+        if journal:
+            steps.append(("journal", journal.close))
+        if workspaces:
+            steps.append(("workspaces", workspaces.stop))
+        steps += [("threads", thread_archiver.stop), ("attachments", attachments.stop)]
+        if memory:
+            steps.append(("memory", memory.stop))
+        if loop_monitor:
+            steps.append(("loop_monitor", loop_monitor.stop))
+        steps += [("http", close_session), ("dedup", deduplicator.close)]
+        if inflight:
+            steps.append(("inflight", inflight.close))
+        if lease:
+            steps.append(("lease", lease.release))
+        steps.append(("bot", bot.close))
+
+        for name, step in steps:
+            try:
+                result = step()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error("discord_ai.shutdown.step_failed", step=name, error=str(e))
+
+    def request_shutdown():
+        nonlocal shutdown_task
+        if shutdown_task is None:
+            logger.info("discord_ai.shutdown.requested")
+            shutdown_task = asyncio.create_task(shutdown())
+        else:
+            # A second SIGTERM skips whatever is left of the drain
+            logger.warning("discord_ai.shutdown.forced")
+            asyncio.create_task(bot.close())
 
     @bot.event
-    async def on_message(message):
-        if message.author == bot.user:
+    async def on_ready():
+        nonlocal takeover_task
+        startup.mark("ready")
+        if router.standby:
+            if takeover_task is None:
+                takeover_task = asyncio.create_task(take_over())
             return
+        await activate()
+        startup.mark("channel_init")
+        startup.report()
 
-        if not message.channel.category:
+    @bot.event
+    async def on_guild_channel_create(channel):
+        if router.standby:
             return
+        await channel_create_handler(channel, settings)
 
-        if message.channel.category.name != settings.category_name:
+    @bot.event
+    async def on_thread_create(thread):
+        if router.standby:
             return
+        await thread_create_handler(thread, settings, sessions)
 
-        topic = message.channel.topic or ""
-
-        if not topic.startswith("Session: "):
-            logger.warning("discord_ai.message.no_session_id", channel=message.channel.name)
-            await message.channel.send("||Error: No session ID found in channel topic||")
+    @bot.event
+    async def on_thread_update(before, after):
+        if router.standby:
             return
+        await thread_update_handler(before, after, settings, sessions)
 
-        session_id = topic.replace("Session: ", "").strip()
-
-        logger.info(
-            "discord_ai.message.received",
-            channel=message.channel.name,
-            session_id=session_id,
-            user=str(message.author),
-        )
+    @bot.event
+    async def on_thread_delete(thread):
+        if router.standby:
+            return
+        await thread_delete_handler(thread, settings, sessions)
 
-        try:
-            await message_handler.handle_message(
-                channel_id=str(message.channel.id),
-                session_id=session_id,
-                content=message.content,
-            )
-        except Exception as e:
-            logger.error("discord_ai.message.error", error=str(e), channel=message.channel.name)
-            await message.channel.send(f"||Error: {str(e)}||")
+    @bot.event
+    async def on_message(message):
+        await router.on_message(message)
 
     logger.info("discord_ai.bot.starting")
     try:
@@ -0,0 +1,74 @@
+import math
+from collections import deque
+
+# Latency windows read by ``!stats``; named here so readers need not import the writers
+TURN_LATENCY_METRIC = "turn.latency_seconds"
+LAG_METRIC = "loop.lag_seconds"
+
+
+class LatencyWindow:
+    """Bounded window of recent samples supporting percentile queries"""
+
+    def __init__(self, maxlen: int = 1024):
+        self._samples: deque[float] = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, value: float):
+        self._samples.append(value)
+
+    def percentile(self, pct: float) -> float | None:
+        """Nearest-rank percentile of the current window, None when empty"""
+
+        if not self._samples:
+            return None
+
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+class Metrics:
+    """In-memory counters, gauges and latency windows"""
+
+    def __init__(self, window_size: int = 1024):
+        self.window_size = window_size
+        self.counters: dict[str, int] = {}
+        self.gauges: dict[str, float] = {}
+        self.windows: dict[str, LatencyWindow] = {}
+
+    def increment(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        self.gauges[name] = value
+
+    def observe(self, name: str, value: float):
+        window = self.windows.get(name)
+        if window is None:
+            window = self.windows[name] = LatencyWindow(self.window_size)
+        window.observe(value)
+
+    def percentiles(
+        self, name: str, pcts: tuple[float, ...] = (50, 95, 99)
+    ) -> dict[str, float | None]:
+        window = self.windows.get(name)
+        return {f"p{pct:g}": window.percentile(pct) if window else None for pct in pcts}
+
+    def snapshot(self) -> dict:
+        """Plain-dict view of every metric, suitable for logging"""
+
+        return {
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "percentiles": {name: self.percentiles(name) for name in self.windows},
+        }
+
+    def reset(self):
+        self.counters.clear()
+        self.gauges.clear()
+        self.windows.clear()
+
+
+metrics = Metrics()
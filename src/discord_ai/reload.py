@@ -0,0 +1,137 @@
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+from pydantic import ValidationError
+
+from discord_ai.logging_config import apply_log_level
+from discord_ai.metrics import metrics
+from discord_ai.settings import Settings
+
+logger = structlog.get_logger()
+
+# Consumed once at startup (constructor arguments, tasks started or not,
+# files opened); a new value is reported but only takes effect on restart
+RESTART_REQUIRED_FIELDS = frozenset(
+    {
+        "discord_token",
+        "use_uvloop",
+        "loop_monitor_enabled",
+        "loop_lag_interval_seconds",
+        "loop_slow_callback_seconds",
+        "loop_stall_dump_seconds",
+        "loop_stall_dump_dir",
+        "dedup_ttl_seconds",
+        "dedup_max_entries",
+        "dedup_persist_path",
+        "attachments_dir",
+        "attachment_max_bytes",
+        "attachment_max_count",
+        "attachment_retention_hours",
+        "attachment_cache_max_mb",
+        "thread_session_channels",
+        "session_index_path",
+        "claude_model_pins_path",
+        "journal_dir",
+        "journal_segment_max_bytes",
+        "journal_batch_size",
+        "journal_flush_seconds",
+        "journal_max_pending",
+        "journal_max_segments",
+        "webhook_output_enabled",
+        "webhook_name",
+        "inflight_db_path",
+        "workspaces_dir",
+        "routing_lease_path",
+        "memory_monitor_enabled",
+        "memory_snapshot_interval_seconds",
+        "memory_top_n",
+        "memory_trace_frames",
+    }
+)
+
+SECRET_FIELDS = frozenset({"discord_token"})
+
+
+@dataclass
+class ReloadResult:
+    applied: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+    restart_required: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+    error: str = ""
+
+    def summary(self) -> str:
+        if self.error:
+            return f"||Error: settings not reloaded: {self.error}||"
+        if not self.applied and not self.restart_required:
+            return "Settings reloaded: no changes"
+
+        lines = ["Settings reloaded"]
+        lines += [f"- {name}: {old!r} -> {new!r}" for name, (old, new) in self.applied.items()]
+        if self.restart_required:
+            lines.append("Needs a restart: " + ", ".join(sorted(self.restart_required)))
+        return "\n".join(lines)
+
+
+def diff_settings(old: Settings, new: Settings) -> dict[str, tuple[Any, Any]]:
+    changes = {}
+    for name in type(old).model_fields:
+        before, after = getattr(old, name), getattr(new, name)
+        if before != after:
+            if name in SECRET_FIELDS:
+                before, after = "***", "***"
+            changes[name] = (before, after)
+    return changes
+
+
+def validate_settings(settings: Settings):
+    """Checks Settings' own validation cannot express"""
+
+    if not isinstance(getattr(logging, settings.log_level.upper(), None), int):
+        raise ValueError(f"unknown log_level {settings.log_level!r}")
+
+
+class SettingsReloader:
+    """Re-reads the environment and ``.env`` and applies safe changes in place
+
+    Every component shares the one ``Settings`` instance and reads limits from
+    it when it needs them, so updating its attributes is enough. The new
+    values are assigned without yielding to the event loop, so a coroutine
+    sees either all of the old settings or all of the new ones. Turns
+    already running keep the values they started with.
+    """
+
+    def __init__(self, settings: Settings, load: Callable[[], Settings] = Settings):
+        self.settings = settings
+        self.load = load
+
+    def reload(self) -> ReloadResult:
+        try:
+            new = self.load()
+            validate_settings(new)
+        except (ValidationError, ValueError) as e:
+            metrics.increment("settings.reload_failures")
+            logger.error("discord_ai.settings.reload_failed", error=str(e))
+            return ReloadResult(error=str(e).splitlines()[0])
+
+        result = ReloadResult()
+        for name, change in diff_settings(self.settings, new).items():
+            if name in RESTART_REQUIRED_FIELDS:
+                result.restart_required[name] = change
+            else:
+                result.applied[name] = change
+
+        for name in result.applied:
+            setattr(self.settings, name, getattr(new, name))
+
+        if "log_level" in result.applied:
+            apply_log_level(self.settings)
+
+        metrics.increment("settings.reloads")
+        logger.info(
+            "discord_ai.settings.reloaded",
+            applied={name: list(change) for name, change in result.applied.items()},
+            restart_required=sorted(result.restart_required),
+        )
+        return result
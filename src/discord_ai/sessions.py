@@ -0,0 +1,100 @@
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from uuid import uuid4
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class ThreadSession:
+    thread_id: str
+    parent_id: str
+    name: str
+    session_id: str
+    archived: bool = False
+    last_active: float = 0.0
+
+
+class SessionIndex:
+    """Maps Discord threads to Claude sessions
+
+    Threads carry no topic, so the session ID lives here instead. With a path
+    the index is persisted as JSON; structural changes (create, archive,
+    delete) are written immediately, activity timestamps ride along with the
+    next write.
+    """
+
+    def __init__(self, path: str | Path | None = None, clock=time.time):
+        self.path = Path(path) if path else None
+        self.clock = clock
+        self._sessions: dict[str, ThreadSession] = {}
+
+        if self.path and self.path.exists():
+            data = json.loads(self.path.read_text())
+            self._sessions = {key: ThreadSession(**value) for key, value in data.items()}
+            logger.info("discord_ai.sessions.loaded", path=str(self.path), threads=len(self))
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, thread_id: str) -> ThreadSession | None:
+        return self._sessions.get(thread_id)
+
+    def ensure(self, thread_id: str, parent_id: str, name: str) -> ThreadSession:
+        """Return the thread's session, creating one on first sight"""
+
+        session = self._sessions.get(thread_id)
+        if session is None:
+            session = ThreadSession(
+                thread_id=thread_id,
+                parent_id=parent_id,
+                name=name,
+                session_id=str(uuid4()),
+                last_active=self.clock(),
+            )
+            self._sessions[thread_id] = session
+            logger.info(
+                "discord_ai.sessions.created",
+                thread=name,
+                thread_id=thread_id,
+                session_id=session.session_id,
+            )
+            self.save()
+        return session
+
+    def touch(self, thread_id: str):
+        session = self._sessions.get(thread_id)
+        if session:
+            session.last_active = self.clock()
+
+    def set_archived(self, thread_id: str, archived: bool):
+        session = self._sessions.get(thread_id)
+        if session and session.archived != archived:
+            session.archived = archived
+            if not archived:
+                session.last_active = self.clock()
+            self.save()
+
+    def remove(self, thread_id: str):
+        if self._sessions.pop(thread_id, None):
+            self.save()
+
+    def idle(self, max_idle_seconds: float) -> list[ThreadSession]:
+        """Unarchived sessions with no activity for longer than ``max_idle_seconds``"""
+
+        cutoff = self.clock() - max_idle_seconds
+        return [s for s in self._sessions.values() if not s.archived and s.last_active < cutoff]
+
+    def save(self):
+        if not self.path:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        data = {key: asdict(value) for key, value in self._sessions.items()}
+        tmp_path.write_text(json.dumps(data, indent=2))
+        tmp_path.replace(self.path)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -15,3 +17,79 @@ class Settings(BaseSettings):
     typing_interval_seconds: int = 5
     claude_timeout_seconds: int = 600
     log_level: str = "INFO"
+
+    loop_monitor_enabled: bool = False
+    loop_lag_interval_seconds: float = 0.25
+    loop_slow_callback_seconds: float = 0.1
+    loop_stall_dump_seconds: float = 1.0
+    loop_stall_dump_dir: str = ""
+
+    profile_max_seconds: int = 120
+    profile_output_dir: str = ""
+
+    claude_record_dir: str = ""
+
+    use_uvloop: bool = False
+
+    dedup_ttl_seconds: int = 3600
+    dedup_max_entries: int = 10000
+    dedup_persist_path: str = ""
+
+    user_quota_burst: int = 3
+    user_quota_per_minute: float = 0
+    channel_quota_burst: int = 5
+    channel_quota_per_minute: float = 0
+    max_claude_processes: int = 0
+    max_load_average: float = 0
+    min_free_memory_mb: int = 0
+    admission_defer_seconds: float = 30
+
+    attachments_dir: str = ""
+    attachment_max_bytes: int = 25 * 1024 * 1024
+    attachment_max_count: int = 10
+    attachment_retention_hours: float = 24
+    attachment_cache_max_mb: int = 1024
+
+    thread_session_channels: list[str] = []
+    thread_idle_archive_minutes: int = 60
+    session_index_path: str = ""
+
+    claude_model_default: str = ""
+    claude_model_prefixes: dict[str, str] = {"!fast": "haiku"}
+    claude_short_message_model: str = ""
+    claude_short_message_max_chars: int = 80
+    claude_channel_models: dict[str, str] = {}
+    claude_model_args: dict[str, list[str]] = {}
+    claude_model_pins_path: str = ""
+
+    journal_dir: str = ""
+    journal_segment_max_bytes: int = 64 * 1024 * 1024
+    journal_batch_size: int = 500
+    journal_flush_seconds: float = 1.0
+    journal_max_pending: int = 50000
+    journal_max_segments: int = 0
+
+    tool_output_mode: Literal["messages", "status"] = "messages"
+    tool_status_debounce_seconds: float = 1.5
+
+    webhook_output_enabled: bool = False
+    webhook_name: str = "Claude"
+
+    inflight_db_path: str = ""
+    claude_projects_dir: str = "~/.claude/projects"
+    resume_wait_seconds: float = 300
+
+    workspaces_dir: str = ""
+    workspace_quota_mb: int = 1024
+    workspace_idle_minutes: int = 24 * 60
+    workspace_max_count: int = 200
+    workspace_hard_limit_mb: int = 2048
+
+    routing_lease_path: str = ""
+    drain_timeout_seconds: float = 60.0
+    drain_flush_seconds: float = 10.0
+
+    memory_monitor_enabled: bool = False
+    memory_snapshot_interval_seconds: float = 300.0
+    memory_top_n: int = 10
+    memory_trace_frames: int = 1
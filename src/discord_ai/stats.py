@@ -0,0 +1,102 @@
+import math
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from discord_ai.metrics import LAG_METRIC, TURN_LATENCY_METRIC, metrics
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+MAX_LIST_LINES = 15
+
+
+def process_rss_bytes(pid: int) -> int | None:
+    """Resident set size from /proc, None when unavailable (process gone, not Linux)"""
+
+    try:
+        return int(Path(f"/proc/{pid}/statm").read_text().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def capped(lines: list[str]) -> list[str]:
+    """Keep a section short enough that the report fits in one Discord message"""
+
+    if len(lines) <= MAX_LIST_LINES:
+        return lines
+    return lines[:MAX_LIST_LINES] + [f"- … {len(lines) - MAX_LIST_LINES} more"]
+
+
+def format_seconds(value: float | None) -> str:
+    if value is None:
+        return "n/a"
+    return f"{value * 1000:.1f}ms" if value < 1 else f"{value:.2f}s"
+
+
+@dataclass
+class StatsCollector:
+    """Gathers runtime state for ``!stats`` from in-memory structures only
+
+    Components are attached after they are built, so any of them may be
+    missing; the report just leaves that section out.
+    """
+
+    message_handler: object = None
+    claude_client: object = None
+    discord_client: object = None
+
+    def snapshot(self, gateway_latency: float | None = None) -> dict:
+        now = time.monotonic()
+        processes = getattr(self.claude_client, "processes", {})
+
+        return {
+            "active_turns": dict(getattr(self.message_handler, "active_turns", {})),
+            "processes": [
+                {"pid": pid, "age_seconds": now - started, "rss_bytes": process_rss_bytes(pid)}
+                for pid, started in list(processes.items())
+            ],
+            "pending_sends": dict(getattr(self.discord_client, "pending", {})),
+            "turn_latency": metrics.percentiles(TURN_LATENCY_METRIC, (50, 95)),
+            "loop_lag": metrics.percentiles(LAG_METRIC, (50, 95)),
+            "gateway_latency": gateway_latency,
+        }
+
+    def format(self, gateway_latency: float | None = None) -> str:
+        stats = self.snapshot(gateway_latency)
+        lines = ["**Bot stats**"]
+
+        turns = stats["active_turns"]
+        lines.append(f"Active turns: {sum(turns.values())}")
+        lines += capped([f"- <#{channel_id}>: {count}" for channel_id, count in turns.items()])
+
+        lines.append(f"Claude processes: {len(stats['processes'])}")
+        process_lines = []
+        for proc in sorted(stats["processes"], key=lambda p: -p["age_seconds"]):
+            rss = proc["rss_bytes"]
+            rss_text = f"{rss / (1024 * 1024):.1f} MiB" if rss is not None else "rss n/a"
+            process_lines.append(f"- pid {proc['pid']}: {proc['age_seconds']:.1f}s, {rss_text}")
+        lines += capped(process_lines)
+
+        pending = stats["pending_sends"]
+        lines.append(f"Outbound sends pending: {sum(pending.values())}")
+        lines += capped([f"- <#{channel_id}>: {count}" for channel_id, count in pending.items()])
+
+        turn = stats["turn_latency"]
+        lines.append(
+            f"Turn latency: p50 {format_seconds(turn['p50'])}, p95 {format_seconds(turn['p95'])}"
+        )
+
+        lag = stats["loop_lag"]
+        if lag["p50"] is None:
+            lines.append("Loop lag: n/a (LOOP_MONITOR_ENABLED is off)")
+        else:
+            lines.append(
+                f"Loop lag: p50 {format_seconds(lag['p50'])}, p95 {format_seconds(lag['p95'])}"
+            )
+
+        latency = stats["gateway_latency"]
+        if latency is None or not math.isfinite(latency):
+            latency = None
+        lines.append(f"Gateway latency: {format_seconds(latency)}")
+
+        return "\n".join(lines)
@@ -0,0 +1,23 @@
+import aiohttp
+
+POOL_SIZE = 32
+KEEPALIVE_SECONDS = 60
+
+_session: aiohttp.ClientSession | None = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Shared keep-alive HTTP session for outbound requests made outside discord.py"""
+
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(limit=POOL_SIZE, keepalive_timeout=KEEPALIVE_SECONDS)
+        _session = aiohttp.ClientSession(connector=connector)
+    return _session
+
+
+async def close_session():
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
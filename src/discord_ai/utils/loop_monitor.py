@@ -0,0 +1,163 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from datetime import UTC, datetime
+from pathlib import Path
+
+import structlog
+
+from discord_ai.metrics import LAG_METRIC, Metrics, metrics
+
+logger = structlog.get_logger()
+
+REPORT_INTERVAL_SECONDS = 60.0
+STACK_LIMIT = 40
+
+
+class LoopLagMonitor:
+    """Measures event-loop lag and reports stalls with the blocking stack
+
+    A heartbeat task sleeps for ``interval`` and records how late it woke up.
+    A watchdog thread watches that heartbeat; when it stops beating the loop
+    is stuck inside a callback, so the watchdog samples the loop thread's
+    stack while the stall is still happening. ``slow_callback_seconds`` is
+    the watchdog's own threshold; asyncio's debug-mode reporting stays off.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.25,
+        slow_callback_seconds: float = 0.1,
+        dump_threshold_seconds: float = 1.0,
+        dump_dir: str | Path | None = None,
+        registry: Metrics | None = None,
+    ):
+        self.interval = interval
+        self.slow_callback_seconds = slow_callback_seconds
+        self.dump_threshold_seconds = dump_threshold_seconds
+        self.dump_dir = Path(dump_dir) if dump_dir else None
+        self.registry = registry or metrics
+
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._stall_beat: float | None = None
+        self._stall_level = 0
+        self._stop = threading.Event()
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        """Start the heartbeat task and watchdog thread on the running loop"""
+
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+
+        self._task = loop.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._thread.start()
+
+        logger.info(
+            "discord_ai.loop.monitor_started",
+            interval=self.interval,
+            slow_callback_seconds=self.slow_callback_seconds,
+            dump_threshold_seconds=self.dump_threshold_seconds,
+        )
+
+    async def stop(self):
+        self._stop.set()
+
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        if self._thread:
+            await asyncio.to_thread(self._thread.join, self.interval * 2)
+
+    def percentiles(self) -> dict[str, float | None]:
+        return self.registry.percentiles(LAG_METRIC)
+
+    def sample_stack(self) -> str:
+        """Formatted stack of the event-loop thread at this instant"""
+
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return ""
+        return "".join(traceback.format_stack(frame, limit=STACK_LIMIT))
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        last_report = loop.time()
+
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            now = loop.time()
+
+            lag = max(0.0, now - started - self.interval)
+            self._last_beat = time.monotonic()
+            self.registry.observe(LAG_METRIC, lag)
+            self.registry.set_gauge(LAG_METRIC, lag)
+
+            if now - last_report >= REPORT_INTERVAL_SECONDS:
+                last_report = now
+                logger.info("discord_ai.loop.lag_percentiles", **self.percentiles())
+
+    def _watch(self):
+        check_every = min(self.interval, self.slow_callback_seconds) / 2
+
+        while not self._stop.wait(check_every):
+            self._check_stall(time.monotonic())
+
+    def _check_stall(self, now: float):
+        beat = self._last_beat
+        stalled = now - beat - self.interval
+
+        if beat != self._stall_beat:
+            self._stall_beat = beat
+            self._stall_level = 0
+
+        if self._stall_level == 0 and stalled >= self.slow_callback_seconds:
+            self._stall_level = 1
+            self.registry.increment("loop.slow_callbacks")
+            logger.warning(
+                "discord_ai.loop.slow_callback",
+                stalled_seconds=round(stalled, 4),
+                stack=self.sample_stack(),
+            )
+
+        if self._stall_level == 1 and stalled >= self.dump_threshold_seconds:
+            self._stall_level = 2
+            self._dump(stalled)
+
+    def _dump(self, stalled: float):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        sections = []
+        for thread_id, frame in sys._current_frames().items():
+            marker = " (event loop)" if thread_id == self._loop_thread_id else ""
+            header = f"--- {names.get(thread_id, thread_id)}{marker} ---\n"
+            sections.append(header + "".join(traceback.format_stack(frame, limit=STACK_LIMIT)))
+        dump = f"Event loop stalled for {stalled:.3f}s\n\n" + "\n".join(sections)
+
+        self.registry.increment("loop.stall_dumps")
+
+        if not self.dump_dir:
+            logger.error("discord_ai.loop.stall", stalled_seconds=round(stalled, 4), dump=dump)
+            return
+
+        try:
+            self.dump_dir.mkdir(parents=True, exist_ok=True)
+            stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%f")
+            path = self.dump_dir / f"loop-stall-{stamp}.txt"
+            path.write_text(dump)
+            logger.error(
+                "discord_ai.loop.stall", stalled_seconds=round(stalled, 4), dump_path=str(path)
+            )
+        except OSError as e:
+            logger.error("discord_ai.loop.stall_dump_failed", error=str(e), dump=dump)
@@ -0,0 +1,217 @@
+import asyncio
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import structlog
+
+from discord_ai.metrics import Metrics, metrics
+
+logger = structlog.get_logger()
+
+GROWER_GAUGE_PREFIX = "memory.grower."
+# Entries per section in the ``!memory`` dump, so it fits in one Discord message
+DUMP_ENTRIES = 5
+# Sessions and channels kept in the growth tallies after each sample
+MAX_ATTRIBUTED = 100
+# Allocations made by tracemalloc itself or the import machinery are noise
+IGNORED_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<unknown>")
+
+
+@dataclass
+class Grower:
+    site: str
+    size: int
+    size_diff: int
+    count_diff: int
+
+
+def format_bytes(value: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def site_label(traceback: tracemalloc.Traceback) -> str:
+    frame = traceback[0]
+    return f"{Path(frame.filename).name}:{frame.lineno}"
+
+
+def top_growers(
+    current: tracemalloc.Snapshot, previous: tracemalloc.Snapshot, limit: int
+) -> list[Grower]:
+    """Allocation sites whose live size grew the most between two snapshots"""
+
+    stats = current.compare_to(previous, "lineno")
+    return [
+        Grower(site_label(s.traceback), s.size, s.size_diff, s.count_diff)
+        for s in stats[:limit]
+        if s.size_diff > 0
+    ]
+
+
+class MemoryMonitor:
+    """Periodic tracemalloc snapshots, diffed by allocation site
+
+    Each sample is compared with the previous one (what grew lately) and with
+    the first one (what grew since startup). The top growers since startup
+    are published as ``memory.grower.<file>:<line>`` gauges and logged.
+
+    Sessions and channels are charged with the change in traced memory over
+    each of their turns. Concurrent turns share the same counter, so the
+    figures are approximate, but memory a session keeps growing by shows up
+    as a steady climb against it. Only the ``MAX_ATTRIBUTED`` biggest of
+    each are kept past a sample. ``rss`` reports the process's resident
+    size, when the caller can measure it.
+    """
+
+    def __init__(
+        self,
+        interval: float = 300.0,
+        top_n: int = 10,
+        frames: int = 1,
+        registry: Metrics | None = None,
+        rss: Callable[[], int | None] | None = None,
+    ):
+        self.interval = interval
+        self.top_n = top_n
+        self.frames = frames
+        self.registry = registry or metrics
+        self.rss = rss or (lambda: None)
+        self.by_session: Counter[str] = Counter()
+        self.by_channel: Counter[str] = Counter()
+        self.recent: list[Grower] = []
+        self.since_start: list[Grower] = []
+
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._previous: tracemalloc.Snapshot | None = None
+        self._started_tracing = False
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._baseline = self._previous = self._take_snapshot()
+        self._task = asyncio.create_task(self._run())
+        logger.info("discord_ai.memory.monitor_started", interval=self.interval, frames=self.frames)
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sample()
+            except Exception as e:
+                logger.error("discord_ai.memory.sample_failed", error=str(e))
+
+    async def sample(self):
+        """Take a snapshot, diff it and publish the results"""
+
+        if not tracemalloc.is_tracing() or self._baseline is None:
+            return
+
+        snapshot, self.recent, self.since_start = await asyncio.to_thread(
+            self._diff, self._previous, self._baseline
+        )
+        self._previous = snapshot
+        self.by_session = Counter(dict(self.by_session.most_common(MAX_ATTRIBUTED)))
+        self.by_channel = Counter(dict(self.by_channel.most_common(MAX_ATTRIBUTED)))
+        self._publish()
+
+        logger.info(
+            "discord_ai.memory.sampled",
+            traced_bytes=tracemalloc.get_traced_memory()[0],
+            growers=[f"{g.site} +{format_bytes(g.size_diff)}" for g in self.recent],
+        )
+
+    def turn_started(self) -> int:
+        return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+    def turn_finished(self, channel_id: str, session_id: str, started: int):
+        if not tracemalloc.is_tracing():
+            return
+        delta = tracemalloc.get_traced_memory()[0] - started
+        self.by_session[session_id] += delta
+        self.by_channel[channel_id] += delta
+
+    def format(self, limit: int | None = None) -> str:
+        """Plain-text dump for the ``!memory`` admin command, cut to ``limit`` characters"""
+
+        if not tracemalloc.is_tracing():
+            return "Memory monitor is not running"
+
+        current, peak = tracemalloc.get_traced_memory()
+        rss = self.rss()
+        lines = [
+            f"Traced: {format_bytes(current)} (peak {format_bytes(peak)})",
+            f"RSS: {format_bytes(rss) if rss is not None else 'n/a'}",
+            "Top growers since last sample:",
+            *self._section([self._grower_line(g) for g in self.recent]),
+            "Top growers since start:",
+            *self._section([self._grower_line(g) for g in self.since_start]),
+            "Net growth by session (approx.):",
+            *self._section(
+                [f"- {sid}: {format_bytes(n)}" for sid, n in self.by_session.most_common()]
+            ),
+            "Net growth by channel (approx.):",
+            *self._section(
+                [f"- <#{cid}>: {format_bytes(n)}" for cid, n in self.by_channel.most_common()]
+            ),
+        ]
+        return "\n".join(lines)[:limit]
+
+    def _section(self, lines: list[str]) -> list[str]:
+        return lines[:DUMP_ENTRIES] or ["- none"]
+
+    def _grower_line(self, grower: Grower) -> str:
+        return (
+            f"- `{grower.site}` +{format_bytes(grower.size_diff)} "
+            f"({grower.count_diff:+d} blocks, {format_bytes(grower.size)} live)"
+        )
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in IGNORED_FILES]
+        )
+
+    def _diff(
+        self, previous: tracemalloc.Snapshot, baseline: tracemalloc.Snapshot
+    ) -> tuple[tracemalloc.Snapshot, list[Grower], list[Grower]]:
+        """Snapshot and both comparisons, all off the event loop"""
+
+        snapshot = self._take_snapshot()
+        return (
+            snapshot,
+            top_growers(snapshot, previous, self.top_n),
+            top_growers(snapshot, baseline, self.top_n),
+        )
+
+    def _publish(self):
+        current, peak = tracemalloc.get_traced_memory()
+        self.registry.set_gauge("memory.traced_bytes", current)
+        self.registry.set_gauge("memory.traced_peak_bytes", peak)
+        rss = self.rss()
+        if rss is not None:
+            self.registry.set_gauge("memory.rss_bytes", rss)
+
+        # Sites that dropped out of the top list would otherwise keep a stale gauge
+        for name in [n for n in self.registry.gauges if n.startswith(GROWER_GAUGE_PREFIX)]:
+            del self.registry.gauges[name]
+        for grower in self.since_start:
+            self.registry.set_gauge(GROWER_GAUGE_PREFIX + grower.site, grower.size_diff)
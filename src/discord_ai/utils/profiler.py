@@ -0,0 +1,83 @@
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling one thread's stack from a background thread
+
+    Only the target thread is touched, and only by reading its current frame,
+    so the overhead on the event loop is limited to GIL hand-offs.
+    """
+
+    def __init__(self, thread_id: int | None = None, interval: float = 0.005):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.sample_count = 0
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            time.sleep(self.interval)
+
+    def sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        stack.reverse()
+
+        self.stacks[tuple(stack)] += 1
+        self.sample_count += 1
+
+    def collapsed(self) -> str:
+        """Stacks in collapsed format (``root;...;leaf count``) for flamegraph tools"""
+
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def top_functions(self, limit: int = 20) -> list[tuple[str, int, int]]:
+        """Hottest functions as (label, self samples, inclusive samples)"""
+
+        own: Counter[str] = Counter()
+        inclusive: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                inclusive[label] += count
+
+        ranked = sorted(inclusive, key=lambda label: (own[label], inclusive[label]), reverse=True)
+        return [(label, own[label], inclusive[label]) for label in ranked[:limit]]
+
+    def format_top(self, limit: int = 20) -> str:
+        total = self.sample_count or 1
+        lines = [f"{'self%':>6} {'total%':>6}  function", "-" * 60]
+        for label, own, inclusive in self.top_functions(limit):
+            lines.append(f"{own / total:6.1%} {inclusive / total:6.1%}  {label}")
+        lines.append(f"\n{self.sample_count} samples every {self.interval * 1000:g}ms")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+import structlog
+
+from discord_ai.metrics import metrics
+
+logger = structlog.get_logger()
+
+
+class StartupTimer:
+    """Records how long each startup phase took and logs them once at boot"""
+
+    def __init__(self, started: float | None = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.phases: dict[str, float] = {}
+        self.reported = False
+        self._last = self.started
+
+    def mark(self, phase: str):
+        """Close the phase that has been running since the previous mark"""
+
+        if self.reported:
+            return
+
+        now = time.perf_counter()
+        self.phases[phase] = now - self._last
+        self._last = now
+
+    def report(self):
+        if self.reported:
+            return
+        self.reported = True
+
+        total = self._last - self.started
+        for phase, seconds in self.phases.items():
+            metrics.set_gauge(f"startup.{phase}_seconds", seconds)
+        metrics.set_gauge("startup.total_seconds", total)
+
+        logger.info(
+            "discord_ai.startup.complete",
+            total_seconds=round(total, 3),
+            **{f"{phase}_seconds": round(seconds, 3) for phase, seconds in self.phases.items()},
+        )
+
+
+def install_event_loop_policy(settings):
+    """Switch to uvloop when enabled and installed"""
+
+    if not settings.use_uvloop:
+        return
+
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("discord_ai.startup.uvloop_missing", hint="install the 'speed' extra")
+        return
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("discord_ai.startup.uvloop_enabled", version=uvloop.__version__)
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from collections.abc import Callable
+
+import aiohttp
+import discord
+import structlog
+
+from discord_ai.metrics import metrics
+
+logger = structlog.get_logger()
+
+# Marker for channels where webhooks cannot be used (missing Manage Webhooks,
+# DMs, ...), so we stop asking Discord every message
+UNAVAILABLE = object()
+# How long a channel that refused webhooks is left alone before asking again,
+# so granting the permission later takes effect without a restart
+UNAVAILABLE_RETRY_SECONDS = 600.0
+
+
+class WebhookSender:
+    """Sends channel output through a per-channel webhook
+
+    Webhooks have rate limits separate from the bot's own routes. One webhook
+    per channel is found or created on first use and cached. It is rebound to
+    the shared keep-alive session from ``utils.http``. Threads post through
+    their parent channel's webhook. ``send`` returns None whenever the
+    webhook path is not available, and the caller falls back to
+    ``channel.send``. A channel that refuses webhooks is asked again after
+    ``retry_seconds``.
+    """
+
+    def __init__(
+        self,
+        bot,
+        name: str = "Claude",
+        session_factory: Callable[[], aiohttp.ClientSession] | None = None,
+        retry_seconds: float = UNAVAILABLE_RETRY_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.bot = bot
+        self.name = name
+        self.session_factory = session_factory
+        self.retry_seconds = retry_seconds
+        self.clock = clock
+        self._webhooks: dict[int, object] = {}
+        self._retry_at: dict[int, float] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        self.webhook_ids: set[int] = set()
+
+    def owns(self, message) -> bool:
+        """True for messages we posted ourselves; their author is not ``bot.user``"""
+
+        return getattr(message, "webhook_id", None) in self.webhook_ids
+
+    async def preload(self):
+        """Learn our existing webhooks' IDs before the first send, e.g. on ready
+
+        Otherwise posts made through them by a previous instance (during its
+        drain, say) would look like user messages until we send one ourselves.
+        """
+
+        for guild in self.bot.guilds:
+            try:
+                webhooks = await guild.webhooks()
+            except discord.HTTPException as e:
+                logger.warning("discord_ai.webhook.preload_failed", guild=guild.name, error=str(e))
+                continue
+            for webhook in webhooks:
+                if webhook.name == self.name and webhook.user == self.bot.user:
+                    self.webhook_ids.add(webhook.id)
+        logger.info("discord_ai.webhook.preloaded", webhooks=len(self.webhook_ids))
+
+    async def send(self, channel, content: str):
+        parent = getattr(channel, "parent", None)
+        target = parent if parent is not None else channel
+
+        webhook = await self._webhook_for(target)
+        if webhook is None:
+            return None
+
+        kwargs = {}
+        if parent is not None:
+            kwargs["thread"] = channel
+        user = self.bot.user
+        if user is not None:
+            kwargs["username"] = user.display_name
+            kwargs["avatar_url"] = user.display_avatar.url
+
+        try:
+            message = await webhook.send(content, wait=True, **kwargs)
+        except discord.NotFound:
+            # Deleted behind our back; recreate on the next message
+            self._webhooks.pop(target.id, None)
+            metrics.increment("webhooks.fallbacks")
+            return None
+        except discord.HTTPException as e:
+            metrics.increment("webhooks.fallbacks")
+            logger.warning("discord_ai.webhook.send_failed", channel_id=target.id, error=str(e))
+            return None
+
+        metrics.increment("webhooks.sent")
+        return message
+
+    async def _webhook_for(self, channel):
+        retry_at = self._retry_at.get(channel.id)
+        if retry_at is not None and self.clock() >= retry_at:
+            del self._retry_at[channel.id]
+            self._webhooks.pop(channel.id, None)
+
+        cached = self._webhooks.get(channel.id)
+        if cached is not None:
+            return None if cached is UNAVAILABLE else cached
+
+        lock = self._locks.setdefault(channel.id, asyncio.Lock())
+        async with lock:
+            if channel.id not in self._webhooks:
+                self._webhooks[channel.id] = await self._find_or_create(channel)
+
+        cached = self._webhooks[channel.id]
+        return None if cached is UNAVAILABLE else cached
+
+    async def _find_or_create(self, channel):
+        if not hasattr(channel, "create_webhook"):
+            return UNAVAILABLE
+
+        try:
+            webhook = None
+            for existing in await channel.webhooks():
+                if existing.name == self.name and existing.user == self.bot.user:
+                    webhook = existing
+                    break
+            if webhook is None:
+                webhook = await channel.create_webhook(name=self.name)
+                logger.info("discord_ai.webhook.created", channel=channel.name)
+        except discord.HTTPException as e:
+            logger.warning("discord_ai.webhook.unavailable", channel=channel.name, error=str(e))
+            self._retry_at[channel.id] = self.clock() + self.retry_seconds
+            return UNAVAILABLE
+
+        self.webhook_ids.add(webhook.id)
+        if self.session_factory is not None:
+            webhook = discord.Webhook.from_url(webhook.url, session=self.session_factory())
+        return webhook
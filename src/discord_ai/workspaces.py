@@ -0,0 +1,269 @@
+import asyncio
+import os
+import shutil
+import time
+from collections import Counter
+from collections.abc import Callable
+from contextlib import asynccontextmanager, suppress
+from pathlib import Path
+
+import structlog
+
+from discord_ai.metrics import metrics
+
+logger = structlog.get_logger()
+
+GC_INTERVAL_SECONDS = 300.0
+WATCH_INTERVAL_SECONDS = 5.0
+ATTACHMENTS_SUBDIR = "attachments"
+MB = 1024 * 1024
+
+
+class WorkspaceLimitExceeded(Exception):
+    pass
+
+
+def directory_usage(path: Path) -> int:
+    """Bytes allocated under ``path`` (block usage, so sparse files count correctly)"""
+
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_blocks * 512
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
+
+
+class WorkspaceManager:
+    """One working directory per Claude session, with quotas and LRU cleanup
+
+    ``workspaces_dir`` should ideally be a tmpfs mount. Usage is cached and
+    rescanned in the background after each turn, so turns never wait on a
+    walk of the tree. The quota is soft: a session over it still gets its
+    turn (which is how it can clean up after itself), and
+    ``quota_warning`` gives the router a message to post first. While a turn
+    runs, its workspace is measured every few seconds; once it grows past
+    ``workspace_hard_limit_mb`` the turn's ``on_exceeded`` callback stops the
+    CLI and ``use`` raises ``WorkspaceLimitExceeded``.
+
+    A background task removes workspaces idle for longer than
+    ``workspace_idle_minutes``. It then evicts the least recently used ones
+    beyond ``workspace_max_count``. A workspace held by ``hold`` or ``use``
+    is never removed. Limits are read from settings on every check.
+    """
+
+    def __init__(self, settings, clock=time.time):
+        self.settings = settings
+        self.clock = clock
+        self.base_dir = Path(settings.workspaces_dir).expanduser()
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.usage: dict[str, int] = {}
+        self.last_used: dict[str, float] = {}
+        self._active: Counter[str] = Counter()
+        self._task: asyncio.Task | None = None
+        self._stale: set[str] = set()
+        self._rescans: dict[str, asyncio.Task] = {}
+
+        for path in self.base_dir.iterdir():
+            if path.is_dir():
+                self.last_used[path.name] = path.stat().st_mtime
+
+    def path_for(self, session_id: str) -> Path:
+        path = self.base_dir / session_id
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def attachments_dir(self, session_id: str) -> Path:
+        return self.path_for(session_id) / ATTACHMENTS_SUBDIR
+
+    @asynccontextmanager
+    async def hold(self, session_id: str):
+        """Keep a session's workspace from being collected, e.g. while attachments download"""
+
+        path = self.path_for(session_id)
+        self._active[session_id] += 1
+        self.last_used[session_id] = self.clock()
+        try:
+            yield path
+        finally:
+            self._active[session_id] -= 1
+            if not self._active[session_id]:
+                del self._active[session_id]
+            self.last_used[session_id] = self.clock()
+
+    @asynccontextmanager
+    async def use(self, session_id: str, on_exceeded: Callable[[], None] | None = None):
+        """Working directory for one turn; its usage is rescanned in the background after"""
+
+        exceeded = asyncio.Event()
+        watcher = None
+        if on_exceeded is not None:
+            watcher = asyncio.create_task(self._watch(session_id, on_exceeded, exceeded))
+        try:
+            async with self.hold(session_id) as path:
+                yield path
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+                with suppress(asyncio.CancelledError):
+                    await watcher
+            self._rescan(session_id)
+        if exceeded.is_set():
+            raise WorkspaceLimitExceeded(
+                f"Workspace passed its {self.settings.workspace_hard_limit_mb} MB hard limit, "
+                "so the turn was stopped; ask Claude to delete files it no longer needs"
+            )
+
+    async def _watch(self, session_id: str, on_exceeded: Callable[[], None], exceeded):
+        """Stop a turn whose workspace grows past the hard limit
+
+        Only growth counts, so a turn in a workspace already over the limit
+        can still delete files.
+        """
+
+        start = self.usage.get(session_id)
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL_SECONDS)
+            limit = self.settings.workspace_hard_limit_mb * MB
+            try:
+                used = await self.measure(session_id)
+            except Exception as e:
+                logger.error(
+                    "discord_ai.workspace.measure_failed", session_id=session_id, error=str(e)
+                )
+                continue
+            if start is None:
+                start = used
+            if not limit or used <= max(limit, start):
+                start = min(start, used)
+                continue
+            exceeded.set()
+            metrics.increment("workspaces.hard_limit_stops")
+            logger.warning(
+                "discord_ai.workspace.hard_limit_exceeded", session_id=session_id, used_bytes=used
+            )
+            on_exceeded()
+            return
+
+    async def quota_warning(self, session_id: str) -> str | None:
+        """A message for the channel when the session is at or over its quota"""
+
+        quota_mb = self.settings.workspace_quota_mb
+        if not quota_mb:
+            return None
+        used = self.usage.get(session_id)
+        if used is None:
+            used = await self.measure(session_id)
+        if used < quota_mb * MB:
+            return None
+        metrics.increment("workspaces.over_quota_turns")
+        return (
+            f"Workspace is over its {quota_mb} MB quota ({used / MB:.0f} MB used); "
+            "ask Claude to delete files it no longer needs"
+        )
+
+    async def measure(self, session_id: str) -> int:
+        used = await asyncio.to_thread(directory_usage, self.base_dir / session_id)
+        # Collected while the walk ran
+        if session_id in self.last_used:
+            self.usage[session_id] = used
+        self._publish()
+        return used
+
+    def _rescan(self, session_id: str):
+        """Re-measure a session in the background; turns ending mid-walk get one more pass"""
+
+        self._stale.add(session_id)
+        if session_id not in self._rescans:
+            self._rescans[session_id] = asyncio.create_task(self._run_rescan(session_id))
+
+    async def _run_rescan(self, session_id: str):
+        try:
+            while session_id in self._stale:
+                self._stale.discard(session_id)
+                used = await self.measure(session_id)
+            quota = self.settings.workspace_quota_mb * MB
+            if quota and used >= quota:
+                logger.warning(
+                    "discord_ai.workspace.over_quota", session_id=session_id, used_bytes=used
+                )
+        except Exception as e:
+            logger.error("discord_ai.workspace.measure_failed", session_id=session_id, error=str(e))
+        finally:
+            self._rescans.pop(session_id, None)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        for task in [self._task, *self._rescans.values()]:
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(GC_INTERVAL_SECONDS)
+            try:
+                await self.collect()
+            except Exception as e:
+                logger.error("discord_ai.workspace.gc_failed", error=str(e))
+
+    async def collect(self) -> list[str]:
+        """Remove idle and least recently used workspaces; returns removed session IDs"""
+
+        idle_seconds = self.settings.workspace_idle_minutes * 60
+        max_count = self.settings.workspace_max_count
+        now = self.clock()
+
+        candidates = sorted(
+            (used_at, session_id)
+            for session_id, used_at in self.last_used.items()
+            if session_id not in self._active
+        )
+        remaining = len(self.last_used)
+        doomed = []
+        for used_at, session_id in candidates:
+            idle = idle_seconds and now - used_at > idle_seconds
+            over = max_count and remaining > max_count
+            if not (idle or over):
+                break
+            doomed.append(session_id)
+            remaining -= 1
+
+        removed = []
+        for session_id in doomed:
+            # An earlier removal yielded to the loop, so a turn may have claimed it since
+            if session_id in self._active:
+                continue
+            await asyncio.to_thread(shutil.rmtree, self.base_dir / session_id, True)
+            if session_id in self._active:
+                continue
+            removed.append(session_id)
+            self.last_used.pop(session_id, None)
+            self.usage.pop(session_id, None)
+            metrics.increment("workspaces.collected")
+            logger.info("discord_ai.workspace.collected", session_id=session_id)
+
+        self._publish()
+        return removed
+
+    def _publish(self):
+        metrics.set_gauge("workspaces.count", len(self.last_used))
+        metrics.set_gauge("workspaces.bytes_total", sum(self.usage.values()))
+        metrics.set_gauge("workspaces.bytes_max", max(self.usage.values(), default=0))
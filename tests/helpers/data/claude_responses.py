@@ -1,5 +1,9 @@
 """Real Claude CLI JSON responses for testing"""
 
+from pathlib import Path
+
+TRANSCRIPTS_DIR = Path(__file__).parent / "transcripts"
+
 SIMPLE_TEXT = [
     '{"type":"assistant","message":{"content":[{"type":"text","text":"Hello"}]},"session_id":"df83d374-79dd-4100-be18-fd7e4bccc33b","uuid":"408d2155-b3f8-4044-a00e-cedd765d3eaa"}',
 ]
@@ -0,0 +1,127 @@
+"""Minimal stand-ins for discord.py objects seen by the message router"""
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from itertools import count
+
+from discord_ai.attachments import Download
+
+_ids = count(1000)
+
+
+@dataclass
+class FakeCategory:
+    name: str
+
+
+@dataclass
+class FakeTextChannel:
+    name: str = "general"
+    topic: str | None = "Session: df83d374-79dd-4100-be18-fd7e4bccc33b"
+    category: FakeCategory | None = field(
+        default_factory=lambda: FakeCategory("Claude Conversations")
+    )
+    id: int = field(default_factory=lambda: next(_ids))
+    sent: list[str] = field(default_factory=list)
+
+    async def send(self, content):
+        self.sent.append(content)
+
+
+@dataclass
+class FakeThread:
+    parent: FakeTextChannel
+    name: str = "thread"
+    archived: bool = False
+    id: int = field(default_factory=lambda: next(_ids))
+    sent: list[str] = field(default_factory=list)
+    edits: list[dict] = field(default_factory=list)
+
+    async def send(self, content):
+        self.sent.append(content)
+
+    async def edit(self, **kwargs):
+        self.edits.append(kwargs)
+        if "archived" in kwargs:
+            self.archived = kwargs["archived"]
+
+
+@dataclass
+class FakeUser:
+    name: str = "user"
+    id: int = field(default_factory=lambda: next(_ids))
+
+    def __str__(self):
+        return self.name
+
+
+@dataclass
+class FakeDiscordMessage:
+    content: str
+    channel: FakeTextChannel | FakeThread = field(default_factory=FakeTextChannel)
+    author: FakeUser = field(default_factory=FakeUser)
+    id: int = field(default_factory=lambda: next(_ids))
+    attachments: list = field(default_factory=list)
+
+
+@dataclass
+class FakeAttachment:
+    filename: str
+    data: bytes
+    etag: str | None = None
+    id: int = field(default_factory=lambda: next(_ids))
+
+    @property
+    def size(self):
+        return len(self.data)
+
+    @property
+    def url(self):
+        return f"https://cdn.example/{self.id}/{self.filename}"
+
+
+class FakeFetcher:
+    """Serves FakeAttachment bodies in small chunks and counts downloads"""
+
+    def __init__(self, attachments, chunk_size=4):
+        self.by_url = {a.url: a for a in attachments}
+        self.chunk_size = chunk_size
+        self.downloads = 0
+
+    def add(self, attachment):
+        self.by_url[attachment.url] = attachment
+
+    @asynccontextmanager
+    async def open(self, url):
+        attachment = self.by_url[url]
+        yield Download(attachment.etag, self._chunks(attachment.data))
+
+    async def _chunks(self, data):
+        self.downloads += 1
+        for start in range(0, len(data), self.chunk_size):
+            yield data[start : start + self.chunk_size]
+
+
+@dataclass
+class FakeContext:
+    valid: bool = False
+
+
+class FakeBot:
+    def __init__(self):
+        self.user = FakeUser(name="bot")
+        self.invoked = []
+
+    async def get_context(self, message):
+        return FakeContext(valid=message.content.startswith("!profile"))
+
+    async def invoke(self, ctx):
+        self.invoked.append(ctx)
+
+
+class RecordingMessageHandler:
+    def __init__(self):
+        self.calls = []
+
+    async def handle_message(self, **kwargs):
+        self.calls.append(kwargs)
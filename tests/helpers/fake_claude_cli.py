@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the Claude CLI, usable as CLAUDE_CLI_PATH.
+
+Accepts the same arguments RealClaudeClient passes and emits stream-json.
+Behaviour is configured through environment variables so it can be driven
+from tests and the load generator without changing the client:
+
+    FAKE_CLAUDE_SCENARIO      text | tools | huge | hang | crash   (default: text)
+    FAKE_CLAUDE_LATENCY       delay before each event:
+                              fixed:<s> | uniform:<lo>:<hi> | exp:<mean> | lognormal:<mu>:<sigma>
+                              (default: fixed:0)
+    FAKE_CLAUDE_TOOLS         tool calls in the "tools" scenario          (default: 5)
+    FAKE_CLAUDE_OUTPUT_BYTES  size of the tool output in "huge"           (default: 1000000)
+    FAKE_CLAUDE_CRASH_AFTER   events emitted before "crash" exits         (default: 2)
+    FAKE_CLAUDE_SEED          random seed for latency sampling
+"""
+
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+
+def parse_latency(spec: str, rng: random.Random):
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(":") if v]
+
+    if kind == "fixed":
+        return lambda: values[0] if values else 0.0
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1])
+    if kind == "exp":
+        return lambda: rng.expovariate(1 / values[0])
+    if kind == "lognormal":
+        return lambda: rng.lognormvariate(values[0], values[1])
+
+    raise SystemExit(f"unknown FAKE_CLAUDE_LATENCY: {spec}")
+
+
+def model_from_args(argv: list[str]) -> str:
+    if "--model" in argv:
+        return argv[argv.index("--model") + 1]
+    return "default"
+
+
+def session_id_from_args(argv: list[str]) -> str:
+    if "--session-id" in argv:
+        return argv[argv.index("--session-id") + 1]
+    return str(uuid.uuid4())
+
+
+class Emitter:
+    def __init__(self, session_id: str, latency):
+        self.session_id = session_id
+        self.latency = latency
+        self.count = 0
+
+    def emit(self, event: dict):
+        time.sleep(max(0.0, self.latency()))
+        event.update(session_id=self.session_id, uuid=str(uuid.uuid4()))
+        sys.stdout.write(json.dumps(event, separators=(",", ":")) + "\n")
+        sys.stdout.flush()
+        self.count += 1
+
+    def system(self, model: str):
+        self.emit({"type": "system", "subtype": "init", "model": model, "cwd": os.getcwd()})
+
+    def text(self, text: str):
+        self.emit({"type": "assistant", "message": {"content": [{"type": "text", "text": text}]}})
+
+    def tool_call(self, tool_id: str, name: str, tool_input: dict, output: str):
+        self.emit(
+            {
+                "type": "assistant",
+                "message": {
+                    "content": [
+                        {"type": "tool_use", "id": tool_id, "name": name, "input": tool_input}
+                    ]
+                },
+            }
+        )
+        self.emit(
+            {
+                "type": "user",
+                "message": {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "content": output,
+                            "is_error": False,
+                            "tool_use_id": tool_id,
+                        }
+                    ],
+                },
+                "tool_use_result": {"stdout": output, "stderr": "", "interrupted": False},
+            }
+        )
+
+    def result(self, text: str):
+        self.emit({"type": "result", "subtype": "success", "is_error": False, "result": text})
+
+
+def main():
+    env = os.environ
+    scenario = env.get("FAKE_CLAUDE_SCENARIO", "text")
+    rng = random.Random(env.get("FAKE_CLAUDE_SEED"))
+    latency = parse_latency(env.get("FAKE_CLAUDE_LATENCY", "fixed:0"), rng)
+    prompt = sys.argv[-1] if len(sys.argv) > 1 else ""
+
+    out = Emitter(session_id_from_args(sys.argv), latency)
+    out.system(model_from_args(sys.argv))
+
+    if scenario == "text":
+        out.text(f"Echo: {prompt}")
+
+    elif scenario == "tools":
+        for i in range(int(env.get("FAKE_CLAUDE_TOOLS", "5"))):
+            out.tool_call(f"toolu_{i:04d}", "Read", {"file_path": f"file_{i}.py"}, f"contents {i}")
+        out.text(f"Read the files for: {prompt}")
+
+    elif scenario == "huge":
+        size = int(env.get("FAKE_CLAUDE_OUTPUT_BYTES", "1000000"))
+        out.tool_call("toolu_huge", "Bash", {"command": "cat big.log"}, "x" * size)
+        out.text("That was a lot of output.")
+
+    elif scenario == "hang":
+        out.text("Thinking...")
+        while True:
+            time.sleep(3600)
+
+    elif scenario == "crash":
+        crash_after = int(env.get("FAKE_CLAUDE_CRASH_AFTER", "2"))
+        while out.count < crash_after:
+            out.text("Partial answer")
+        sys.stderr.write("fatal: simulated crash\n")
+        sys.exit(1)
+
+    else:
+        raise SystemExit(f"unknown FAKE_CLAUDE_SCENARIO: {scenario}")
+
+    out.result("done")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+from pathlib import Path
+
+FAKE_CLI = Path(__file__).parent / "fake_claude_cli.py"
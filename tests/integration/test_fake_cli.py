@@ -0,0 +1,157 @@
+"""
+RealClaudeClient against the fake Claude CLI.
+Covers the failure modes that are hard to trigger with the real binary.
+"""
+
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from discord_ai.claude.client import RealClaudeClient
+from discord_ai.settings import Settings
+from discord_ai.workspaces import WorkspaceLimitExceeded, WorkspaceManager
+from tests.helpers.fake_cli import FAKE_CLI
+
+
+@pytest.fixture
+def fake_cli_settings(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("CLAUDE_CLI_PATH", str(FAKE_CLI))
+    monkeypatch.setenv("CLAUDE_TIMEOUT_SECONDS", "1")
+    monkeypatch.setenv("CLAUDE_RECORD_DIR", "")
+    return Settings()
+
+
+@pytest.mark.asyncio
+async def test_tool_heavy_turn(monkeypatch, fake_cli_settings):
+    monkeypatch.setenv("FAKE_CLAUDE_SCENARIO", "tools")
+    monkeypatch.setenv("FAKE_CLAUDE_TOOLS", "3")
+    client = RealClaudeClient(fake_cli_settings)
+
+    lines = [json.loads(line) async for line in client.run_session("session-1", "hi")]
+
+    assert [line["type"] for line in lines].count("user") == 3
+    assert lines[-1]["type"] == "result"
+    assert client.processes == {}
+
+
+@pytest.mark.asyncio
+async def test_huge_output_line(monkeypatch, fake_cli_settings):
+    monkeypatch.setenv("FAKE_CLAUDE_SCENARIO", "huge")
+    monkeypatch.setenv("FAKE_CLAUDE_OUTPUT_BYTES", "500000")
+    client = RealClaudeClient(fake_cli_settings)
+
+    lines = [line async for line in client.run_session("session-1", "hi")]
+
+    assert max(len(line) for line in lines) > 500000
+
+
+@pytest.mark.asyncio
+async def test_hanging_cli_times_out(monkeypatch, fake_cli_settings):
+    monkeypatch.setenv("FAKE_CLAUDE_SCENARIO", "hang")
+    client = RealClaudeClient(fake_cli_settings)
+    lines = []
+
+    with pytest.raises(TimeoutError):
+        async for line in client.run_session("session-1", "hi"):
+            lines.append(line)
+
+    assert len(lines) == 2
+    assert client.processes == {}
+
+
+@pytest.mark.asyncio
+async def test_crashing_cli_yields_partial_output(monkeypatch, fake_cli_settings):
+    monkeypatch.setenv("FAKE_CLAUDE_SCENARIO", "crash")
+    monkeypatch.setenv("FAKE_CLAUDE_CRASH_AFTER", "3")
+    client = RealClaudeClient(fake_cli_settings)
+
+    lines = [line async for line in client.run_session("session-1", "hi")]
+
+    assert len(lines) == 3
+
+
+@pytest.mark.asyncio
+async def test_model_and_extra_args_reach_cli(monkeypatch, fake_cli_settings):
+    monkeypatch.setenv("FAKE_CLAUDE_SCENARIO", "text")
+    client = RealClaudeClient(fake_cli_settings)
+
+    lines = [
+        json.loads(line)
+        async for line in client.run_session(
+            "session-1", "hi", model="haiku", extra_args=["--max-turns", "1"]
+        )
+    ]
+
+    assert lines[0]["model"] == "haiku"
+    assert lines[1]["message"]["content"][0]["text"] == "Echo: hi"
+
+
+@pytest.mark.asyncio
+async def test_on_spawn_reports_pid(fake_cli_settings):
+    spawned = []
+    client = RealClaudeClient(fake_cli_settings, on_spawn=lambda *args: spawned.append(args))
+
+    [line async for line in client.run_session("session-1", "hi")]
+
+    assert spawned[0][0] == "session-1"
+    assert spawned[0][1] > 0
+
+
+@pytest.mark.asyncio
+async def test_cli_runs_in_session_workspace(tmp_path, fake_cli_settings):
+    fake_cli_settings.workspaces_dir = str(tmp_path)
+    client = RealClaudeClient(fake_cli_settings, workspaces=WorkspaceManager(fake_cli_settings))
+
+    lines = [json.loads(line) async for line in client.run_session("session-1", "hi")]
+
+    assert lines[0]["cwd"] == str(tmp_path / "session-1")
+
+
+@pytest.mark.asyncio
+async def test_cli_is_killed_when_workspace_passes_hard_limit(
+    tmp_path, monkeypatch, fake_cli_settings
+):
+    monkeypatch.setenv("FAKE_CLAUDE_SCENARIO", "hang")
+    monkeypatch.setattr("discord_ai.workspaces.WATCH_INTERVAL_SECONDS", 0.01)
+    fake_cli_settings.workspaces_dir = str(tmp_path)
+    fake_cli_settings.workspace_hard_limit_mb = 1
+    manager = WorkspaceManager(fake_cli_settings)
+    async with manager.use("session-1"):
+        pass
+    await asyncio.sleep(0.05)
+    client = RealClaudeClient(fake_cli_settings, workspaces=manager)
+
+    with pytest.raises(WorkspaceLimitExceeded):
+        async for _line in client.run_session("session-1", "hi"):
+            (tmp_path / "session-1" / "big.bin").write_bytes(b"x" * 2 * 1024 * 1024)
+
+    assert client.processes == {}
+
+
+@pytest.mark.asyncio
+async def test_unwritable_record_dir_does_not_leak_the_process(tmp_path, fake_cli_settings):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    fake_cli_settings.claude_record_dir = str(blocker / "records")
+    client = RealClaudeClient(fake_cli_settings)
+
+    lines = [line async for line in client.run_session("session-1", "hi")]
+
+    assert lines
+    assert client.processes == {}
+
+
+@pytest.mark.asyncio
+async def test_failing_on_spawn_does_not_abort_the_turn(fake_cli_settings):
+    def on_spawn(session_id, pid):
+        raise sqlite3.OperationalError("database is locked")
+
+    client = RealClaudeClient(fake_cli_settings, on_spawn=on_spawn)
+
+    lines = [line async for line in client.run_session("session-1", "hi")]
+
+    assert lines
+    assert client.processes == {}
@@ -0,0 +1,33 @@
+"""
+Scaling regression gate: many channels through MessageHandler with the fake CLI.
+"""
+
+import pytest
+
+from benchmarks.load import LoadConfig, run_load
+
+
+@pytest.mark.asyncio
+async def test_multi_channel_load_completes():
+    config = LoadConfig(channels=5, messages=3, scenario="tools", tools=2, latency="fixed:0.01")
+
+    report = await run_load(config)
+
+    assert report.turns == 15
+    assert report.failed == 0
+    # 2 tool calls + 2 results + final text per turn
+    assert report.messages_sent == 15 * 5
+    assert report.subprocesses_started == 15
+    assert report.peak_subprocesses <= 15
+    assert report.queue_delay.percentile(99) < 0.5
+
+
+@pytest.mark.asyncio
+async def test_hanging_turns_fail_without_blocking_others():
+    config = LoadConfig(channels=3, messages=1, scenario="hang", timeout_seconds=1)
+
+    report = await run_load(config)
+
+    assert report.turns == 3
+    assert report.failed == 3
+    assert report.elapsed_seconds < 5
@@ -1,6 +1,11 @@
+import json
+import time
+
 import pytest
 
-from discord_ai.claude.client import FakeClaudeClient
+from discord_ai.claude.client import FakeClaudeClient, ReplayClaudeClient
+from discord_ai.claude.transcripts import TranscriptLine
+from tests.helpers.data.claude_responses import TRANSCRIPTS_DIR
 
 
 @pytest.mark.asyncio
@@ -23,3 +28,38 @@ async def test_fake_client_can_be_reused():
 
     assert first_run == ["response"]
     assert second_run == ["response"]
+
+
+@pytest.mark.asyncio
+async def test_replay_client_plays_recorded_transcript():
+    client = ReplayClaudeClient([TRANSCRIPTS_DIR / "tool_use.jsonl"], speed=0)
+
+    lines = [line async for line in client.run_session("session-1", "msg")]
+
+    assert len(lines) == 6
+    assert json.loads(lines[0])["type"] == "system"
+    assert json.loads(lines[-1])["type"] == "result"
+
+
+@pytest.mark.asyncio
+async def test_replay_client_cycles_transcripts():
+    first = [TranscriptLine(delay=0, line="a")]
+    second = [TranscriptLine(delay=0, line="b")]
+    client = ReplayClaudeClient([first, second], speed=0)
+
+    runs = [[line async for line in client.run_session("s", "m")] for _ in range(3)]
+
+    assert runs == [["a"], ["b"], ["a"]]
+
+
+@pytest.mark.asyncio
+async def test_replay_client_honours_speed():
+    transcript = [TranscriptLine(delay=0.2, line="a"), TranscriptLine(delay=0.2, line="b")]
+    client = ReplayClaudeClient([transcript], speed=10)
+
+    started = time.perf_counter()
+    lines = [line async for line in client.run_session("s", "m")]
+    elapsed = time.perf_counter() - started
+
+    assert lines == ["a", "b"]
+    assert 0.03 <= elapsed < 0.2
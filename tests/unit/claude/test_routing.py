@@ -0,0 +1,92 @@
+import pytest
+
+from discord_ai.claude.routing import ModelRouter, RouteDecision
+from discord_ai.metrics import metrics
+from discord_ai.settings import Settings
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("CLAUDE_MODEL_DEFAULT", "sonnet")
+    monkeypatch.setenv("CLAUDE_SHORT_MESSAGE_MODEL", "haiku")
+    monkeypatch.setenv("CLAUDE_SHORT_MESSAGE_MAX_CHARS", "20")
+    monkeypatch.setenv("CLAUDE_CHANNEL_MODELS", '{"42": "opus"}')
+    monkeypatch.setenv("CLAUDE_MODEL_ARGS", '{"haiku": ["--max-turns", "3"]}')
+    return Settings()
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_long_message_uses_default_model(settings):
+    router = ModelRouter(settings)
+
+    decision = router.route("1", "please refactor the parser into smaller modules")
+
+    assert decision.model == "sonnet"
+    assert decision.rule == "default"
+    assert decision.extra_args == []
+
+
+def test_short_message_uses_fast_model_with_its_args(settings):
+    router = ModelRouter(settings)
+
+    decision = router.route("1", "thanks!")
+
+    assert decision == RouteDecision(
+        model="haiku", rule="short_message", content="thanks!", extra_args=["--max-turns", "3"]
+    )
+
+
+def test_prefix_is_stripped_and_wins_over_channel(settings):
+    router = ModelRouter(settings)
+
+    decision = router.route("42", "!fast summarise the last commit in detail please")
+
+    assert decision.model == "haiku"
+    assert decision.rule == "prefix:!fast"
+    assert decision.content == "summarise the last commit in detail please"
+
+
+def test_channel_override_and_pin(settings, tmp_path):
+    pins = tmp_path / "pins.json"
+    router = ModelRouter(settings, pins_path=pins)
+
+    assert router.route("42", "ok").model == "opus"
+
+    router.pin("42", "sonnet")
+    assert router.route("42", "ok").model == "sonnet"
+    assert ModelRouter(settings, pins_path=pins).pins == {"42": "sonnet"}
+    assert [p.name for p in tmp_path.iterdir()] == ["pins.json"]
+
+    router.pin("42", None)
+    assert router.route("42", "ok").model == "opus"
+
+
+def test_empty_default_leaves_model_to_cli(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    router = ModelRouter(Settings())
+
+    decision = router.route("1", "hello there")
+
+    assert decision.model is None
+    assert decision.rule == "default"
+
+
+def test_custom_rules_and_metrics(settings):
+    def everything_opus(router, channel_id, content):
+        return RouteDecision(model="opus", rule="custom", content=content)
+
+    router = ModelRouter(settings, rules=[everything_opus])
+
+    router.route("1", "thanks")
+    router.route("2", "thanks")
+
+    counters = metrics.snapshot()["counters"]
+    assert counters["claude.route.custom"] == 2
+    assert counters["claude.model.opus"] == 2
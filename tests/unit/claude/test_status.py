@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+from discord_ai.claude.status import ToolStatus, ToolStatusMessage, format_args
+from discord_ai.discord_client import FakeDiscordClient
+from discord_ai.models import AssistantMessage, UserMessage
+
+SESSION = {
+    "session_id": "df83d374-79dd-4100-be18-fd7e4bccc33b",
+    "uuid": "408d2155-b3f8-4044-a00e-cedd765d3eaa",
+}
+
+
+def tool_use(tool_id: str, name: str = "Read", **tool_input) -> AssistantMessage:
+    block = {"type": "tool_use", "id": tool_id, "name": name, "input": tool_input}
+    return AssistantMessage(type="assistant", message={"content": [block]}, **SESSION)
+
+
+def tool_result(tool_id: str, is_error: bool = False) -> UserMessage:
+    block = {"type": "tool_result", "tool_use_id": tool_id, "is_error": is_error, "content": ""}
+    return UserMessage(type="user", message={"role": "user", "content": [block]}, **SESSION)
+
+
+def text(value: str) -> AssistantMessage:
+    block = {"type": "text", "text": value}
+    return AssistantMessage(type="assistant", message={"content": [block]}, **SESSION)
+
+
+@pytest.mark.asyncio
+async def test_many_tools_render_into_one_debounced_message():
+    discord = FakeDiscordClient()
+    status = ToolStatusMessage(discord, "c1", debounce_seconds=0.05)
+
+    for i in range(30):
+        await status.feed(tool_use(f"t{i}", file_path=f"file_{i}.py"))
+        await status.feed(tool_result(f"t{i}", is_error=i == 3))
+    final_text = await status.finish()
+
+    messages = discord.get_messages("c1")
+    assert len(messages) == 1
+    assert messages[0].content.startswith("**Tools** (29 done, 1 failed)")
+    assert "✗ Read (file_path=file_3.py)" in messages[0].content
+    assert status.edits <= 2
+    assert final_text == []
+
+
+@pytest.mark.asyncio
+async def test_debounced_edit_lands_without_finish():
+    discord = FakeDiscordClient()
+    status = ToolStatusMessage(discord, "c1", debounce_seconds=0.01)
+
+    await status.feed(tool_use("t1"))
+    await status.feed(tool_result("t1"))
+    await asyncio.sleep(0.05)
+
+    assert discord.get_messages("c1")[0].content.splitlines()[-1] == "✓ Read ()"
+
+
+class SlowEditDiscordClient(FakeDiscordClient):
+    """The first edit is slow; records the order edits land in"""
+
+    def __init__(self):
+        super().__init__()
+        self.started = 0
+        self.landed: list[str] = []
+
+    async def edit_message(self, channel_id, message, content):
+        self.started += 1
+        await asyncio.sleep(0.05 if self.started == 1 else 0)
+        await super().edit_message(channel_id, message, content)
+        self.landed.append(content)
+
+
+@pytest.mark.asyncio
+async def test_finish_waits_for_edit_in_flight():
+    discord = SlowEditDiscordClient()
+    status = ToolStatusMessage(discord, "c1", debounce_seconds=0.01)
+
+    await status.feed(tool_use("t1"))
+    await status.feed(tool_use("t2"))
+    await asyncio.sleep(0.02)
+    await status.feed(tool_result("t1"))
+    await status.feed(tool_result("t2"))
+    await status.finish()
+    await asyncio.sleep(0.1)
+
+    assert discord.landed[-1].startswith("**Tools** (2 done)")
+    assert discord.get_messages("c1")[0].content == discord.landed[-1]
+
+
+class NoChannelDiscordClient(FakeDiscordClient):
+    def __init__(self):
+        super().__init__()
+        self.sends = 0
+
+    async def send_message(self, channel_id, content):
+        self.sends += 1
+        return None
+
+
+@pytest.mark.asyncio
+async def test_status_message_is_not_retried_after_send_fails():
+    discord = NoChannelDiscordClient()
+    status = ToolStatusMessage(discord, "c1", debounce_seconds=0.01)
+
+    for i in range(3):
+        await status.feed(tool_use(f"t{i}"))
+    await status.feed(text("done"))
+    final_text = await status.finish()
+
+    assert discord.sends == 1
+    assert final_text == ["done"]
+
+
+@pytest.mark.asyncio
+async def test_only_final_text_is_returned():
+    discord = FakeDiscordClient()
+    status = ToolStatusMessage(discord, "c1", debounce_seconds=10)
+
+    await status.feed(text("Let me look"))
+    await status.feed(tool_use("t1", command="ls"))
+    await status.feed(text("Done, here is the answer"))
+
+    assert await status.finish() == ["Done, here is the answer"]
+    assert "> Let me look" in discord.get_messages("c1")[0].content
+
+
+@pytest.mark.asyncio
+async def test_failed_turn_marks_running_tools_failed():
+    discord = FakeDiscordClient()
+    status = ToolStatusMessage(discord, "c1")
+
+    await status.feed(tool_use("t1"))
+    await status.finish(failed=True)
+
+    assert discord.get_messages("c1")[0].content.startswith("**Tools** (0 done, 1 failed)")
+
+
+def test_render_truncates_arguments_and_keeps_newest_lines():
+    status = ToolStatusMessage(FakeDiscordClient(), "c1")
+    for i in range(100):
+        status.tools[f"t{i}"] = ToolStatus(
+            tool_id=f"t{i}", name=f"Bash{i}", args=format_args({"command": "x" * 500})
+        )
+
+    rendered = status.render()
+
+    assert len(rendered) <= 2000
+    assert rendered.splitlines()[-1].startswith("… Bash99 (command=xxx")
+    assert "earlier" in rendered.splitlines()[1]
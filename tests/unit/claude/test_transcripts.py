@@ -0,0 +1,39 @@
+import stat
+
+import pytest
+
+from discord_ai.claude.client import RealClaudeClient
+from discord_ai.claude.transcripts import TranscriptRecorder, load_transcript
+from discord_ai.settings import Settings
+
+
+def test_recorder_round_trips_lines(tmp_path):
+    path = tmp_path / "session.jsonl"
+    recorder = TranscriptRecorder(path)
+    recorder.record('{"type":"system"}')
+    recorder.record('{"type":"assistant"}')
+    recorder.close()
+
+    lines = load_transcript(path)
+
+    assert [entry.line for entry in lines] == ['{"type":"system"}', '{"type":"assistant"}']
+    assert all(entry.delay >= 0 for entry in lines)
+
+
+@pytest.mark.asyncio
+async def test_real_client_records_when_record_dir_set(monkeypatch, tmp_path):
+    cli = tmp_path / "claude"
+    cli.write_text('#!/bin/sh\necho \'{"type":"system"}\'\necho\necho \'{"type":"result"}\'\n')
+    cli.chmod(cli.stat().st_mode | stat.S_IEXEC)
+
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("CLAUDE_CLI_PATH", str(cli))
+    monkeypatch.setenv("CLAUDE_RECORD_DIR", str(tmp_path / "recordings"))
+    client = RealClaudeClient(Settings())
+
+    lines = [line async for line in client.run_session("session-1", "hello")]
+
+    recordings = list((tmp_path / "recordings").glob("session-1-*.jsonl"))
+    assert len(recordings) == 1
+    assert [entry.line for entry in load_transcript(recordings[0])] == lines
+    assert lines == ['{"type":"system"}', '{"type":"result"}']
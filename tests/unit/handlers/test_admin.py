@@ -0,0 +1,86 @@
+import pytest
+
+from discord_ai.claude.routing import ModelRouter
+from discord_ai.handlers.admin import model_command, profile_command
+from discord_ai.settings import Settings
+
+
+class FakeContext:
+    def __init__(self):
+        self.author = "admin#0001"
+        self.sent = []
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append((content, kwargs))
+
+
+@pytest.fixture
+def settings(monkeypatch, tmp_path):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("PROFILE_OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setenv("PROFILE_MAX_SECONDS", "1")
+    return Settings()
+
+
+@pytest.mark.asyncio
+async def test_profile_command_posts_report_files(settings, tmp_path):
+    ctx = FakeContext()
+
+    await profile_command(ctx, 0.05, settings)
+
+    content, kwargs = ctx.sent[-1]
+    assert content.startswith("Profile finished")
+    filenames = [f.filename for f in kwargs["files"]]
+    assert filenames[0].endswith("-top.txt")
+    assert filenames[1].endswith(".collapsed")
+    assert len(list(tmp_path.glob("profile-*"))) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seconds", [0.0, -1.0, float("nan"), float("inf")])
+async def test_profile_command_rejects_invalid_duration(settings, seconds):
+    ctx = FakeContext()
+
+    await profile_command(ctx, seconds, settings)
+
+    assert ctx.sent == [("||Error: profile duration must be a positive number||", {})]
+
+
+@pytest.mark.asyncio
+async def test_profile_command_clamps_duration(settings):
+    settings.profile_max_seconds = 0.05
+    ctx = FakeContext()
+
+    await profile_command(ctx, 9999, settings)
+
+    assert ctx.sent[0] == ("Profiling for 0.05s...", {})
+    assert "over 0.05s" in ctx.sent[-1][0]
+
+
+@pytest.mark.asyncio
+async def test_profiles_in_the_same_second_keep_separate_files(settings, tmp_path):
+    await profile_command(FakeContext(), 0.01, settings)
+    await profile_command(FakeContext(), 0.01, settings)
+
+    assert len(list(tmp_path.glob("profile-*"))) == 4
+
+
+class FakeChannelContext(FakeContext):
+    def __init__(self):
+        super().__init__()
+        self.channel = type("Channel", (), {"id": 7})()
+
+
+@pytest.mark.asyncio
+async def test_model_command_pins_and_resets(settings):
+    model_router = ModelRouter(settings)
+    ctx = FakeChannelContext()
+
+    await model_command(ctx, "opus", model_router)
+    assert model_router.pins == {"7": "opus"}
+
+    await model_command(ctx, None, model_router)
+    assert ctx.sent[-1][0] == "Pinned model: opus"
+
+    await model_command(ctx, "reset", model_router)
+    assert model_router.pins == {}
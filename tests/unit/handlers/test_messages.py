@@ -3,7 +3,8 @@ import pytest
 from discord_ai.claude.client import FakeClaudeClient
 from discord_ai.discord_client import FakeDiscordClient
 from discord_ai.handlers.messages import MessageHandler
-from tests.helpers.data.claude_responses import SIMPLE_TEXT
+from discord_ai.settings import Settings
+from tests.helpers.data.claude_responses import SIMPLE_TEXT, TOOL_USE_SEQUENCE
 
 
 @pytest.mark.asyncio
@@ -33,3 +34,21 @@ async def test_sends_typing_indicator_while_processing():
 
     channel = discord.get_channel("channel_123")
     assert channel.typing_count >= 1
+
+
+@pytest.mark.asyncio
+async def test_status_mode_collapses_tool_activity(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("TOOL_OUTPUT_MODE", "status")
+    claude = FakeClaudeClient(TOOL_USE_SEQUENCE)
+    discord = FakeDiscordClient()
+    handler = MessageHandler(claude, discord, settings=Settings())
+
+    await handler.handle_message(
+        channel_id="channel_123", session_id="session-id-123", content="hello"
+    )
+
+    messages = [m.content for m in discord.get_messages("channel_123")]
+    assert len(messages) == 2
+    assert messages[0].startswith("**Tools** (1 done)")
+    assert messages[1] == "I see the file contains..."
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from discord_ai.claude.client import FakeClaudeClient
+from discord_ai.discord_client import FakeDiscordClient
+from discord_ai.handlers.messages import MessageHandler
+from discord_ai.handlers.resume import resume_inflight, unsent_entries
+from discord_ai.inflight import InflightStore
+from discord_ai.settings import Settings
+from tests.helpers.data.claude_responses import SIMPLE_TEXT
+
+SESSION_ID = "df83d374-79dd-4100-be18-fd7e4bccc33b"
+
+
+def log_entry(entry_type: str, uuid: str, content) -> dict:
+    return {
+        "type": entry_type,
+        "uuid": f"00000000-0000-0000-0000-00000000000{uuid}",
+        "sessionId": SESSION_ID,
+        "message": {"role": entry_type, "content": content},
+    }
+
+
+def write_session_log(projects_dir, entries):
+    path = projects_dir / "-home-bot" / f"{SESSION_ID}.jsonl"
+    path.parent.mkdir(parents=True)
+    path.write_text("".join(json.dumps(e) + "\n" for e in entries) + '{"type": "assis')
+
+
+@pytest.fixture
+def settings(monkeypatch, tmp_path):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("CLAUDE_PROJECTS_DIR", str(tmp_path / "projects"))
+    monkeypatch.setenv("RESUME_WAIT_SECONDS", "0")
+    return Settings()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return InflightStore(tmp_path / "inflight.db")
+
+
+def make_handler(store, responses=SIMPLE_TEXT):
+    return MessageHandler(FakeClaudeClient(responses), FakeDiscordClient(), None, store)
+
+
+@pytest.mark.asyncio
+async def test_posts_rest_of_answer_from_session_log(settings, store, tmp_path):
+    write_session_log(
+        tmp_path / "projects",
+        [
+            log_entry("user", "1", "fix it"),
+            log_entry("assistant", "2", [{"type": "text", "text": "Looking"}]),
+            log_entry("assistant", "3", [{"type": "text", "text": "Fixed!"}]),
+        ],
+    )
+    store.begin("m1", "c1", SESSION_ID, "fix it")
+    store.progress("m1", "00000000-0000-0000-0000-000000000002")
+    handler = make_handler(store)
+
+    await resume_inflight(store, handler, settings)
+
+    messages = [m.content for m in handler.discord_client.get_messages("c1")]
+    assert messages == ["||Resumed after a restart||", "Fixed!"]
+    assert store.pending() == []
+
+
+@pytest.mark.asyncio
+async def test_partial_output_is_posted_with_interrupted_note(settings, store, tmp_path):
+    tool_use = {"type": "tool_use", "id": "t1", "name": "Read", "input": {"file_path": "a.py"}}
+    write_session_log(
+        tmp_path / "projects",
+        [
+            log_entry("user", "1", [{"type": "text", "text": "fix it"}]),
+            log_entry("assistant", "2", [tool_use]),
+        ],
+    )
+    store.begin("m1", "c1", SESSION_ID, "fix it")
+    handler = make_handler(store)
+
+    await resume_inflight(store, handler, settings)
+
+    messages = [m.content for m in handler.discord_client.get_messages("c1")]
+    assert messages[1] == "Tool: Read (file_path=a.py)"
+    assert messages[-1].startswith("||This turn was interrupted")
+
+
+@pytest.mark.asyncio
+async def test_reruns_turn_without_usable_output(settings, store):
+    store.begin("m1", "c1", SESSION_ID, "fix it")
+    handler = make_handler(store)
+
+    await resume_inflight(store, handler, settings)
+
+    messages = [m.content for m in handler.discord_client.get_messages("c1")]
+    assert messages == ["||Restarted mid-turn; running your message again||", "Hello"]
+    assert store.pending() == []
+
+
+def test_unknown_last_uuid_never_reruns(store):
+    store.begin("m1", "c1", SESSION_ID, "fix it")
+    store.progress("m1", "not-in-log")
+
+    assert unsent_entries([], store.pending()[0]) == []
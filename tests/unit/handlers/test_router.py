@@ -0,0 +1,361 @@
+import asyncio
+
+import pytest
+
+from discord_ai.admission import AdmissionController
+from discord_ai.attachments import AttachmentStore
+from discord_ai.claude.routing import ModelRouter
+from discord_ai.dedup import MessageDeduplicator
+from discord_ai.handlers.router import MessageRouter
+from discord_ai.metrics import metrics
+from discord_ai.sessions import SessionIndex
+from discord_ai.settings import Settings
+from discord_ai.webhooks import WebhookSender
+from discord_ai.workspaces import WorkspaceManager
+from tests.helpers.discord_fakes import (
+    FakeAttachment,
+    FakeBot,
+    FakeCategory,
+    FakeDiscordMessage,
+    FakeFetcher,
+    FakeTextChannel,
+    FakeThread,
+    FakeUser,
+    RecordingMessageHandler,
+)
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("CATEGORY_NAME", "Claude Conversations")
+    return Settings()
+
+
+@pytest.fixture
+def handler():
+    return RecordingMessageHandler()
+
+
+@pytest.fixture
+def bot():
+    return FakeBot()
+
+
+@pytest.mark.asyncio
+async def test_routes_session_channel_message(bot, handler, settings):
+    router = MessageRouter(bot, handler, settings)
+    message = FakeDiscordMessage(content="hello")
+
+    await router.on_message(message)
+
+    assert handler.calls == [
+        {
+            "channel_id": str(message.channel.id),
+            "session_id": "df83d374-79dd-4100-be18-fd7e4bccc33b",
+            "content": "hello",
+            "model": None,
+            "extra_args": (),
+            "message_id": str(message.id),
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_ignores_other_categories(bot, handler, settings):
+    router = MessageRouter(bot, handler, settings)
+    channel = FakeTextChannel(category=FakeCategory("Elsewhere"))
+
+    await router.on_message(FakeDiscordMessage(content="hello", channel=channel))
+
+    assert handler.calls == []
+
+
+@pytest.mark.asyncio
+async def test_reports_missing_session_id(bot, handler, settings):
+    router = MessageRouter(bot, handler, settings)
+    channel = FakeTextChannel(topic=None)
+
+    await router.on_message(FakeDiscordMessage(content="hello", channel=channel))
+
+    assert handler.calls == []
+    assert "No session ID" in channel.sent[0]
+
+
+@pytest.mark.asyncio
+async def test_invokes_commands_instead_of_claude(bot, handler, settings):
+    router = MessageRouter(bot, handler, settings)
+
+    await router.on_message(FakeDiscordMessage(content="!profile 5"))
+
+    assert len(bot.invoked) == 1
+    assert handler.calls == []
+
+
+@pytest.mark.asyncio
+async def test_drops_replayed_messages(bot, handler, settings):
+    router = MessageRouter(bot, handler, settings, deduplicator=MessageDeduplicator())
+    message = FakeDiscordMessage(content="hello")
+
+    await router.on_message(message)
+    await router.on_message(message)
+
+    assert len(handler.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_only_session_messages_are_marked(bot, handler, settings):
+    deduplicator = MessageDeduplicator()
+    router = MessageRouter(bot, handler, settings, deduplicator=deduplicator)
+    elsewhere = FakeTextChannel(category=FakeCategory("Other"))
+
+    await router.on_message(FakeDiscordMessage(content="chit-chat", channel=elsewhere))
+    await router.on_message(FakeDiscordMessage(content="hello"))
+
+    assert len(deduplicator) == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_turns_get_friendly_message(bot, handler, settings):
+    settings.user_quota_burst = 1
+    settings.user_quota_per_minute = 1
+    router = MessageRouter(bot, handler, settings, admission=AdmissionController(settings))
+    channel = FakeTextChannel()
+    author = FakeUser()
+
+    await router.on_message(FakeDiscordMessage(content="one", channel=channel, author=author))
+    await router.on_message(FakeDiscordMessage(content="two", channel=channel, author=author))
+
+    assert len(handler.calls) == 1
+    assert "faster than I can keep up" in channel.sent[0]
+    assert router.admission.active_turns == 0
+
+
+@pytest.mark.asyncio
+async def test_attachment_paths_passed_to_claude(bot, handler, settings, tmp_path):
+    upload = FakeAttachment("trace.log", b"Traceback...")
+    store = AttachmentStore(tmp_path, fetcher=FakeFetcher([upload]))
+    router = MessageRouter(bot, handler, settings, attachments=store)
+
+    await router.on_message(FakeDiscordMessage(content="why?", attachments=[upload]))
+
+    content = handler.calls[0]["content"]
+    assert content.startswith("why?")
+    assert "trace.log" in content
+    session_dir = tmp_path / "df83d374-79dd-4100-be18-fd7e4bccc33b"
+    assert handler.calls[0]["extra_args"] == ("--add-dir", str(session_dir))
+
+
+@pytest.mark.asyncio
+async def test_attachments_land_in_session_workspace(bot, handler, settings, tmp_path):
+    settings.workspaces_dir = str(tmp_path / "workspaces")
+    upload = FakeAttachment("trace.log", b"Traceback...")
+    store = AttachmentStore(tmp_path / "scratch", fetcher=FakeFetcher([upload]))
+    router = MessageRouter(
+        bot, handler, settings, attachments=store, workspaces=WorkspaceManager(settings)
+    )
+
+    await router.on_message(FakeDiscordMessage(content="why?", attachments=[upload]))
+
+    session_id = handler.calls[0]["session_id"]
+    assert (tmp_path / "workspaces" / session_id / "attachments" / "trace.log").exists()
+    assert handler.calls[0]["extra_args"] == ()
+
+
+@pytest.mark.asyncio
+async def test_workspace_is_held_for_the_whole_turn(bot, settings, tmp_path):
+    settings.workspaces_dir = str(tmp_path / "workspaces")
+    workspaces = WorkspaceManager(settings)
+    held = []
+
+    class CheckingHandler(RecordingMessageHandler):
+        async def handle_message(self, **kwargs):
+            held.append(dict(workspaces._active))
+            await super().handle_message(**kwargs)
+
+    router = MessageRouter(bot, CheckingHandler(), settings, workspaces=workspaces)
+
+    await router.on_message(FakeDiscordMessage(content="hello"))
+
+    assert held == [{"df83d374-79dd-4100-be18-fd7e4bccc33b": 1}]
+    assert workspaces._active == {}
+
+
+@pytest.mark.asyncio
+async def test_over_quota_workspace_warns_and_still_runs(bot, handler, settings, tmp_path):
+    settings.workspaces_dir = str(tmp_path / "workspaces")
+    settings.workspace_quota_mb = 1
+    workspaces = WorkspaceManager(settings)
+    big = workspaces.path_for("df83d374-79dd-4100-be18-fd7e4bccc33b") / "big.bin"
+    big.write_bytes(b"x" * 2 * 1024 * 1024)
+    router = MessageRouter(bot, handler, settings, workspaces=workspaces)
+    message = FakeDiscordMessage(content="clean up please")
+
+    await router.on_message(message)
+
+    assert "over its 1 MB quota" in message.channel.sent[0]
+    assert len(handler.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_thread_messages_use_thread_session(bot, handler, settings):
+    settings.thread_session_channels = ["claude-threads"]
+    sessions = SessionIndex()
+    router = MessageRouter(bot, handler, settings, sessions=sessions)
+    thread = FakeThread(parent=FakeTextChannel(name="claude-threads", category=None))
+
+    await router.on_message(FakeDiscordMessage(content="hi", channel=thread))
+    await router.on_message(FakeDiscordMessage(content="again", channel=thread))
+
+    session_id = sessions.get(str(thread.id)).session_id
+    assert [call["session_id"] for call in handler.calls] == [session_id, session_id]
+    assert handler.calls[0]["channel_id"] == str(thread.id)
+
+
+@pytest.mark.asyncio
+async def test_model_router_picks_model_and_strips_prefix(bot, handler, settings):
+    router = MessageRouter(bot, handler, settings, model_router=ModelRouter(settings))
+
+    await router.on_message(FakeDiscordMessage(content="!fast what time is it"))
+
+    call = handler.calls[0]
+    assert call["content"] == "what time is it"
+    assert call["model"] == "haiku"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("content", ["!fast", "!fast   "])
+async def test_model_prefix_without_prompt_replies_with_usage(bot, handler, settings, content):
+    router = MessageRouter(bot, handler, settings, model_router=ModelRouter(settings))
+    message = FakeDiscordMessage(content=content)
+
+    await router.on_message(message)
+
+    assert handler.calls == []
+    assert message.channel.sent[-1] == "||Usage: !fast <message>||"
+
+
+@pytest.mark.asyncio
+async def test_ignores_own_webhook_messages(bot, handler, settings):
+    webhooks = WebhookSender(bot)
+    webhooks.webhook_ids.add(555)
+    router = MessageRouter(bot, handler, settings, webhooks=webhooks)
+    message = FakeDiscordMessage(content="hello")
+    message.webhook_id = 555
+
+    await router.on_message(message)
+
+    assert handler.calls == []
+
+
+@pytest.mark.asyncio
+async def test_standby_holds_messages_until_take_over(bot, handler, settings):
+    router = MessageRouter(bot, handler, settings, standby=True)
+
+    await router.on_message(FakeDiscordMessage(content="first"))
+    await router.on_message(FakeDiscordMessage(content="second"))
+    assert handler.calls == []
+
+    await router.take_over()
+
+    assert sorted(call["content"] for call in handler.calls) == ["first", "second"]
+    assert not router.standby
+
+
+@pytest.mark.asyncio
+async def test_take_over_skips_messages_the_predecessor_owned(bot, handler, settings, tmp_path):
+    now = [100.0]
+    predecessor = MessageDeduplicator(persist_path=tmp_path / "dedup.log")
+    successor = MessageDeduplicator(persist_path=tmp_path / "dedup.log")
+    router = MessageRouter(
+        bot, handler, settings, deduplicator=successor, standby=True, clock=lambda: now[0]
+    )
+    answered = FakeDiscordMessage(content="answered before the drain")
+    in_flight = FakeDiscordMessage(content="cut off, resumed instead")
+    marked = FakeDiscordMessage(content="answered right as the drain began")
+    fresh = FakeDiscordMessage(content="arrived during the drain")
+
+    await router.on_message(answered)
+    now[0] = 200.0
+    for message in (in_flight, marked, fresh):
+        await router.on_message(message)
+    predecessor.check_and_mark(str(marked.id))
+    await predecessor.close()
+
+    await router.take_over(since=150.0, skip={str(in_flight.id)})
+
+    assert [call["content"] for call in handler.calls] == ["arrived during the drain"]
+
+
+@pytest.mark.asyncio
+async def test_take_over_skips_held_posts_from_our_webhooks(bot, handler, settings):
+    webhooks = WebhookSender(bot)
+    router = MessageRouter(bot, handler, settings, webhooks=webhooks, standby=True)
+    drain_output = FakeDiscordMessage(content="the old instance's answer")
+    drain_output.webhook_id = 555
+    await router.on_message(drain_output)
+    await router.on_message(FakeDiscordMessage(content="a real question"))
+
+    webhooks.webhook_ids.add(555)  # what preload() finds on ready
+    await router.take_over()
+
+    assert [call["content"] for call in handler.calls] == ["a real question"]
+
+
+@pytest.mark.asyncio
+async def test_take_over_replays_each_channel_in_order(bot, settings):
+    order = []
+
+    class SlowFirstHandler(RecordingMessageHandler):
+        async def handle_message(self, **kwargs):
+            if kwargs["content"] == "one":
+                await asyncio.sleep(0.02)
+            order.append(kwargs["content"])
+
+    router = MessageRouter(bot, SlowFirstHandler(), settings, standby=True)
+    channel = FakeTextChannel()
+    for content in ("one", "two", "three"):
+        await router.on_message(FakeDiscordMessage(content=content, channel=channel))
+
+    await router.take_over()
+
+    assert order == ["one", "two", "three"]
+
+
+@pytest.mark.asyncio
+async def test_full_standby_buffer_counts_dropped_messages(bot, handler, settings, monkeypatch):
+    metrics.reset()
+    monkeypatch.setattr("discord_ai.handlers.router.MAX_HELD_MESSAGES", 2)
+    router = MessageRouter(bot, handler, settings, standby=True)
+
+    for content in ("a", "b", "c"):
+        await router.on_message(FakeDiscordMessage(content=content))
+    await router.take_over()
+
+    assert sorted(call["content"] for call in handler.calls) == ["b", "c"]
+    assert metrics.counters["router.held_dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_draining_asks_to_resend_without_successor(bot, handler, settings):
+    router = MessageRouter(bot, handler, settings)
+    router.begin_drain()
+    channel = FakeTextChannel()
+
+    await router.on_message(FakeDiscordMessage(content="hello", channel=channel))
+
+    assert handler.calls == []
+    assert "restarting" in channel.sent[0]
+
+
+@pytest.mark.asyncio
+async def test_draining_leaves_messages_to_successor(bot, handler, settings):
+    settings.routing_lease_path = "/tmp/discord-ai.lease"
+    router = MessageRouter(bot, handler, settings)
+    router.begin_drain()
+    channel = FakeTextChannel()
+
+    await router.on_message(FakeDiscordMessage(content="hello", channel=channel))
+
+    assert handler.calls == []
+    assert channel.sent == []
@@ -0,0 +1,102 @@
+import pytest
+
+from discord_ai.handlers.threads import (
+    ThreadArchiver,
+    is_session_thread,
+    on_thread_create,
+    on_thread_update,
+    resume_thread_session,
+)
+from discord_ai.sessions import SessionIndex
+from discord_ai.settings import Settings
+from tests.helpers.discord_fakes import FakeTextChannel, FakeThread
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeBot:
+    def __init__(self, threads):
+        self.threads = {thread.id: thread for thread in threads}
+
+    def get_channel(self, channel_id):
+        return self.threads.get(channel_id)
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("THREAD_SESSION_CHANNELS", '["claude-threads"]')
+    monkeypatch.setenv("THREAD_IDLE_ARCHIVE_MINUTES", "10")
+    return Settings()
+
+
+@pytest.fixture
+def parent():
+    return FakeTextChannel(name="claude-threads")
+
+
+def test_only_threads_under_designated_channels(settings, parent):
+    assert is_session_thread(FakeThread(parent=parent), settings)
+    assert not is_session_thread(FakeThread(parent=FakeTextChannel(name="general")), settings)
+    assert not is_session_thread(parent, settings)
+
+
+@pytest.mark.asyncio
+async def test_thread_create_registers_session(settings, parent):
+    index = SessionIndex()
+    thread = FakeThread(parent=parent, name="refactor")
+
+    await on_thread_create(thread, settings, index)
+
+    assert index.get(str(thread.id)).name == "refactor"
+
+
+@pytest.mark.asyncio
+async def test_thread_update_tracks_archive_state(settings, parent):
+    index = SessionIndex()
+    before = FakeThread(parent=parent)
+    after = FakeThread(parent=parent, archived=True, id=before.id)
+    await on_thread_create(before, settings, index)
+
+    await on_thread_update(before, after, settings, index)
+
+    assert index.get(str(before.id)).archived is True
+
+
+@pytest.mark.asyncio
+async def test_archived_thread_is_reinitialised_lazily(parent):
+    index = SessionIndex()
+    thread = FakeThread(parent=parent, archived=True)
+    original = index.ensure(str(thread.id), str(parent.id), thread.name)
+    index.set_archived(str(thread.id), True)
+
+    session_id = await resume_thread_session(thread, index)
+
+    assert session_id == original.session_id
+    assert index.get(str(thread.id)).archived is False
+    assert thread.edits == [{"archived": False}]
+
+
+@pytest.mark.asyncio
+async def test_archiver_archives_idle_threads(settings, parent):
+    clock = FakeClock()
+    index = SessionIndex(clock=clock)
+    idle = FakeThread(parent=parent, name="idle")
+    busy = FakeThread(parent=parent, name="busy")
+    index.ensure(str(idle.id), str(parent.id), idle.name)
+    index.ensure(str(busy.id), str(parent.id), busy.name)
+
+    clock.now += 11 * 60
+    index.touch(str(busy.id))
+    archived = await ThreadArchiver(FakeBot([idle, busy]), settings, index).archive_idle()
+
+    assert archived == 1
+    assert idle.archived is True
+    assert busy.archived is False
+    assert index.get(str(idle.id)).archived is True
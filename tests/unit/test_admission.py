@@ -0,0 +1,151 @@
+import pytest
+
+from discord_ai import admission as admission_module
+from discord_ai.admission import AdmissionController, HostPressure, TokenBucket
+from discord_ai.settings import Settings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakePressure(HostPressure):
+    def __init__(self, load=0.0, free_mb=4096.0, processes=0):
+        super().__init__(process_count=lambda: self.processes)
+        self.load = load
+        self.free_mb = free_mb
+        self.processes = processes
+
+    def load_average(self):
+        return self.load
+
+    def free_memory_mb(self):
+        return self.free_mb
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("ADMISSION_DEFER_SECONDS", "0")
+    return Settings()
+
+
+def test_token_bucket_refills_over_time():
+    bucket = TokenBucket(capacity=2, now=0)
+
+    assert bucket.try_take(2, 1.0, now=0) == 0
+    assert bucket.try_take(2, 1.0, now=0) == 0
+    assert bucket.try_take(2, 1.0, now=0) == pytest.approx(1.0)
+    assert bucket.try_take(2, 1.0, now=1.0) == 0
+
+
+@pytest.mark.asyncio
+async def test_quotas_disabled_by_default(settings):
+    controller = AdmissionController(settings, FakePressure())
+
+    for _ in range(20):
+        assert (await controller.admit("user", "channel")).allowed
+
+    assert controller.active_turns == 20
+
+
+@pytest.mark.asyncio
+async def test_user_quota_rejects_bursts(settings):
+    settings.user_quota_burst = 2
+    settings.user_quota_per_minute = 6
+    clock = FakeClock()
+    controller = AdmissionController(settings, FakePressure(), clock=clock)
+
+    assert (await controller.admit("user", "c1")).allowed
+    assert (await controller.admit("user", "c2")).allowed
+    rejected = await controller.admit("user", "c3")
+
+    assert not rejected.allowed
+    assert rejected.reason == "user_quota"
+    assert rejected.retry_after == pytest.approx(10)
+    assert (await controller.admit("other-user", "c3")).allowed
+
+    clock.now += 10
+    assert (await controller.admit("user", "c1")).allowed
+
+
+@pytest.mark.asyncio
+async def test_channel_quota_refunds_user_token(settings):
+    settings.user_quota_burst = 1
+    settings.user_quota_per_minute = 1
+    settings.channel_quota_burst = 1
+    settings.channel_quota_per_minute = 1
+    controller = AdmissionController(settings, FakePressure(), clock=FakeClock())
+
+    assert (await controller.admit("alice", "busy")).allowed
+    rejected = await controller.admit("bob", "busy")
+
+    assert rejected.reason == "channel_quota"
+    assert (await controller.admit("bob", "quiet")).allowed
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_process_limit_reached(settings):
+    settings.max_claude_processes = 1
+    controller = AdmissionController(settings, FakePressure())
+
+    assert (await controller.admit("user", "c1")).allowed
+    rejected = await controller.admit("user", "c2")
+
+    assert rejected.reason == "max_processes"
+    assert "heavy load" in rejected.message
+
+    controller.release()
+    assert (await controller.admit("user", "c2")).allowed
+
+
+@pytest.mark.asyncio
+async def test_rejects_on_load_and_memory(settings):
+    settings.max_load_average = 8
+    settings.min_free_memory_mb = 512
+
+    overloaded = AdmissionController(settings, FakePressure(load=12))
+    low_memory = AdmissionController(settings, FakePressure(free_mb=100))
+
+    assert (await overloaded.admit("u", "c")).reason == "load_average"
+    assert (await low_memory.admit("u", "c")).reason == "free_memory"
+
+
+@pytest.mark.asyncio
+async def test_defers_until_pressure_clears(settings, monkeypatch):
+    monkeypatch.setattr(admission_module, "PRESSURE_POLL_SECONDS", 0.01)
+    settings.max_claude_processes = 1
+    settings.admission_defer_seconds = 5
+    pressure = FakePressure(processes=1)
+    controller = AdmissionController(settings, pressure)
+    notices = []
+
+    async def on_defer(decision):
+        notices.append(decision.reason)
+        pressure.processes = 0
+
+    decision = await controller.admit("user", "channel", on_defer=on_defer)
+
+    assert decision.allowed
+    assert notices == ["max_processes"]
+
+
+@pytest.mark.asyncio
+async def test_close_drops_deferred_turns(settings, monkeypatch):
+    monkeypatch.setattr(admission_module, "PRESSURE_POLL_SECONDS", 0.01)
+    settings.max_claude_processes = 1
+    settings.admission_defer_seconds = 5
+    controller = AdmissionController(settings, FakePressure(processes=1))
+
+    async def on_defer(decision):
+        controller.close()
+
+    decision = await controller.admit("user", "channel", on_defer=on_defer)
+
+    assert decision.reason == "draining"
+    assert (await controller.admit("user", "other")).reason == "draining"
+    assert controller.active_turns == 0
@@ -0,0 +1,165 @@
+import asyncio
+import errno
+import os
+
+import pytest
+
+from discord_ai.attachments import (
+    AttachmentStore,
+    StoredAttachment,
+    describe_attachments,
+    safe_filename,
+)
+from tests.helpers.discord_fakes import FakeAttachment, FakeFetcher
+
+
+@pytest.mark.asyncio
+async def test_streams_attachments_into_session_dir(tmp_path):
+    files = [FakeAttachment("log.txt", b"line one\nline two\n"), FakeAttachment("a.py", b"x = 1")]
+    store = AttachmentStore(tmp_path, fetcher=FakeFetcher(files))
+
+    stored, skipped = await store.fetch_all("session-1", files)
+
+    assert skipped == []
+    assert [a.path for a in stored] == [
+        tmp_path / "session-1" / "log.txt",
+        tmp_path / "session-1" / "a.py",
+    ]
+    assert stored[0].path.read_bytes() == b"line one\nline two\n"
+    assert stored[1].size == 5
+
+
+@pytest.mark.asyncio
+async def test_reupload_with_known_etag_is_not_fetched_again(tmp_path):
+    first = FakeAttachment("data.csv", b"a,b\n1,2\n", etag='"abc123"')
+    fetcher = FakeFetcher([first])
+    store = AttachmentStore(tmp_path, fetcher=fetcher)
+    await store.fetch_all("session-1", [first])
+
+    again = FakeAttachment("data.csv", b"a,b\n1,2\n", etag='"abc123"')
+    fetcher.add(again)
+    stored, _ = await store.fetch_all("session-2", [again])
+
+    assert fetcher.downloads == 1
+    assert stored[0].path.read_bytes() == b"a,b\n1,2\n"
+
+
+@pytest.mark.asyncio
+async def test_identical_content_stored_once(tmp_path):
+    files = [FakeAttachment("one.txt", b"same"), FakeAttachment("two.txt", b"same")]
+    store = AttachmentStore(tmp_path, fetcher=FakeFetcher(files))
+
+    stored, _ = await store.fetch_all("session-1", files)
+
+    assert stored[0].sha256 == stored[1].sha256
+    assert len([p for p in store.cache_dir.iterdir() if not p.name.startswith(".")]) == 1
+
+
+@pytest.mark.asyncio
+async def test_size_and_count_caps(tmp_path):
+    files = [
+        FakeAttachment("big.bin", b"x" * 100),
+        FakeAttachment("ok.txt", b"ok"),
+        FakeAttachment("extra.txt", b"extra"),
+    ]
+    store = AttachmentStore(tmp_path, max_bytes=10, max_count=2, fetcher=FakeFetcher(files))
+
+    stored, skipped = await store.fetch_all("session-1", files)
+
+    assert [a.filename for a in stored] == ["ok.txt"]
+    assert sorted(s.filename for s in skipped) == ["big.bin", "extra.txt"]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_filenames_get_unique_paths(tmp_path):
+    files = [FakeAttachment("notes.txt", b"first"), FakeAttachment("notes.txt", b"second")]
+    store = AttachmentStore(tmp_path, fetcher=FakeFetcher(files))
+
+    stored, _ = await store.fetch_all("session-1", files)
+
+    assert [a.path.name for a in stored] == ["notes.txt", "notes-1.txt"]
+    assert stored[1].path.read_bytes() == b"second"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_messages_never_overwrite_each_other(tmp_path):
+    first, second = FakeAttachment("notes.txt", b"first"), FakeAttachment("notes.txt", b"second")
+    store = AttachmentStore(tmp_path, fetcher=FakeFetcher([first, second]))
+
+    results = await asyncio.gather(
+        store.fetch_all("session-1", [first]), store.fetch_all("session-1", [second])
+    )
+
+    paths = {stored[0].path for stored, _ in results}
+    assert len(paths) == 2
+    assert sorted(p.read_bytes() for p in paths) == [b"first", b"second"]
+
+
+@pytest.mark.asyncio
+async def test_copies_when_hard_links_are_not_possible(tmp_path, monkeypatch):
+    def cross_device(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "link", cross_device)
+    (tmp_path / "session-1").mkdir()
+    (tmp_path / "session-1" / "notes.txt").write_bytes(b"keep me")
+    upload = FakeAttachment("notes.txt", b"new")
+    store = AttachmentStore(tmp_path, fetcher=FakeFetcher([upload]))
+
+    [stored], _ = await store.fetch_all("session-1", [upload])
+
+    assert stored.path.name == "notes-1.txt"
+    assert stored.path.read_bytes() == b"new"
+    assert (tmp_path / "session-1" / "notes.txt").read_bytes() == b"keep me"
+
+
+@pytest.mark.asyncio
+async def test_known_etag_survives_restart(tmp_path):
+    first = FakeAttachment("data.csv", b"a,b\n", etag='"abc123"')
+    fetcher = FakeFetcher([first])
+    await AttachmentStore(tmp_path, fetcher=fetcher).fetch_all("session-1", [first])
+
+    again = FakeAttachment("data.csv", b"a,b\n", etag='"abc123"')
+    fetcher.add(again)
+    await AttachmentStore(tmp_path, fetcher=fetcher).fetch_all("session-2", [again])
+
+    assert fetcher.downloads == 1
+
+
+@pytest.mark.asyncio
+async def test_collect_removes_expired_files_and_trims_cache(tmp_path):
+    now = 1_000_000.0
+    old = FakeAttachment("old.txt", b"old", etag='"old"')
+    fresh = [FakeAttachment("a.txt", b"a" * 10), FakeAttachment("b.txt", b"b" * 10)]
+    store = AttachmentStore(
+        tmp_path,
+        fetcher=FakeFetcher([old, *fresh]),
+        retention_seconds=3600,
+        cache_max_bytes=15,
+        clock=lambda: now,
+    )
+    [stored_old], _ = await store.fetch_all("stale-session", [old])
+    os.utime(stored_old.path, (now - 7200, now - 7200))
+    stored, _ = await store.fetch_all("session-1", fresh)
+    os.utime(stored[0].path, (now - 60, now - 60))
+
+    removed = await store.collect()
+
+    assert removed == 3
+    assert not (tmp_path / "stale-session").exists()
+    assert stored[1].path.exists()
+    assert sorted(p.name for p in store.cache_dir.iterdir() if p.is_file()) == [stored[1].sha256]
+
+
+def test_safe_filename_strips_paths():
+    assert safe_filename("../../etc/passwd") == "passwd"
+    assert safe_filename("my report (1).pdf") == "my_report__1_.pdf"
+
+
+def test_describe_attachments_lists_paths(tmp_path):
+    assert describe_attachments("hello", []) == "hello"
+
+    text = describe_attachments("", [StoredAttachment("a.txt", tmp_path / "a.txt", 3, "d")])
+
+    assert text.startswith("Attached files")
+    assert str(tmp_path / "a.txt") in text
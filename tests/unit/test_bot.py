@@ -1,5 +1,9 @@
 from discord_ai.bot import create_bot
+from discord_ai.claude.routing import ModelRouter
+from discord_ai.reload import SettingsReloader
 from discord_ai.settings import Settings
+from discord_ai.stats import StatsCollector
+from discord_ai.utils.memory import MemoryMonitor
 
 
 def test_create_bot_returns_discord_bot(monkeypatch):
@@ -20,3 +24,45 @@ def test_create_bot_configures_intents(monkeypatch):
 
     assert bot.intents.message_content is True
     assert bot.intents.guilds is True
+
+
+def test_create_bot_registers_admin_commands(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    settings = Settings()
+
+    bot = create_bot(settings)
+
+    assert bot.get_command("profile") is not None
+
+
+def test_create_bot_registers_model_command_with_router(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    settings = Settings()
+
+    assert create_bot(settings).get_command("model") is None
+    assert create_bot(settings, model_router=ModelRouter(settings)).get_command("model") is not None
+
+
+def test_create_bot_registers_reload_command_with_reloader(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    settings = Settings()
+
+    bot = create_bot(settings, reloader=SettingsReloader(settings))
+
+    assert bot.get_command("reload") is not None
+
+
+def test_create_bot_registers_stats_command(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+
+    bot = create_bot(Settings(), stats=StatsCollector())
+
+    assert bot.get_command("stats") is not None
+
+
+def test_create_bot_registers_memory_command_with_monitor(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    settings = Settings()
+
+    assert create_bot(settings).get_command("memory") is None
+    assert create_bot(settings, memory=MemoryMonitor()).get_command("memory") is not None
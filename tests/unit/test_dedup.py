@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+from discord_ai.dedup import MessageDeduplicator
+from discord_ai.metrics import metrics
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_first_delivery_is_not_duplicate():
+    dedup = MessageDeduplicator()
+
+    assert dedup.check_and_mark("1") is False
+    assert dedup.check_and_mark("2") is False
+
+
+def test_replayed_message_is_duplicate_and_counted():
+    dedup = MessageDeduplicator()
+    before = metrics.counters.get("messages.duplicates_dropped", 0)
+
+    dedup.check_and_mark("1")
+
+    assert dedup.check_and_mark("1") is True
+    assert metrics.counters["messages.duplicates_dropped"] == before + 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    dedup = MessageDeduplicator(ttl_seconds=60, clock=clock)
+    dedup.check_and_mark("1")
+
+    clock.now += 61
+
+    assert dedup.check_and_mark("1") is False
+
+
+def test_cache_is_bounded():
+    dedup = MessageDeduplicator(max_entries=2)
+
+    for message_id in ("1", "2", "3"):
+        dedup.check_and_mark(message_id)
+
+    assert len(dedup) == 2
+    assert dedup.check_and_mark("1") is False
+
+
+@pytest.mark.asyncio
+async def test_persisted_ids_survive_restart(tmp_path):
+    path = tmp_path / "dedup.log"
+    clock = FakeClock()
+    first = MessageDeduplicator(ttl_seconds=60, persist_path=path, clock=clock)
+    first.check_and_mark("1")
+    first.check_and_mark("2")
+    await first.close()
+
+    clock.now += 30
+    second = MessageDeduplicator(ttl_seconds=60, persist_path=path, clock=clock)
+
+    assert second.check_and_mark("1") is True
+    assert second.check_and_mark("3") is False
+
+
+@pytest.mark.asyncio
+async def test_expired_ids_are_compacted_on_load(tmp_path):
+    path = tmp_path / "dedup.log"
+    clock = FakeClock()
+    first = MessageDeduplicator(ttl_seconds=60, persist_path=path, clock=clock)
+    first.check_and_mark("1")
+    await first.close()
+
+    clock.now += 120
+    second = MessageDeduplicator(ttl_seconds=60, persist_path=path, clock=clock)
+    await second.close()
+
+    assert path.read_text() == ""
+
+
+@pytest.mark.asyncio
+async def test_file_is_compacted_while_running(tmp_path):
+    path = tmp_path / "dedup.log"
+    dedup = MessageDeduplicator(max_entries=5, persist_path=path, clock=FakeClock())
+
+    dedup.start()
+    for i in range(50):
+        dedup.check_and_mark(str(i))
+        await asyncio.sleep(0)
+    await dedup.close()
+
+    assert len(path.read_text().splitlines()) <= 10
+    assert dedup.check_and_mark("49") is True
+
+
+@pytest.mark.asyncio
+async def test_writer_survives_another_process_compacting(tmp_path):
+    path = tmp_path / "dedup.log"
+    clock = FakeClock()
+    old = MessageDeduplicator(ttl_seconds=60, persist_path=path, clock=clock)
+    old.check_and_mark("1")
+
+    new = MessageDeduplicator(ttl_seconds=60, persist_path=path, clock=clock)
+    old.check_and_mark("2")
+    await old.close()
+    await new.close()
+
+    ids = [line.split()[0] for line in path.read_text().splitlines()]
+    assert ids == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_refresh_picks_up_ids_marked_by_another_instance(tmp_path):
+    path = tmp_path / "dedup.log"
+    clock = FakeClock()
+    old = MessageDeduplicator(ttl_seconds=60, persist_path=path, clock=clock)
+    new = MessageDeduplicator(ttl_seconds=60, persist_path=path, clock=clock)
+    old.check_and_mark("1")
+    await old.close()
+
+    await new.refresh()
+
+    assert new.check_and_mark("1")
+    await new.close()
+
+
+@pytest.mark.asyncio
+async def test_marks_are_written_in_the_background(tmp_path):
+    path = tmp_path / "dedup.log"
+    dedup = MessageDeduplicator(persist_path=path, clock=FakeClock())
+    dedup.start()
+
+    dedup.check_and_mark("1")
+    dedup.check_and_mark("2")
+    assert path.read_text() == ""
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if path.read_text():
+            break
+
+    assert [line.split()[0] for line in path.read_text().splitlines()] == ["1", "2"]
+    await dedup.close()
@@ -35,3 +35,15 @@ async def test_fake_discord_trigger_typing():
     await channel.trigger_typing()
 
     assert channel.typing_count == 1
+
+
+@pytest.mark.asyncio
+async def test_fake_discord_edits_sent_message():
+    client = FakeDiscordClient()
+
+    handle = await client.send_message("channel_123", "draft")
+    await client.edit_message("channel_123", handle, "final")
+
+    messages = client.get_messages("channel_123")
+    assert [m.content for m in messages] == ["final"]
+    assert messages[0].edits == 1
@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+
+from discord_ai import drain as drain_module
+from discord_ai.claude.client import FakeClaudeClient
+from discord_ai.discord_client import FakeDiscordClient
+from discord_ai.drain import CUT_OFF_NOTICE, RESUME_NOTICE, GracefulDrain
+from discord_ai.handlers.messages import MessageHandler
+from discord_ai.handlers.router import MessageRouter
+from discord_ai.settings import Settings
+from tests.helpers.data.claude_responses import SIMPLE_TEXT
+from tests.helpers.discord_fakes import FakeAttachment, FakeBot, FakeDiscordMessage
+
+
+class BlockingClaudeClient:
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def run_session(self, session_id, message, model=None, extra_args=()):
+        await self.release.wait()
+        for line in SIMPLE_TEXT:
+            yield line
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    monkeypatch.setattr(drain_module, "DRAIN_POLL_SECONDS", 0.01)
+    settings = Settings()
+    settings.drain_timeout_seconds = 0.2
+    settings.drain_flush_seconds = 0.2
+    return settings
+
+
+class BlockingAttachments:
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def fetch_all(self, session_id, attachments, dest_dir=None):
+        await self.release.wait()
+        return [], []
+
+
+def make_drain(settings, claude, inflight=None, attachments=None):
+    discord = FakeDiscordClient()
+    handler = MessageHandler(claude, discord, settings)
+    router = MessageRouter(FakeBot(), handler, settings, attachments=attachments)
+    return GracefulDrain(settings, router, handler, discord, inflight=inflight), handler, discord
+
+
+@pytest.mark.asyncio
+async def test_waits_for_in_flight_turns(settings):
+    claude = BlockingClaudeClient()
+    drain, handler, discord = make_drain(settings, claude)
+    turn = asyncio.create_task(handler.handle_message("c1", "s1", "hi"))
+    await asyncio.sleep(0)
+
+    drain_task = asyncio.create_task(drain.run())
+    await asyncio.sleep(0.05)
+    claude.release.set()
+
+    assert await drain_task
+    assert drain.router.draining
+    await turn
+    assert discord.get_messages("c1")
+
+
+@pytest.mark.asyncio
+async def test_cuts_off_turns_past_the_deadline(settings):
+    drain, handler, discord = make_drain(settings, BlockingClaudeClient())
+    turn = asyncio.create_task(handler.handle_message("c1", "s1", "hi"))
+    await asyncio.sleep(0)
+
+    assert not await drain.run()
+
+    assert turn.cancelled()
+    assert handler.active_turns == {}
+    assert [m.content for m in discord.get_messages("c1")] == [CUT_OFF_NOTICE]
+
+
+@pytest.mark.asyncio
+async def test_cut_off_notice_mentions_resume_with_inflight_store(settings):
+    drain, handler, discord = make_drain(settings, BlockingClaudeClient(), inflight=object())
+    asyncio.create_task(handler.handle_message("c1", "s1", "hi"))
+    await asyncio.sleep(0)
+
+    await drain.run()
+
+    assert [m.content for m in discord.get_messages("c1")] == [RESUME_NOTICE]
+
+
+@pytest.mark.asyncio
+async def test_waits_for_turns_still_fetching_attachments(settings):
+    attachments = BlockingAttachments()
+    drain, _, discord = make_drain(settings, FakeClaudeClient(SIMPLE_TEXT), attachments=attachments)
+    message = FakeDiscordMessage(content="hi", attachments=[FakeAttachment("a.txt", b"x")])
+    turn = asyncio.create_task(drain.router.on_message(message))
+    await asyncio.sleep(0)
+
+    drain_task = asyncio.create_task(drain.run())
+    await asyncio.sleep(0.05)
+    assert not drain_task.done()
+    attachments.release.set()
+
+    assert await drain_task
+    await turn
+    assert discord.get_messages(str(message.channel.id))
+
+
+@pytest.mark.asyncio
+async def test_cuts_off_turns_stuck_fetching_attachments(settings):
+    drain, handler, discord = make_drain(
+        settings,
+        FakeClaudeClient(SIMPLE_TEXT),
+        inflight=object(),
+        attachments=BlockingAttachments(),
+    )
+    message = FakeDiscordMessage(content="hi", attachments=[FakeAttachment("a.txt", b"x")])
+    turn = asyncio.create_task(drain.router.on_message(message))
+    await asyncio.sleep(0)
+
+    assert not await drain.run()
+
+    assert turn.cancelled()
+    assert drain.router.in_progress == {}
+    # Never reached Claude, so there is nothing to resume
+    assert [m.content for m in discord.get_messages(str(message.channel.id))] == [CUT_OFF_NOTICE]
+
+
+@pytest.mark.asyncio
+async def test_idle_bot_drains_immediately(settings):
+    drain, _, _ = make_drain(settings, FakeClaudeClient(SIMPLE_TEXT))
+
+    assert await drain.run()
@@ -0,0 +1,59 @@
+import pytest
+
+from discord_ai.claude.client import FakeClaudeClient
+from discord_ai.discord_client import FakeDiscordClient
+from discord_ai.handlers.messages import MessageHandler
+from discord_ai.inflight import InflightStore
+from tests.helpers.data.claude_responses import SIMPLE_TEXT, TOOL_USE_SEQUENCE
+
+
+class FailingClaudeClient:
+    async def run_session(self, session_id, message, model=None, extra_args=()):
+        yield TOOL_USE_SEQUENCE[0]
+        raise TimeoutError()
+
+
+def test_store_roundtrip_and_persistence(tmp_path):
+    path = tmp_path / "inflight.db"
+    store = InflightStore(path, clock=lambda: 100.0)
+    store.begin("m1", "c1", "s1", "hello", model="haiku")
+    store.set_pid("s1", 4242)
+    store.progress("m1", "uuid-1")
+    store.close()
+
+    reopened = InflightStore(path)
+    [turn] = reopened.pending()
+    assert reopened.message_ids() == {"m1"}
+
+    assert (turn.message_id, turn.model, turn.pid, turn.last_uuid) == (
+        "m1",
+        "haiku",
+        4242,
+        "uuid-1",
+    )
+    reopened.finish("m1")
+    assert reopened.pending() == []
+
+
+@pytest.mark.asyncio
+async def test_handler_records_progress_and_clears_finished_turn(tmp_path):
+    store = InflightStore(tmp_path / "inflight.db")
+    progress = []
+    store.progress = lambda message_id, uuid: progress.append(uuid)
+    handler = MessageHandler(FakeClaudeClient(SIMPLE_TEXT), FakeDiscordClient(), None, store)
+
+    await handler.handle_message("c1", "s1", "hello", message_id="m1")
+
+    assert progress == ["408d2155-b3f8-4044-a00e-cedd765d3eaa"]
+    assert store.pending() == []
+
+
+@pytest.mark.asyncio
+async def test_failed_turn_is_not_resumed(tmp_path):
+    store = InflightStore(tmp_path / "inflight.db")
+    handler = MessageHandler(FailingClaudeClient(), FakeDiscordClient(), None, store)
+
+    with pytest.raises(TimeoutError):
+        await handler.handle_message("c1", "s1", "hello", message_id="m1")
+
+    assert store.pending() == []
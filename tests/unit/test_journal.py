@@ -0,0 +1,195 @@
+import asyncio
+import gzip
+import io
+import json
+
+import pytest
+
+from discord_ai.claude.client import FakeClaudeClient
+from discord_ai.journal import (
+    EventJournal,
+    JournalingClaudeClient,
+    JournalReader,
+    main,
+    read_segment,
+    replay,
+)
+from discord_ai.metrics import metrics
+from tests.helpers.data.claude_responses import SIMPLE_TEXT
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        self.now += 1
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.mark.asyncio
+async def test_batches_are_written_in_background(tmp_path):
+    journal = EventJournal(tmp_path, batch_size=3, flush_seconds=10)
+    journal.start()
+
+    for i in range(3):
+        journal.append("s1", line=f'{{"n": {i}}}')
+    await asyncio.sleep(0.1)
+
+    records = list(read_segment(journal.segment_path))
+    assert [r["line"] for r in records] == ['{"n": 0}', '{"n": 1}', '{"n": 2}']
+    await journal.close()
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_partial_batch(tmp_path):
+    journal = EventJournal(tmp_path, batch_size=100, flush_seconds=10)
+    journal.start()
+    journal.append("s1", prompt="hello")
+    journal.append("s1", line="{}")
+
+    await journal.close()
+
+    assert len(list(read_segment(journal.segment_path))) == 2
+    assert metrics.counters["journal.events_written"] == 2
+
+
+@pytest.mark.asyncio
+async def test_segments_rotate_and_index_finds_sessions(tmp_path):
+    journal = EventJournal(
+        tmp_path, segment_max_bytes=1, batch_size=1, flush_seconds=0, clock=FakeClock()
+    )
+    journal.start()
+    for session_id in ("a", "b", "a"):
+        journal.append(session_id, line="{}")
+        await asyncio.sleep(0.05)
+    await journal.close()
+
+    reader = JournalReader(tmp_path)
+    assert len(list(tmp_path.glob("segment-*.jsonl.gz"))) == 3
+    assert [p.name for p in reader.segments("b")] == ["segment-000002.jsonl.gz"]
+    assert reader.sessions() == {"a": [1001.0, 1003.0], "b": [1002.0, 1002.0]}
+    assert [r["ts"] for r in reader.query("a", since=1002)] == [1003.0]
+
+
+@pytest.mark.asyncio
+async def test_restart_starts_new_segment_and_survives_truncation(tmp_path):
+    first = EventJournal(tmp_path)
+    first.append("s1", line="{}")
+    await first.close()
+    with first.segment_path.open("ab") as f:
+        f.write(gzip.compress(b'{"ts": 1}\n')[:10])
+
+    second = EventJournal(tmp_path)
+    second.append("s1", line="{}")
+    await second.close()
+
+    assert second.segment_path != first.segment_path
+    assert len(list(JournalReader(tmp_path).query("s1"))) == 2
+
+
+def test_append_drops_when_backlog_is_full(tmp_path):
+    journal = EventJournal(tmp_path, max_pending=2)
+
+    for _ in range(3):
+        journal.append("s1", line="{}")
+
+    assert metrics.counters["journal.dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_journaling_client_records_prompt_and_lines(tmp_path):
+    journal = EventJournal(tmp_path)
+    client = JournalingClaudeClient(FakeClaudeClient(SIMPLE_TEXT), journal)
+
+    lines = [line async for line in client.run_session("s1", "hello")]
+    await journal.close()
+
+    records = list(JournalReader(tmp_path).query("s1"))
+    assert records[0]["prompt"] == "hello"
+    assert [r["line"] for r in records[1:]] == lines
+
+
+@pytest.mark.asyncio
+async def test_replay_renders_journaled_turn(tmp_path):
+    journal = EventJournal(tmp_path)
+    client = JournalingClaudeClient(FakeClaudeClient(SIMPLE_TEXT), journal)
+    [line async for line in client.run_session("s1", "hello")]
+    await journal.close()
+    out = io.StringIO()
+
+    await replay(list(JournalReader(tmp_path).query("s1")), speed=0, max_delay=0, out=out)
+
+    rendered = out.getvalue().splitlines()
+    assert rendered[0] == "> hello"
+    assert len(rendered) > 1
+
+
+@pytest.mark.asyncio
+async def test_cli_query_prints_json_lines(tmp_path, capsys):
+    journal = EventJournal(tmp_path)
+    journal.append("s1", prompt="hi")
+    journal.append("s2", prompt="other")
+    await journal.close()
+
+    main(["--dir", str(tmp_path), "query", "--session", "s1"])
+
+    printed = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["prompt"] for r in printed] == ["hi"]
+
+
+@pytest.mark.asyncio
+async def test_index_is_written_when_segment_finishes(tmp_path):
+    journal = EventJournal(tmp_path, batch_size=1, flush_seconds=0)
+    journal.start()
+    journal.append("s1", line="{}")
+    await asyncio.sleep(0.05)
+
+    assert not (tmp_path / "index.json").exists()
+    assert JournalReader(tmp_path).sessions().keys() == {"s1"}
+
+    await journal.close()
+    assert json.loads((tmp_path / "index.json").read_text()).keys() == {journal.segment_path.name}
+
+
+@pytest.mark.asyncio
+async def test_oldest_segments_are_pruned(tmp_path):
+    journal = EventJournal(
+        tmp_path, segment_max_bytes=1, batch_size=1, flush_seconds=0, max_segments=2
+    )
+    journal.start()
+    for session_id in ("a", "b", "c"):
+        journal.append(session_id, line="{}")
+        await asyncio.sleep(0.05)
+    await journal.close()
+
+    assert sorted(p.name for p in tmp_path.glob("segment-*.jsonl.gz")) == [
+        "segment-000002.jsonl.gz",
+        "segment-000003.jsonl.gz",
+    ]
+    assert JournalReader(tmp_path).sessions().keys() == {"b", "c"}
+    assert metrics.counters["journal.segments_pruned"] == 1
+
+    EventJournal(tmp_path, max_segments=2)
+    assert [p.name for p in tmp_path.glob("segment-*.jsonl.gz")] == ["segment-000003.jsonl.gz"]
+
+
+@pytest.mark.asyncio
+async def test_writer_survives_a_failing_batch(tmp_path):
+    journal = EventJournal(tmp_path, batch_size=1, flush_seconds=0)
+    journal.start()
+
+    journal.append("s1", line=object())
+    await asyncio.sleep(0.05)
+    journal.append("s1", line="{}")
+    await journal.close()
+
+    assert metrics.counters["journal.write_errors"] == 1
+    assert [r["line"] for r in JournalReader(tmp_path).query("s1")] == ["{}"]
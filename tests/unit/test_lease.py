@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from discord_ai.lease import RoutingLease
+
+
+def test_only_one_holder_at_a_time(tmp_path):
+    path = tmp_path / "routing.lease"
+    first = RoutingLease(path)
+    second = RoutingLease(path)
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+
+    first.release()
+
+    assert second.try_acquire()
+    assert path.read_text().strip().isdigit()
+    second.release()
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_release(tmp_path):
+    path = tmp_path / "routing.lease"
+    holder = RoutingLease(path)
+    holder.try_acquire()
+    standby = RoutingLease(path)
+
+    async def release_soon():
+        await asyncio.sleep(0.05)
+        holder.release()
+
+    releaser = asyncio.create_task(release_soon())
+    await asyncio.wait_for(standby.acquire(poll_seconds=0.01), timeout=2)
+    await releaser
+
+    assert standby.held
+    standby.release()
+
+
+def test_successor_sees_when_predecessor_started_draining(tmp_path):
+    path = tmp_path / "routing.lease"
+    first = RoutingLease(path, clock=lambda: 1234.5)
+    first.try_acquire()
+    first.mark_draining()
+    first.release()
+
+    second = RoutingLease(path)
+    assert second.try_acquire()
+
+    assert second.predecessor_drained_at == 1234.5
+    assert path.read_text().strip().isdigit()
+    second.release()
+
+    third = RoutingLease(path)
+    third.try_acquire()
+    assert third.predecessor_drained_at is None
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import discord_ai
+
+IMPORT_BUDGET_SECONDS = 2.0
+
+
+def test_main_import_time_within_budget():
+    src = str(Path(discord_ai.__file__).parent.parent)
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([src, os.environ.get("PYTHONPATH", "")])}
+    code = (
+        "import time; started = time.perf_counter(); import discord_ai.main; "
+        "print(time.perf_counter() - started)"
+    )
+
+    # Best of three runs to keep a cold disk cache from failing the budget
+    timings = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+            ).stdout
+        )
+        for _ in range(3)
+    ]
+
+    assert min(timings) < IMPORT_BUDGET_SECONDS
+
+
+def test_main_defers_optional_components():
+    src = str(Path(discord_ai.__file__).parent.parent)
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([src, os.environ.get("PYTHONPATH", "")])}
+    optional = [
+        "discord_ai.inflight",
+        "discord_ai.handlers.resume",
+        "discord_ai.workspaces",
+        "discord_ai.journal",
+        "discord_ai.lease",
+        "discord_ai.webhooks",
+        "discord_ai.utils.memory",
+        "discord_ai.utils.loop_monitor",
+    ]
+    code = f"import sys, discord_ai.main; print([m for m in {optional!r} if m in sys.modules])"
+
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,40 @@
+from discord_ai.metrics import LatencyWindow, Metrics
+
+
+def test_latency_window_percentiles():
+    window = LatencyWindow()
+    for value in range(1, 101):
+        window.observe(float(value))
+
+    assert window.percentile(50) == 50.0
+    assert window.percentile(99) == 99.0
+    assert window.percentile(100) == 100.0
+
+
+def test_latency_window_is_bounded():
+    window = LatencyWindow(maxlen=3)
+    for value in (100.0, 1.0, 2.0, 3.0):
+        window.observe(value)
+
+    assert len(window) == 3
+    assert window.percentile(100) == 3.0
+
+
+def test_empty_window_has_no_percentiles():
+    registry = Metrics()
+
+    assert registry.percentiles("missing") == {"p50": None, "p95": None, "p99": None}
+
+
+def test_snapshot_includes_all_metric_kinds():
+    registry = Metrics()
+    registry.increment("turns")
+    registry.increment("turns")
+    registry.set_gauge("processes", 3)
+    registry.observe("latency", 0.5)
+
+    snapshot = registry.snapshot()
+
+    assert snapshot["counters"] == {"turns": 2}
+    assert snapshot["gauges"] == {"processes": 3}
+    assert snapshot["percentiles"]["latency"]["p50"] == 0.5
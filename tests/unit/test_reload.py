@@ -0,0 +1,77 @@
+import logging
+
+import pytest
+
+from discord_ai.admission import AdmissionController
+from discord_ai.metrics import metrics
+from discord_ai.reload import SettingsReloader
+from discord_ai.settings import Settings
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    path = tmp_path / ".env"
+    path.write_text("CLAUDE_TIMEOUT_SECONDS=600\n")
+    return path
+
+
+@pytest.fixture(autouse=True)
+def restore_log_level():
+    level = logging.getLogger().level
+    metrics.reset()
+    yield
+    logging.getLogger().setLevel(level)
+    metrics.reset()
+
+
+def make_reloader(env_file):
+    settings = Settings(_env_file=env_file)
+    return settings, SettingsReloader(settings, load=lambda: Settings(_env_file=env_file))
+
+
+def test_applies_safe_changes_in_place(env_file):
+    settings, reloader = make_reloader(env_file)
+    admission = AdmissionController(settings)
+    env_file.write_text(
+        "CLAUDE_TIMEOUT_SECONDS=30\nUSER_QUOTA_PER_MINUTE=1\nUSER_QUOTA_BURST=1\nLOG_LEVEL=DEBUG\n"
+    )
+
+    result = reloader.reload()
+
+    assert result.applied["claude_timeout_seconds"] == (600, 30)
+    assert settings.claude_timeout_seconds == 30
+    assert logging.getLogger().level == logging.DEBUG
+    assert admission.check_quota("u", "c").allowed
+    assert not admission.check_quota("u", "c").allowed
+    assert "claude_timeout_seconds: 600 -> 30" in result.summary()
+
+
+def test_restart_required_fields_are_reported_not_applied(env_file):
+    settings, reloader = make_reloader(env_file)
+    env_file.write_text("DEDUP_MAX_ENTRIES=5\n")
+
+    result = reloader.reload()
+
+    assert result.applied == {}
+    assert "dedup_max_entries" in result.restart_required
+    assert settings.dedup_max_entries == 10000
+    assert "Needs a restart: dedup_max_entries" in result.summary()
+
+
+@pytest.mark.parametrize("contents", ["CLAUDE_TIMEOUT_SECONDS=soon\n", "LOG_LEVEL=LOUD\n"])
+def test_invalid_settings_change_nothing(env_file, contents):
+    settings, reloader = make_reloader(env_file)
+    env_file.write_text(contents + "TYPING_INTERVAL_SECONDS=9\n")
+
+    result = reloader.reload()
+
+    assert result.error
+    assert settings.typing_interval_seconds == 5
+    assert metrics.counters["settings.reload_failures"] == 1
+
+
+def test_no_changes(env_file):
+    _, reloader = make_reloader(env_file)
+
+    assert reloader.reload().summary() == "Settings reloaded: no changes"
@@ -0,0 +1,59 @@
+from discord_ai.sessions import SessionIndex
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_ensure_creates_session_once():
+    index = SessionIndex()
+
+    first = index.ensure("1", "10", "bug-hunt")
+    second = index.ensure("1", "10", "bug-hunt")
+
+    assert first.session_id == second.session_id
+    assert len(index) == 1
+
+
+def test_idle_lists_unarchived_sessions_past_threshold():
+    clock = FakeClock()
+    index = SessionIndex(clock=clock)
+    index.ensure("1", "10", "old")
+    index.ensure("2", "10", "archived")
+    index.set_archived("2", True)
+
+    clock.now += 600
+    index.ensure("3", "10", "fresh")
+
+    assert [s.thread_id for s in index.idle(300)] == ["1"]
+
+
+def test_unarchiving_refreshes_activity():
+    clock = FakeClock()
+    index = SessionIndex(clock=clock)
+    index.ensure("1", "10", "thread")
+    index.set_archived("1", True)
+
+    clock.now += 600
+    index.set_archived("1", False)
+
+    assert index.idle(300) == []
+
+
+def test_index_persists_across_restarts(tmp_path):
+    path = tmp_path / "sessions.json"
+    index = SessionIndex(path)
+    session = index.ensure("1", "10", "thread")
+    index.set_archived("1", True)
+
+    reloaded = SessionIndex(path)
+
+    assert reloaded.get("1").session_id == session.session_id
+    assert reloaded.get("1").archived is True
+
+    reloaded.remove("1")
+    assert len(SessionIndex(path)) == 0
@@ -36,3 +36,11 @@ def test_overrides_defaults_from_env(monkeypatch):
 
     assert settings.category_name == "Custom Category"
     assert settings.typing_interval_seconds == 3
+
+
+def test_loop_monitor_disabled_by_default(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+
+    settings = Settings()
+
+    assert settings.loop_monitor_enabled is False
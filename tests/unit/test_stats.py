@@ -0,0 +1,91 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from discord_ai.discord_client import FakeDiscordClient, RealDiscordClient
+from discord_ai.handlers.messages import MessageHandler
+from discord_ai.metrics import metrics
+from discord_ai.stats import StatsCollector, process_rss_bytes
+from tests.helpers.data.claude_responses import SIMPLE_TEXT
+
+
+class SlowClaudeClient:
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def run_session(self, session_id, message, model=None, extra_args=()):
+        await self.release.wait()
+        for line in SIMPLE_TEXT:
+            yield line
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_process_rss_of_self_and_missing_process():
+    assert process_rss_bytes(os.getpid()) > 0
+    assert process_rss_bytes(2**22 + 1) is None
+
+
+@pytest.mark.asyncio
+async def test_reports_active_turns_and_latency():
+    claude = SlowClaudeClient()
+    handler = MessageHandler(claude, FakeDiscordClient(), settings=None)
+    stats = StatsCollector(message_handler=handler)
+
+    turn = asyncio.create_task(handler.handle_message("123", "s1", "hi"))
+    await asyncio.sleep(0.01)
+    assert stats.snapshot()["active_turns"] == {"123": 1}
+    assert "- <#123>: 1" in stats.format()
+
+    claude.release.set()
+    await turn
+
+    snapshot = stats.snapshot()
+    assert snapshot["active_turns"] == {}
+    assert snapshot["turn_latency"]["p50"] >= 0.01
+
+
+def test_format_lists_processes_and_gateway_latency():
+    class Claude:
+        processes = {os.getpid(): time.monotonic() - 5}
+
+    report = StatsCollector(claude_client=Claude()).format(gateway_latency=0.042)
+
+    assert "Claude processes: 1" in report
+    assert f"- pid {os.getpid()}: 5." in report
+    assert "Loop lag: n/a" in report
+    assert report.endswith("Gateway latency: 42.0ms")
+
+
+def test_format_handles_unconnected_gateway():
+    assert StatsCollector().format(gateway_latency=float("inf")).endswith("Gateway latency: n/a")
+
+
+@pytest.mark.asyncio
+async def test_real_discord_client_counts_pending_sends():
+    release = asyncio.Event()
+
+    class Channel:
+        async def send(self, content):
+            await release.wait()
+            return content
+
+    class Bot:
+        def get_channel(self, channel_id):
+            return Channel()
+
+    client = RealDiscordClient(Bot())
+    send = asyncio.create_task(client.send_message("7", "hi"))
+    await asyncio.sleep(0)
+    assert client.pending == {"7": 1}
+
+    release.set()
+    assert await send == "hi"
+    assert client.pending == {}
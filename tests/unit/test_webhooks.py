@@ -0,0 +1,173 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from discord_ai.discord_client import RealDiscordClient
+from discord_ai.metrics import metrics
+from discord_ai.webhooks import WebhookSender
+
+
+def http_error(cls, status: int):
+    return cls(SimpleNamespace(status=status, reason="error"), "error")
+
+
+class FakeWebhook:
+    def __init__(self, webhook_id: int, name: str, user):
+        self.id = webhook_id
+        self.name = name
+        self.user = user
+        self.sent = []
+        self.error = None
+
+    async def send(self, content, **kwargs):
+        if self.error:
+            raise self.error
+        self.sent.append((content, kwargs))
+        return SimpleNamespace(content=content, webhook_id=self.id)
+
+
+class FakeWebhookChannel:
+    def __init__(self, channel_id: int = 10, existing=None, forbidden: bool = False):
+        self.id = channel_id
+        self.name = f"channel-{channel_id}"
+        self.existing = existing or []
+        self.forbidden = forbidden
+        self.created = []
+        self.sent = []
+
+    async def webhooks(self):
+        if self.forbidden:
+            raise http_error(discord.Forbidden, 403)
+        await asyncio.sleep(0)
+        return self.existing
+
+    async def create_webhook(self, name):
+        webhook = FakeWebhook(100 + len(self.created), name, BOT_USER)
+        self.created.append(webhook)
+        return webhook
+
+    async def send(self, content):
+        self.sent.append(content)
+        return SimpleNamespace(content=content)
+
+
+BOT_USER = SimpleNamespace(
+    display_name="Claude Bot", display_avatar=SimpleNamespace(url="https://cdn/avatar.png")
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture
+def bot():
+    return SimpleNamespace(user=BOT_USER)
+
+
+@pytest.mark.asyncio
+async def test_creates_webhook_once_and_caches_it(bot):
+    channel = FakeWebhookChannel()
+    sender = WebhookSender(bot)
+
+    await asyncio.gather(*(sender.send(channel, f"m{i}") for i in range(5)))
+
+    assert len(channel.created) == 1
+    webhook = channel.created[0]
+    assert [content for content, _ in webhook.sent] == [f"m{i}" for i in range(5)]
+    assert webhook.sent[0][1]["username"] == "Claude Bot"
+    assert sender.owns(SimpleNamespace(webhook_id=webhook.id))
+
+
+@pytest.mark.asyncio
+async def test_reuses_existing_webhook(bot):
+    existing = FakeWebhook(7, "Claude", BOT_USER)
+    other = FakeWebhook(8, "Claude", SimpleNamespace())
+    channel = FakeWebhookChannel(existing=[other, existing])
+
+    await WebhookSender(bot).send(channel, "hi")
+
+    assert channel.created == []
+    assert existing.sent[0][0] == "hi"
+
+
+@pytest.mark.asyncio
+async def test_thread_posts_through_parent_webhook(bot):
+    parent = FakeWebhookChannel()
+    thread = SimpleNamespace(id=11, name="thread", parent=parent)
+
+    await WebhookSender(bot).send(thread, "hi")
+
+    assert parent.created[0].sent[0][1]["thread"] is thread
+
+
+@pytest.mark.asyncio
+async def test_forbidden_channel_falls_back_without_retrying(bot):
+    channel = FakeWebhookChannel(forbidden=True)
+    bot.get_channel = lambda _: channel
+    client = RealDiscordClient(bot, webhooks=WebhookSender(bot))
+
+    await client.send_message("10", "one")
+    channel.forbidden = False
+    await client.send_message("10", "two")
+
+    assert channel.sent == ["one", "two"]
+    assert channel.created == []
+
+
+@pytest.mark.asyncio
+async def test_deleted_webhook_is_recreated(bot):
+    channel = FakeWebhookChannel()
+    sender = WebhookSender(bot)
+    await sender.send(channel, "first")
+    channel.created[0].error = http_error(discord.NotFound, 404)
+
+    assert await sender.send(channel, "lost") is None
+    await sender.send(channel, "again")
+
+    assert len(channel.created) == 2
+    assert channel.created[1].sent[0][0] == "again"
+    assert metrics.counters["webhooks.fallbacks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_forbidden_channel_is_retried_after_a_while(bot):
+    now = [0.0]
+    channel = FakeWebhookChannel(forbidden=True)
+    sender = WebhookSender(bot, retry_seconds=60, clock=lambda: now[0])
+
+    assert await sender.send(channel, "one") is None
+    channel.forbidden = False
+    now[0] = 30
+    assert await sender.send(channel, "two") is None
+    now[0] = 60
+    await sender.send(channel, "three")
+
+    assert channel.created[0].sent[0][0] == "three"
+
+
+@pytest.mark.asyncio
+async def test_preload_learns_our_existing_webhooks(bot):
+    ours = FakeWebhook(7, "Claude", BOT_USER)
+    theirs = FakeWebhook(8, "Claude", SimpleNamespace())
+
+    async def guild_webhooks():
+        return [ours, theirs]
+
+    async def forbidden():
+        raise http_error(discord.Forbidden, 403)
+
+    bot.guilds = [
+        SimpleNamespace(name="g1", webhooks=guild_webhooks),
+        SimpleNamespace(name="g2", webhooks=forbidden),
+    ]
+    sender = WebhookSender(bot)
+
+    await sender.preload()
+
+    assert sender.webhook_ids == {7}
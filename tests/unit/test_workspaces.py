@@ -0,0 +1,201 @@
+import asyncio
+import threading
+from shutil import rmtree
+from types import SimpleNamespace
+
+import pytest
+
+from discord_ai.metrics import metrics
+from discord_ai.workspaces import WorkspaceLimitExceeded, WorkspaceManager, directory_usage
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_settings(tmp_path, **overrides):
+    values = {
+        "workspaces_dir": str(tmp_path / "workspaces"),
+        "workspace_quota_mb": 1,
+        "workspace_idle_minutes": 60,
+        "workspace_max_count": 10,
+        "workspace_hard_limit_mb": 2,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def write_bytes(path, size: int):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+
+
+def test_directory_usage_counts_nested_files(tmp_path):
+    write_bytes(tmp_path / "a.bin", 8192)
+    write_bytes(tmp_path / "sub" / "b.bin", 8192)
+
+    assert directory_usage(tmp_path) >= 16384
+    assert directory_usage(tmp_path / "missing") == 0
+
+
+@pytest.mark.asyncio
+async def test_use_yields_session_directory_and_tracks_usage(tmp_path):
+    metrics.reset()
+    manager = WorkspaceManager(make_settings(tmp_path))
+
+    async with manager.use("s1") as cwd:
+        assert cwd == tmp_path / "workspaces" / "s1"
+        assert cwd.is_dir()
+        write_bytes(cwd / "out.txt", 8192)
+    await asyncio.sleep(0.05)
+
+    assert manager.usage["s1"] >= 8192
+    assert metrics.gauges["workspaces.count"] == 1
+    assert manager.attachments_dir("s1") == cwd / "attachments"
+
+
+@pytest.mark.asyncio
+async def test_session_over_quota_is_warned_but_can_clean_up(tmp_path):
+    metrics.reset()
+    manager = WorkspaceManager(make_settings(tmp_path))
+    write_bytes(manager.path_for("s1") / "big.bin", 2 * 1024 * 1024)
+
+    assert "1 MB quota" in await manager.quota_warning("s1")
+    async with manager.use("s1") as cwd:
+        (cwd / "big.bin").unlink()
+    await asyncio.sleep(0.05)
+
+    assert await manager.quota_warning("s1") is None
+    assert await manager.quota_warning("s2") is None
+    assert metrics.counters["workspaces.over_quota_turns"] == 1
+
+
+@pytest.mark.asyncio
+async def test_turn_growing_past_hard_limit_is_stopped(tmp_path, monkeypatch):
+    metrics.reset()
+    monkeypatch.setattr("discord_ai.workspaces.WATCH_INTERVAL_SECONDS", 0.01)
+    manager = WorkspaceManager(make_settings(tmp_path))
+    stopped = asyncio.Event()
+
+    with pytest.raises(WorkspaceLimitExceeded, match="2 MB hard limit"):
+        async with manager.use("s1", on_exceeded=stopped.set) as cwd:
+            await asyncio.sleep(0.05)
+            write_bytes(cwd / "big.bin", 3 * 1024 * 1024)
+            await asyncio.wait_for(stopped.wait(), 1)
+
+    assert metrics.counters["workspaces.hard_limit_stops"] == 1
+
+
+@pytest.mark.asyncio
+async def test_turn_over_hard_limit_can_still_shrink(tmp_path, monkeypatch):
+    monkeypatch.setattr("discord_ai.workspaces.WATCH_INTERVAL_SECONDS", 0.01)
+    manager = WorkspaceManager(make_settings(tmp_path))
+    write_bytes(manager.path_for("s1") / "a.bin", 3 * 1024 * 1024)
+    write_bytes(manager.path_for("s1") / "b.bin", 1024 * 1024)
+    stopped = []
+
+    async with manager.use("s1", on_exceeded=lambda: stopped.append(True)) as cwd:
+        await asyncio.sleep(0.05)
+        (cwd / "b.bin").unlink()
+        await asyncio.sleep(0.05)
+
+    assert stopped == []
+
+
+@pytest.mark.asyncio
+async def test_usage_is_cached_between_turns(tmp_path, monkeypatch):
+    manager = WorkspaceManager(make_settings(tmp_path))
+    walks = []
+    monkeypatch.setattr("discord_ai.workspaces.directory_usage", lambda p: walks.append(p) or 0)
+
+    async with manager.hold("s1"):
+        await manager.quota_warning("s1")
+    async with manager.use("s1"):
+        await manager.quota_warning("s1")
+    await asyncio.sleep(0.05)
+
+    assert len(walks) == 2
+
+
+@pytest.mark.asyncio
+async def test_collect_removes_idle_then_least_recently_used(tmp_path):
+    clock = Clock()
+    manager = WorkspaceManager(make_settings(tmp_path, workspace_max_count=2), clock=clock)
+    for session_id in ("old", "a", "b", "c"):
+        async with manager.use(session_id):
+            pass
+        clock.now += 60
+    manager.last_used["old"] = clock.now - 2 * 3600
+
+    removed = await manager.collect()
+
+    assert removed == ["old", "a"]
+    assert sorted(p.name for p in manager.base_dir.iterdir()) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_collect_skips_workspace_in_use(tmp_path):
+    clock = Clock()
+    manager = WorkspaceManager(make_settings(tmp_path, workspace_max_count=1), clock=clock)
+
+    async with manager.use("busy"):
+        clock.now += 60
+        async with manager.use("other"):
+            pass
+        removed = await manager.collect()
+
+    assert removed == ["other"]
+    assert (manager.base_dir / "busy").is_dir()
+
+
+@pytest.mark.asyncio
+async def test_collect_skips_held_workspace(tmp_path):
+    clock = Clock()
+    manager = WorkspaceManager(make_settings(tmp_path, workspace_idle_minutes=1), clock=clock)
+
+    async with manager.hold("s1") as path:
+        write_bytes(path / "attachments" / "a.txt", 10)
+        clock.now += 3600
+        assert await manager.collect() == []
+
+    assert (path / "attachments" / "a.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_collect_skips_workspace_held_during_earlier_removal(tmp_path, monkeypatch):
+    clock = Clock()
+    manager = WorkspaceManager(make_settings(tmp_path, workspace_idle_minutes=1), clock=clock)
+    for session_id in ("a", "b"):
+        async with manager.use(session_id):
+            pass
+    clock.now += 3600
+    loop = asyncio.get_running_loop()
+    removing = asyncio.Event()
+    release = threading.Event()
+
+    def slow_rmtree(path, ignore_errors):
+        loop.call_soon_threadsafe(removing.set)
+        release.wait()
+        rmtree(path, ignore_errors)
+
+    monkeypatch.setattr("discord_ai.workspaces.shutil.rmtree", slow_rmtree)
+    collecting = asyncio.create_task(manager.collect())
+    await removing.wait()
+
+    async with manager.hold("b") as path:
+        release.set()
+        assert await collecting == ["a"]
+        assert path.is_dir()
+        assert "b" in manager.last_used
+
+
+def test_existing_workspaces_are_picked_up_on_start(tmp_path):
+    (tmp_path / "workspaces" / "left-over").mkdir(parents=True)
+
+    manager = WorkspaceManager(make_settings(tmp_path))
+
+    assert "left-over" in manager.last_used
@@ -0,0 +1,63 @@
+import asyncio
+import time
+
+import pytest
+
+from discord_ai.metrics import LAG_METRIC, Metrics
+from discord_ai.utils.loop_monitor import LoopLagMonitor
+
+
+def block_event_loop(seconds):
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_monitor_records_lag_percentiles():
+    registry = Metrics()
+    monitor = LoopLagMonitor(interval=0.01, registry=registry)
+
+    monitor.start()
+    await asyncio.sleep(0.1)
+    await monitor.stop()
+
+    assert len(registry.windows[LAG_METRIC]) > 0
+    assert monitor.percentiles()["p50"] is not None
+
+
+@pytest.mark.asyncio
+async def test_monitor_reports_slow_callback():
+    registry = Metrics()
+    monitor = LoopLagMonitor(
+        interval=0.01, slow_callback_seconds=0.05, dump_threshold_seconds=10, registry=registry
+    )
+
+    monitor.start()
+    await asyncio.sleep(0.02)
+    block_event_loop(0.2)
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+
+    assert registry.counters.get("loop.slow_callbacks", 0) >= 1
+    assert registry.percentiles(LAG_METRIC)["p99"] >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_monitor_dumps_blocking_stack(tmp_path):
+    registry = Metrics()
+    monitor = LoopLagMonitor(
+        interval=0.01,
+        slow_callback_seconds=0.02,
+        dump_threshold_seconds=0.1,
+        dump_dir=tmp_path,
+        registry=registry,
+    )
+
+    monitor.start()
+    await asyncio.sleep(0.02)
+    block_event_loop(0.3)
+    await asyncio.sleep(0.02)
+    await monitor.stop()
+
+    dumps = list(tmp_path.glob("loop-stall-*.txt"))
+    assert len(dumps) == 1
+    assert "block_event_loop" in dumps[0].read_text()
@@ -0,0 +1,136 @@
+import tracemalloc
+
+import pytest
+
+from discord_ai.claude.client import FakeClaudeClient
+from discord_ai.discord_client import FakeDiscordClient
+from discord_ai.handlers.messages import MessageHandler
+from discord_ai.metrics import Metrics
+from discord_ai.utils.memory import GROWER_GAUGE_PREFIX, MemoryMonitor, format_bytes
+from tests.helpers.data.claude_responses import SIMPLE_TEXT
+
+retained = []
+
+
+def leak(blocks: int):
+    for _ in range(blocks):
+        retained.append(bytearray(10_000))
+
+
+@pytest.fixture
+def monitor():
+    monitor = MemoryMonitor(interval=3600, top_n=5, registry=Metrics())
+    yield monitor
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    retained.clear()
+
+
+def test_format_bytes():
+    assert format_bytes(512) == "512 B"
+    assert format_bytes(2048) == "2.0 KiB"
+    assert format_bytes(3 * 1024**3) == "3.0 GiB"
+
+
+@pytest.mark.asyncio
+async def test_sample_finds_growing_allocation_site(monitor):
+    monitor.start()
+    leak(100)
+
+    await monitor.sample()
+
+    [top] = monitor.recent[:1]
+    assert top.site.startswith("test_memory.py:")
+    assert top.size_diff >= 1_000_000
+    assert monitor.registry.gauges[GROWER_GAUGE_PREFIX + top.site] >= 1_000_000
+    assert monitor.registry.gauges["memory.traced_bytes"] > 0
+    await monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_stale_grower_gauges_are_dropped(monitor):
+    monitor.start()
+    monitor.registry.set_gauge(GROWER_GAUGE_PREFIX + "gone.py:1", 1)
+
+    await monitor.sample()
+
+    assert GROWER_GAUGE_PREFIX + "gone.py:1" not in monitor.registry.gauges
+    await monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_turn_growth_is_charged_to_session_and_channel(monitor):
+    monitor.start()
+    started = monitor.turn_started()
+    leak(50)
+    monitor.turn_finished("c1", "s1", started)
+
+    assert monitor.by_session["s1"] >= 500_000
+    assert monitor.by_channel["c1"] == monitor.by_session["s1"]
+    await monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_message_handler_reports_turns(monitor):
+    monitor.start()
+    handler = MessageHandler(
+        FakeClaudeClient(SIMPLE_TEXT), FakeDiscordClient(), None, memory=monitor
+    )
+
+    await handler.handle_message("c1", "s1", "hi")
+
+    assert "s1" in monitor.by_session
+    assert "c1" in monitor.by_channel
+    await monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_format_fits_one_message(monitor):
+    monitor.start()
+    for i in range(50):
+        monitor.by_session[f"session-{i}"] = i * 1000
+    leak(10)
+    await monitor.sample()
+
+    text = monitor.format(limit=2000)
+
+    assert text.startswith("Traced:")
+    assert "session-49" in text
+    assert len(text) <= 2000
+    await monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_ends_tracing_it_started(monitor):
+    monitor.start()
+    await monitor.stop()
+
+    assert not tracemalloc.is_tracing()
+    assert monitor.format() == "Memory monitor is not running"
+
+
+@pytest.mark.asyncio
+async def test_sample_keeps_only_the_biggest_attributions(monitor, monkeypatch):
+    monkeypatch.setattr("discord_ai.utils.memory.MAX_ATTRIBUTED", 3)
+    monitor.start()
+    for i in range(10):
+        monitor.by_session[f"session-{i}"] = i
+        monitor.by_channel[f"channel-{i}"] = i
+
+    await monitor.sample()
+
+    assert set(monitor.by_session) == {"session-7", "session-8", "session-9"}
+    assert set(monitor.by_channel) == {"channel-7", "channel-8", "channel-9"}
+    await monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_rss_comes_from_the_caller(monitor):
+    monitor.rss = lambda: 3 * 1024 * 1024
+    monitor.start()
+
+    await monitor.sample()
+
+    assert monitor.registry.gauges["memory.rss_bytes"] == 3 * 1024 * 1024
+    assert "RSS: 3.0 MiB" in monitor.format()
+    await monitor.stop()
@@ -0,0 +1,43 @@
+import threading
+import time
+
+from discord_ai.utils.profiler import SamplingProfiler
+
+
+def busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_profiler_samples_target_thread():
+    profiler = SamplingProfiler(thread_id=threading.get_ident(), interval=0.001)
+
+    profiler.start()
+    busy_wait(0.1)
+    profiler.stop()
+
+    assert profiler.sample_count > 0
+    labels = [label for label, _, _ in profiler.top_functions()]
+    assert any(label.startswith("busy_wait") for label in labels)
+
+
+def test_collapsed_output_format():
+    profiler = SamplingProfiler()
+    profiler.stacks[("main (app.py:1)", "work (app.py:10)")] = 3
+    profiler.sample_count = 3
+
+    assert profiler.collapsed() == "main (app.py:1);work (app.py:10) 3\n"
+
+
+def test_top_functions_ranks_by_self_samples():
+    profiler = SamplingProfiler()
+    profiler.stacks[("main", "slow")] = 8
+    profiler.stacks[("main", "fast")] = 2
+    profiler.sample_count = 10
+
+    top = profiler.top_functions()
+
+    assert top[0] == ("slow", 8, 8)
+    assert ("main", 0, 10) in top
+    assert "80.0%" in profiler.format_top()
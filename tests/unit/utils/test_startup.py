@@ -0,0 +1,49 @@
+import asyncio
+import sys
+
+from discord_ai.metrics import metrics
+from discord_ai.settings import Settings
+from discord_ai.utils.startup import StartupTimer, install_event_loop_policy
+
+
+def test_startup_timer_records_phases_in_order():
+    timer = StartupTimer()
+
+    timer.mark("import")
+    timer.mark("settings")
+
+    assert list(timer.phases) == ["import", "settings"]
+    assert all(seconds >= 0 for seconds in timer.phases.values())
+
+
+def test_startup_timer_reports_once():
+    timer = StartupTimer()
+    timer.mark("ready")
+    timer.report()
+
+    timer.mark("channel_init")
+    timer.report()
+
+    assert list(timer.phases) == ["ready"]
+    assert "startup.ready_seconds" in metrics.gauges
+
+
+def test_uvloop_policy_left_alone_when_disabled(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("USE_UVLOOP", "false")
+    policy = asyncio.get_event_loop_policy()
+
+    install_event_loop_policy(Settings())
+
+    assert asyncio.get_event_loop_policy() is policy
+
+
+def test_missing_uvloop_falls_back_to_default_loop(monkeypatch):
+    monkeypatch.setenv("DISCORD_BOT_TOKEN", "test_token")
+    monkeypatch.setenv("USE_UVLOOP", "true")
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+    policy = asyncio.get_event_loop_policy()
+
+    install_event_loop_policy(Settings())
+
+    assert asyncio.get_event_loop_policy() is policy